@@ -0,0 +1 @@
+"""Benchmarks for suiteas, run as modules, e.g. ``python -m benchmarks.domain``."""
@@ -0,0 +1,94 @@
+"""Benchmark checking files which have hundreds of functions and pytest classes.
+
+Matching a function to its tests should take constant time, however many pytest classes
+and imports its pytest file has, so the time per function should stay flat as files get
+bigger.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from suiteas.config import ProjConfig
+from suiteas.core.check import get_violations
+from suiteas.domain import (
+    Codebase,
+    File,
+    Func,
+    Project,
+    PytestClass,
+    PytestFile,
+    PytestSuite,
+)
+
+
+def _get_project(*, n_files: int, n_funcs: int) -> Project:
+    """Get a project where every function is tested and imported, bar the last."""
+    proj_dir = Path("proj")
+    files = []
+    pytest_files = []
+    for file_idx in range(n_files):
+        module_name = f"pkg.mod_{file_idx}"
+        func_names = [f"do_thing_{idx}" for idx in range(n_funcs)]
+        files.append(
+            File(
+                path=proj_dir / "src" / "pkg" / f"mod_{file_idx}.py",
+                funcs=[
+                    Func(
+                        name=name,
+                        full_name=f"{module_name}.{name}",
+                        line_num=idx + 1,
+                        char_offset=0,
+                    )
+                    for idx, name in enumerate(func_names)
+                ],
+                clses=[],
+                imported_objs=[],
+            ),
+        )
+        pytest_files.append(
+            PytestFile(
+                path=proj_dir / "tests" / "unit" / "pkg" / f"test_mod_{file_idx}.py",
+                pytest_classes=[
+                    PytestClass(name=f"TestDoThing{idx}", has_funcs=True)
+                    for idx in range(n_funcs - 1)
+                ],
+                imported_objs=[f"{module_name}.{name}" for name in func_names[:-1]],
+            ),
+        )
+
+    return Project(
+        codebase=Codebase(files=files),
+        pytest_suite=PytestSuite(pytest_files=pytest_files),
+        config=ProjConfig(pkg_names=["pkg"]),
+        proj_dir=proj_dir,
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--funcs", type=int, nargs="+", default=[100, 200, 400, 800])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Checking {args.files} files:")
+    for n_funcs in args.funcs:
+        project = _get_project(n_files=args.files, n_funcs=n_funcs)
+        elapsed = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            violations = list(get_violations(project))
+            elapsed = min(elapsed, time.perf_counter() - start)
+        assert len(violations) == 2 * args.files
+
+        per_func_us = elapsed / (args.files * n_funcs) * 1e6
+        print(
+            f"  {n_funcs:>5} funcs per file: {elapsed * 1000:8.1f} ms "
+            f"({per_func_us:.2f} us per func)",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Benchmark the memory held by a huge codebase, as domain objects and column-wise.
+
+Each store is built in a fresh interpreter, so the two don't share any memory. The
+interpreter reports how much its resident set size grew while building the codebase
+(the peak) and once it was built (the memory held, which is only measured on Linux).
+Every function and class has a name unique to its file, which is the worst case for
+the compact store's shared string table.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from suiteas.domain import CodebaseStore
+from suiteas.read.codebase import compact_codebase_from_facts, get_module_name
+from suiteas.read.file import FileFacts, file_from_facts
+
+_SRC_DIR = Path("/proj/src")
+_FILES_PER_DIR = 20
+
+
+def _get_paths(n_files: int) -> list[Path]:
+    return [
+        _SRC_DIR / "pkg" / f"sub_{idx // _FILES_PER_DIR}" / f"mod_{idx}.py"
+        for idx in range(n_files)
+    ]
+
+
+def _iter_facts(
+    *,
+    n_files: int,
+    n_funcs: int,
+    n_clses: int,
+    n_imports: int,
+) -> Iterator[FileFacts]:
+    for file_idx in range(n_files):
+        yield (
+            tuple(
+                (f"get_thing_{file_idx}_{idx}", 10 * idx + 1, 0)
+                for idx in range(n_funcs)
+            ),
+            tuple(
+                (f"Thing{file_idx}x{idx}", 10 * idx + 5, 0, True)
+                for idx in range(n_clses)
+            ),
+            tuple(
+                f"pkg.sub_{idx}.mod_{idx}.get_thing_{idx}" for idx in range(n_imports)
+            ),
+        )
+
+
+def _get_rss_bytes() -> int:
+    statm_path = Path("/proc/self/statm")
+    if not statm_path.exists():
+        return 0
+    _, n_pages, *_ = statm_path.read_text().split()
+    return int(n_pages) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _get_max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, and macOS reports bytes.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _build(store: CodebaseStore, args: argparse.Namespace) -> None:
+    """Build the codebase in this process, and print the memory and time it took."""
+    paths = _get_paths(args.files)
+    facts_iter = _iter_facts(
+        n_files=args.files,
+        n_funcs=args.funcs,
+        n_clses=args.classes,
+        n_imports=args.imports,
+    )
+
+    start_rss, start_max_rss = _get_rss_bytes(), _get_max_rss_bytes()
+    start = time.perf_counter()
+    if store == "compact":
+        codebase: object = compact_codebase_from_facts(
+            paths,
+            facts_iter,
+            root_dir=_SRC_DIR,
+        )
+    else:
+        codebase = [
+            file_from_facts(
+                path,
+                facts,
+                module_name=get_module_name(path=path, root_dir=_SRC_DIR),
+            )
+            for path, facts in zip(paths, facts_iter, strict=True)
+        ]
+    elapsed = time.perf_counter() - start
+    result = {
+        "seconds": elapsed,
+        "peak_bytes": _get_max_rss_bytes() - start_max_rss,
+        "held_bytes": _get_rss_bytes() - start_rss,
+    }
+    del codebase
+
+    print(json.dumps(result))
+
+
+def _measure(store: CodebaseStore, argv: list[str]) -> tuple[float, int, int]:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.compact", "--store", store, *argv],  # noqa: S603
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output)
+    return result["seconds"], result["peak_bytes"], result["held_bytes"]
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--funcs", type=int, default=10)
+    parser.add_argument("--classes", type=int, default=2)
+    parser.add_argument("--imports", type=int, default=5)
+    parser.add_argument(
+        "--store",
+        choices=["objects", "compact"],
+        help="Build only this store, in this process.",
+    )
+    args = parser.parse_args()
+
+    if args.store is not None:
+        _build(args.store, args)
+        return
+
+    argv = [
+        f"--files={args.files}",
+        f"--funcs={args.funcs}",
+        f"--classes={args.classes}",
+        f"--imports={args.imports}",
+    ]
+    results = {
+        "objects": _measure("objects", argv),
+        "compact": _measure("compact", argv),
+    }
+
+    print(
+        f"Building {args.files} files with {args.funcs} funcs, {args.classes} classes "
+        f"and {args.imports} imports each:",
+    )
+    print(f"  {'':>7}  {'Time (ms)':>10}  {'Peak (MiB)':>10}  {'Held (MiB)':>10}")
+    for name, (elapsed, peak_bytes, held_bytes) in results.items():
+        print(
+            f"  {name:>7}: {elapsed * 1000:10.1f}  {peak_bytes / 2**20:10.1f}  "
+            f"{held_bytes / 2**20:10.1f}",
+        )
+    (
+        (old_elapsed, old_peak, old_held),
+        (new_elapsed, new_peak, new_held),
+    ) = results.values()
+    print(
+        f"  {'saving':>7}: {old_elapsed / new_elapsed:9.1f}x  "
+        f"{1 - new_peak / old_peak:10.0%}  "
+        f"{1 - new_held / old_held if old_held else 0:10.0%}",
+    )
+
+
+if __name__ == "__main__":
+    main()
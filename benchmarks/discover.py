@@ -0,0 +1,88 @@
+"""Benchmark finding the Python files in a deep directory tree.
+
+The tree has a package at every level, each with a __pycache__ directory, as well as
+a virtual environment which was accidentally created inside it. This compares the
+scandir-based search, which skips the virtual environment and the caches, against
+sorting the results of Path.glob("**/*.py").
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from suiteas.read.discover import find_py_files
+
+
+def _write_tree(root_dir: Path, *, depth: int, branching: int, n_files: int) -> None:
+    dirs = [root_dir]
+    for _ in range(depth):
+        dirs = [
+            parent_dir / f"sub_{idx}" for parent_dir in dirs for idx in range(branching)
+        ]
+        for dir_path in dirs:
+            (dir_path / "__pycache__").mkdir(parents=True)
+            for file_idx in range(n_files):
+                (dir_path / f"mod_{file_idx}.py").touch()
+                (dir_path / "__pycache__" / f"mod_{file_idx}.pyc").touch()
+
+    venv_dir = root_dir / "venv"
+    (venv_dir / "lib" / "site-packages").mkdir(parents=True)
+    (venv_dir / "pyvenv.cfg").touch()
+    for file_idx in range(branching**depth * n_files):
+        (venv_dir / "lib" / "site-packages" / f"dep_{file_idx}.py").touch()
+
+
+def _measure(
+    find: Callable[[Path], list[Path]],
+    *,
+    root_dir: Path,
+    repeat: int,
+) -> tuple[float, int]:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        paths = find(root_dir)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed, len(paths)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--branching", type=int, default=3)
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root_dir = Path(tmp_dir)
+        _write_tree(
+            root_dir,
+            depth=args.depth,
+            branching=args.branching,
+            n_files=args.files,
+        )
+        results = {
+            "glob": _measure(
+                lambda root_dir: sorted(root_dir.glob("**/*.py")),
+                root_dir=root_dir,
+                repeat=args.repeat,
+            ),
+            "scandir": _measure(find_py_files, root_dir=root_dir, repeat=args.repeat),
+        }
+
+    print(
+        f"Finding files {args.depth} directories deep, with {args.branching} "
+        f"subdirectories and {args.files} files each:",
+    )
+    for name, (elapsed, n_paths) in results.items():
+        print(f"  {name:>7}: {elapsed * 1000:8.1f} ms  ({n_paths} files)")
+    (old_elapsed, _), (new_elapsed, _) = results.values()
+    print(f"  {'speedup':>7}: {old_elapsed / new_elapsed:8.1f} x")
+
+
+if __name__ == "__main__":
+    main()
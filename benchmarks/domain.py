@@ -0,0 +1,145 @@
+"""Benchmark the construction of the domain objects for a large codebase.
+
+The domain objects used to be pydantic models, which are validated upon construction
+and carry more per-instance state than slotted dataclasses. This compares the two for
+a synthetic codebase, in terms of time and the memory held by the objects.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from suiteas.read.file import FileFacts, file_from_facts
+
+
+class _PydanticFunc(BaseModel, extra="forbid"):
+    name: str
+    full_name: str
+    line_num: int
+    char_offset: int
+
+
+class _PydanticClass(_PydanticFunc):
+    has_funcs: bool
+
+
+class _PydanticFile(BaseModel, extra="forbid"):
+    path: Path
+    funcs: list[_PydanticFunc]
+    clses: list[_PydanticClass]
+    imported_objs: list[str]
+
+
+def _pydantic_file_from_facts(
+    path: Path,
+    facts: FileFacts,
+    *,
+    module_name: str,
+) -> _PydanticFile:
+    """Build a file as the domain objects used to be built."""
+    funcs, clses, imported_objs = facts
+    return _PydanticFile(
+        path=path,
+        funcs=[
+            _PydanticFunc(
+                name=name,
+                full_name=f"{module_name}.{name}",
+                line_num=line_num,
+                char_offset=char_offset,
+            )
+            for name, line_num, char_offset in funcs
+        ],
+        clses=[
+            _PydanticClass(
+                name=name,
+                full_name=f"{module_name}.{name}",
+                line_num=line_num,
+                char_offset=char_offset,
+                has_funcs=has_funcs,
+            )
+            for name, line_num, char_offset, has_funcs in clses
+        ],
+        imported_objs=list(imported_objs),
+    )
+
+
+def _get_facts(*, n_funcs: int, n_clses: int, n_imports: int) -> FileFacts:
+    return (
+        tuple((f"func_{idx}", 10 * idx + 1, 0) for idx in range(n_funcs)),
+        tuple((f"Class{idx}", 10 * idx + 5, 0, True) for idx in range(n_clses)),
+        tuple(f"pkg.mod_{idx}.obj" for idx in range(n_imports)),
+    )
+
+
+def _measure(
+    build: Callable[[Path, FileFacts], object],
+    *,
+    n_files: int,
+    facts: FileFacts,
+) -> tuple[float, int]:
+    """Get the time taken to build the files, and the memory they hold."""
+    paths = [Path(f"src/pkg/mod_{idx}.py") for idx in range(n_files)]
+
+    gc.collect()
+    start = time.perf_counter()
+    files = [build(path, facts) for path in paths]
+    elapsed = time.perf_counter() - start
+    del files
+
+    gc.collect()
+    tracemalloc.start()
+    files = [build(path, facts) for path in paths]
+    n_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del files
+
+    return elapsed, n_bytes
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--funcs", type=int, default=10)
+    parser.add_argument("--classes", type=int, default=2)
+    parser.add_argument("--imports", type=int, default=5)
+    args = parser.parse_args()
+
+    facts = _get_facts(n_funcs=args.funcs, n_clses=args.classes, n_imports=args.imports)
+    results = {
+        "pydantic": _measure(
+            lambda path, facts: _pydantic_file_from_facts(
+                path,
+                facts,
+                module_name="pkg.mod",
+            ),
+            n_files=args.files,
+            facts=facts,
+        ),
+        "dataclass": _measure(
+            lambda path, facts: file_from_facts(path, facts, module_name="pkg.mod"),
+            n_files=args.files,
+            facts=facts,
+        ),
+    }
+
+    print(
+        f"Building {args.files} files with {args.funcs} funcs "
+        f"and {args.classes} classes each:",
+    )
+    for name, (elapsed, n_bytes) in results.items():
+        print(f"  {name:>9}: {elapsed * 1000:8.1f} ms {n_bytes / 2**20:8.1f} MiB")
+    (old_elapsed, old_n_bytes), (new_elapsed, new_n_bytes) = results.values()
+    print(
+        f"  {'saving':>9}: {old_elapsed / new_elapsed:8.1f} x  "
+        f"{1 - new_n_bytes / old_n_bytes:8.0%}",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark working out which files to read when many filenames are passed.
+
+This is what happens when e.g. pre-commit passes every file in a large project. Each
+filename is classified as a source or pytest file, mapped to its counterpart, and
+checked for existence. This compares the path index, which works on strings and lists
+each directory once, against checking each path's parents and existence as Path
+objects.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from suiteas.config import ProjConfig
+from suiteas.core.path import path_to_pytest_path, pytest_path_to_path
+from suiteas.read.project import get_included_files
+
+_PKG_NAMES = ["pkg_a", "pkg_b", "pkg_c"]
+
+_GetIncludedFiles = Callable[..., tuple[list[Path] | None, list[Path] | None]]
+
+
+def _write_tree(proj_dir: Path, *, n_files: int, files_per_dir: int) -> list[Path]:
+    """Write a project, giving relative paths to all of its source and pytest files."""
+    rel_paths = []
+    for file_idx in range(n_files):
+        pkg_name = _PKG_NAMES[file_idx % len(_PKG_NAMES)]
+        rel_dir = Path(pkg_name, f"sub_{file_idx // files_per_dir}")
+        (proj_dir / "src" / rel_dir).mkdir(parents=True, exist_ok=True)
+        (proj_dir / "tests" / "unit" / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        rel_path = Path("src", rel_dir, f"mod_{file_idx}.py")
+        (proj_dir / rel_path).touch()
+        rel_paths.append(rel_path)
+        # Only half of the files have tests.
+        if file_idx % 2 == 0:
+            pytest_rel_path = Path("tests", "unit", rel_dir, f"test_mod_{file_idx}.py")
+            (proj_dir / pytest_rel_path).touch()
+            rel_paths.append(pytest_rel_path)
+    return rel_paths
+
+
+def _get_included_files_by_parents(
+    included_files: list[Path],
+    *,
+    proj_dir: Path,
+    config: ProjConfig,
+) -> tuple[list[Path] | None, list[Path] | None]:
+    """Classify paths by comparing against every path's parents, one at a time."""
+    included_files = [path.resolve() for path in included_files]
+    included_src_files = [
+        path
+        for path in included_files
+        if any(
+            proj_dir / config.src_rel_path / pkg_name in path.parents
+            for pkg_name in config.pkg_names
+        )
+    ]
+    included_pytest_files = [
+        path
+        for path in included_files
+        if any(
+            proj_dir / config.tests_rel_path / config.unittest_dir_name / pkg_name
+            in path.parents
+            for pkg_name in config.pkg_names
+        )
+    ]
+    included_src_files += [
+        pytest_path_to_path(test_path, proj_config=config, proj_dir=proj_dir)
+        for test_path in included_pytest_files
+    ]
+    included_pytest_files += [
+        path_to_pytest_path(path, proj_config=config, proj_dir=proj_dir)
+        for path in included_src_files
+    ]
+    return (
+        list({path for path in included_src_files if path.exists()}),
+        list({path for path in included_pytest_files if path.exists()}),
+    )
+
+
+def _measure(
+    get_included_files: _GetIncludedFiles,
+    *,
+    rel_paths: list[Path],
+    proj_dir: Path,
+    repeat: int,
+) -> tuple[float, int]:
+    config = ProjConfig(pkg_names=_PKG_NAMES)
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        src_paths, pytest_paths = get_included_files(
+            rel_paths,
+            proj_dir=proj_dir,
+            config=config,
+        )
+        elapsed = min(elapsed, time.perf_counter() - start)
+    assert src_paths is not None
+    assert pytest_paths is not None
+    return elapsed, len(src_paths) + len(pytest_paths)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--files-per-dir", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    old_cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        proj_dir = Path(tmp_dir).resolve()
+        rel_paths = _write_tree(
+            proj_dir,
+            n_files=args.files,
+            files_per_dir=args.files_per_dir,
+        )
+        # Filenames are passed relative to the project directory, as by pre-commit.
+        os.chdir(proj_dir)
+        try:
+            results = {
+                "parents": _measure(
+                    _get_included_files_by_parents,
+                    rel_paths=rel_paths,
+                    proj_dir=proj_dir,
+                    repeat=args.repeat,
+                ),
+                "index": _measure(
+                    get_included_files,
+                    rel_paths=rel_paths,
+                    proj_dir=proj_dir,
+                    repeat=args.repeat,
+                ),
+            }
+        finally:
+            os.chdir(old_cwd)
+
+    print(
+        f"Classifying {len(rel_paths)} filenames, in directories of "
+        f"{args.files_per_dir} source files each:",
+    )
+    for name, (elapsed, n_paths) in results.items():
+        print(f"  {name:>7}: {elapsed * 1000:8.1f} ms  ({n_paths} files)")
+    (old_elapsed, _), (new_elapsed, _) = results.values()
+    print(f"  {'speedup':>7}: {old_elapsed / new_elapsed:8.1f} x")
+
+
+if __name__ == "__main__":
+    main()
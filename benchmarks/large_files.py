@@ -0,0 +1,99 @@
+"""Benchmark reading large generated modules, as text and as (memory-mapped) bytes.
+
+Reading a file as text decodes it into a new string, which the parser then encodes
+back into UTF-8, and the cache reads the file a second time as bytes to hash it. This
+compares that against reading each file once as bytes, memory-mapping it if it's
+large, and giving the bytes to both the parser and the hash. It also times checking
+whether an unchanged file's contents still match the cache, which only hashes them.
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from suiteas.read.cache import get_digest
+from suiteas.read.file import get_source_facts, open_source
+
+
+def _write_module(path: Path, *, n_funcs: int) -> None:
+    """Write a module of many functions, with non-ASCII text to decode."""
+    with path.open(mode="w", encoding="utf8") as _f:
+        for idx in range(n_funcs):
+            _f.write(
+                f"def get_thing_{idx}(x):\n"
+                f'    """Get the thing number {idx}, café-style."""\n'
+                f"    return x + {idx}\n\n\n",
+            )
+
+
+def _parse_as_text(path: Path) -> str:
+    with path.open(mode="r", encoding="utf8") as _f:
+        get_source_facts(_f.read(), path=path)
+    with path.open(mode="rb") as _f:
+        return get_digest(_f.read())
+
+
+def _parse_as_bytes(path: Path) -> str:
+    with open_source(path) as (contents, _):
+        get_source_facts(contents, path=path)
+        return get_digest(contents)
+
+
+def _revalidate_read(path: Path) -> str:
+    with path.open(mode="rb") as _f:
+        return get_digest(_f.read())
+
+
+def _revalidate_mmap(path: Path) -> str:
+    with open_source(path) as (contents, _):
+        return get_digest(contents)
+
+
+def _measure(read: Callable[[Path], str], paths: list[Path], *, repeat: int) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            read(path)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=5)
+    parser.add_argument("--funcs", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [Path(tmp_dir) / f"mod_{idx}.py" for idx in range(args.files)]
+        for path in paths:
+            _write_module(path, n_funcs=args.funcs)
+        n_bytes = sum(path.stat().st_size for path in paths)
+
+        results = {
+            "parse": (
+                _measure(_parse_as_text, paths, repeat=args.repeat),
+                _measure(_parse_as_bytes, paths, repeat=args.repeat),
+            ),
+            "revalidate": (
+                _measure(_revalidate_read, paths, repeat=args.repeat),
+                _measure(_revalidate_mmap, paths, repeat=args.repeat),
+            ),
+        }
+
+    print(f"Reading {args.files} files, {n_bytes / 2**20:.1f} MiB in total:")
+    print(f"  {'':>10}  {'Text (ms)':>10}  {'Bytes (ms)':>10}  {'Speedup':>8}")
+    for name, (old_elapsed, new_elapsed) in results.items():
+        print(
+            f"  {name:>10}: {old_elapsed * 1000:10.1f}  {new_elapsed * 1000:10.1f}  "
+            f"{old_elapsed / new_elapsed:7.2f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Benchmark each phase of checking a large synthetic project.
+
+Projects are generated with a configurable number of files, package depth, functions
+per file and proportion of tested functions, in either the unit or the consolidated
+tests layout. Function bodies are random Python code from pysource-codegen, so the
+files take a realistic amount of work to parse.
+
+The time taken by each phase is written as JSON, so that it can be compared against an
+earlier run to catch regressions, e.g.
+
+    python -m benchmarks.project --files 10000 --output before.json
+    python -m benchmarks.project --files 10000 --compare before.json
+
+Generating a large project takes a while, so pass --proj-dir to keep it between runs.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import textwrap
+import time
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import (
+    AbstractContextManager,
+    contextmanager,
+    nullcontext,
+    redirect_stderr,
+)
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Literal, get_args
+
+from pysource_codegen import generate
+
+from suiteas.core.check import get_violations
+from suiteas.core.print import print_violations
+from suiteas.domain import Project
+from suiteas.read.codebase import get_codebase
+from suiteas.read.config import get_config
+from suiteas.read.file import ParseEngine
+from suiteas.read.pytest_suite import get_pytest_suite
+
+PHASES = (
+    "get_config",
+    "get_codebase",
+    "get_pytest_suite",
+    "get_violations",
+    "print_violations",
+)
+
+_PKG_NAME = "synthpkg"
+_FILES_PER_DIR = 20
+# Generating random code is slow, so function bodies are drawn from a fixed pool.
+_N_BODIES = 32
+_SPEC_FILE_NAME = "benchmark_spec.json"
+
+Layout = Literal["unit", "consolidated"]
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class ProjSpec:
+    """The parameters of a synthetic project."""
+
+    n_files: int
+    depth: int
+    n_funcs: int
+    coverage: float
+    layout: Layout
+    seed: int
+
+
+def write_project(proj_dir: Path, spec: ProjSpec) -> None:
+    """Generate a synthetic project in an empty directory."""
+    rng = random.Random(spec.seed)
+    bodies = _get_bodies(seed=spec.seed)
+
+    src_dir = proj_dir / "src" / _PKG_NAME
+    if spec.layout == "unit":
+        tests_dir = proj_dir / "tests" / "unit" / _PKG_NAME
+        unittest_dir_name = "unit"
+    else:
+        tests_dir = proj_dir / "tests"
+        unittest_dir_name = "."
+    src_dir.mkdir(parents=True)
+    tests_dir.mkdir(parents=True)
+    (proj_dir / "pyproject.toml").write_text(
+        "[tool.suiteas]\n"
+        f'pkg_names = ["{_PKG_NAME}"]\n'
+        f'unittest_dir_name = "{unittest_dir_name}"\n',
+    )
+
+    n_dirs = math.ceil(spec.n_files / _FILES_PER_DIR)
+    made_rel_dirs: set[Path] = set()
+    for file_idx in range(spec.n_files):
+        rel_dir = _get_rel_dir(
+            file_idx // _FILES_PER_DIR,
+            depth=spec.depth,
+            n_dirs=n_dirs,
+        )
+        if rel_dir not in made_rel_dirs:
+            _make_pkg_dirs(src_dir, rel_dir=rel_dir, made_rel_dirs=made_rel_dirs)
+            (tests_dir / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        module_name = ".".join((_PKG_NAME, *rel_dir.parts, f"mod_{file_idx}"))
+        func_names = [f"func_{idx}" for idx in range(spec.n_funcs)]
+        tested_func_names = [
+            name for name in func_names if rng.random() < spec.coverage
+        ]
+
+        (src_dir / rel_dir / f"mod_{file_idx}.py").write_text(
+            "\n\n".join(
+                f"def {name}(name_0, name_1, name_2, name_3, name_4, name_5):\n"
+                f"{rng.choice(bodies)}"
+                for name in func_names
+            ),
+        )
+        if tested_func_names:
+            (tests_dir / rel_dir / f"test_mod_{file_idx}.py").write_text(
+                _get_pytest_source(module_name, func_names=tested_func_names),
+            )
+
+
+def time_phases(
+    proj_dir: Path,
+    *,
+    executor: Executor | None = None,
+    parse_engine: ParseEngine | None = None,
+) -> tuple[dict[str, float], int]:
+    """Check a project, giving the seconds taken by each phase and the violations."""
+    seconds_by_phase: dict[str, float] = {}
+
+    with _timed(seconds_by_phase, "get_config"):
+        config = get_config(proj_dir=proj_dir)
+    if parse_engine is not None:
+        config = config.model_copy(update={"parse_engine": parse_engine})
+    with _timed(seconds_by_phase, "get_codebase"):
+        codebase = get_codebase(proj_dir=proj_dir, config=config, executor=executor)
+    with _timed(seconds_by_phase, "get_pytest_suite"):
+        pytest_suite = get_pytest_suite(
+            proj_dir=proj_dir,
+            config=config,
+            included_pytest_files=None,
+            executor=executor,
+        )
+    project = Project(
+        codebase=codebase,
+        pytest_suite=pytest_suite,
+        config=config,
+        proj_dir=proj_dir,
+    )
+    with _timed(seconds_by_phase, "get_violations"):
+        violations = list(get_violations(project))
+    with (
+        Path(os.devnull).open("w") as devnull,
+        redirect_stderr(devnull),
+        _timed(seconds_by_phase, "print_violations"),
+    ):
+        print_violations(violations)
+
+    return seconds_by_phase, len(violations)
+
+
+@contextmanager
+def _timed(seconds_by_phase: dict[str, float], phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    seconds_by_phase[phase] = time.perf_counter() - start
+
+
+def _get_bodies(*, seed: int) -> list[str]:
+    bodies = []
+    for idx in range(_N_BODIES):
+        source = generate(seed=seed * _N_BODIES + idx, node_limit=300, depth_limit=5)
+        bodies.append(textwrap.indent(source, "    ") if source.strip() else "")
+    return [body or "    pass\n" for body in bodies]
+
+
+def _get_rel_dir(dir_idx: int, *, depth: int, n_dirs: int) -> Path:
+    """Get the directory of a module, spreading directories evenly over the depth."""
+    if depth == 0:
+        return Path()
+
+    branching = max(2, math.ceil(n_dirs ** (1 / depth)))
+    parts = []
+    for _ in range(depth):
+        dir_idx, part_idx = divmod(dir_idx, branching)
+        parts.append(f"sub_{part_idx}")
+    return Path(*parts)
+
+
+def _make_pkg_dirs(src_dir: Path, *, rel_dir: Path, made_rel_dirs: set[Path]) -> None:
+    for rel_pkg_dir in [*reversed(rel_dir.parents), rel_dir]:
+        if rel_pkg_dir in made_rel_dirs:
+            continue
+        (src_dir / rel_pkg_dir).mkdir(exist_ok=True)
+        (src_dir / rel_pkg_dir / "__init__.py").touch()
+        made_rel_dirs.add(rel_pkg_dir)
+
+
+def _get_pytest_source(module_name: str, *, func_names: list[str]) -> str:
+    imports = f"from {module_name} import {', '.join(func_names)}\n"
+    classes = "".join(
+        f"\n\nclass Test{name.title().replace('_', '')}:\n"
+        f"    def test_it(self) -> None:\n"
+        f"        {name}(0, 1, 2, 3, 4, 5)\n"
+        for name in func_names
+    )
+    return imports + classes
+
+
+@contextmanager
+def _open_proj_dir(proj_dir: Path | None, *, spec: ProjSpec) -> Iterator[Path]:
+    """Open a directory holding the project, generating it if it doesn't exist yet."""
+    if proj_dir is None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_project(Path(tmp_dir), spec)
+            yield Path(tmp_dir)
+        return
+
+    spec_path = proj_dir / _SPEC_FILE_NAME
+    if spec_path.exists():
+        if json.loads(spec_path.read_text()) != asdict(spec):
+            msg = f"{proj_dir} holds a project generated with different parameters."
+            raise ValueError(msg)
+    elif proj_dir.exists() and any(proj_dir.iterdir()):
+        msg = f"{proj_dir} is not empty, and wasn't generated by this benchmark."
+        raise ValueError(msg)
+    else:
+        proj_dir.mkdir(parents=True, exist_ok=True)
+        write_project(proj_dir, spec)
+        spec_path.write_text(json.dumps(asdict(spec)))
+    yield proj_dir.resolve()
+
+
+def _open_executor(*, jobs: int) -> AbstractContextManager[Executor | None]:
+    if jobs == 1:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers=jobs or None)
+
+
+def _compare(
+    results: dict[str, object],
+    *,
+    baseline_path: Path,
+    tolerance: float,
+) -> bool:
+    """Print how each phase compares to a baseline, giving whether any regressed."""
+    baseline = json.loads(baseline_path.read_text())
+    if baseline["spec"] != results["spec"]:
+        msg = f"{baseline_path} was recorded for a project with different parameters."
+        raise ValueError(msg)
+
+    seconds_by_phase = results["seconds"]
+    assert isinstance(seconds_by_phase, dict)
+    regressed = False
+    print(f"Compared to {baseline_path}:")
+    for phase in PHASES:
+        ratio = seconds_by_phase[phase] / baseline["seconds"][phase]
+        is_regression = ratio > 1 + tolerance
+        regressed |= is_regression
+        print(f"  {phase:>16}: {ratio:6.2f} x{'  REGRESSION' if is_regression else ''}")
+    return regressed
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--funcs", type=int, default=10)
+    parser.add_argument(
+        "--coverage",
+        type=float,
+        default=0.8,
+        help="The proportion of functions which have tests.",
+    )
+    parser.add_argument("--layout", choices=["unit", "consolidated"], default="unit")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--engine", choices=get_args(ParseEngine))
+    parser.add_argument("--proj-dir", type=Path)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--compare", type=Path, help="JSON results to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="How much slower than the baseline a phase can be, e.g. 0.2 for 20%%.",
+    )
+    args = parser.parse_args()
+
+    spec = ProjSpec(
+        n_files=args.files,
+        depth=args.depth,
+        n_funcs=args.funcs,
+        coverage=args.coverage,
+        layout=args.layout,
+        seed=args.seed,
+    )
+    print(f"Checking {spec}:")
+    with (
+        _open_proj_dir(args.proj_dir, spec=spec) as proj_dir,
+        _open_executor(jobs=args.jobs) as executor,
+    ):
+        seconds_by_phase = dict.fromkeys(PHASES, float("inf"))
+        for _ in range(args.repeat):
+            run_seconds_by_phase, n_violations = time_phases(
+                proj_dir,
+                executor=executor,
+                parse_engine=args.engine,
+            )
+            for phase, seconds in run_seconds_by_phase.items():
+                seconds_by_phase[phase] = min(seconds_by_phase[phase], seconds)
+
+    for phase, seconds in seconds_by_phase.items():
+        print(f"  {phase:>16}: {seconds * 1000:10.1f} ms")
+    print(f"  {'total':>16}: {sum(seconds_by_phase.values()) * 1000:10.1f} ms")
+    print(f"  {n_violations} violations")
+
+    results: dict[str, object] = {
+        "spec": asdict(spec),
+        "jobs": args.jobs,
+        "engine": args.engine,
+        "python": platform.python_version(),
+        "n_violations": n_violations,
+        "seconds": seconds_by_phase,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.compare is not None and _compare(
+        results,
+        baseline_path=args.compare,
+        tolerance=args.tolerance,
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark how long suiteas takes to start, and which imports it's spent on.
+
+suiteas runs as a pre-commit hook on every commit, often for only a couple of files, so
+its fixed start-up cost matters. This reports the time taken to import the modules
+needed to start, to check a project, and to ask a running daemon to check files.
+"""
+
+import argparse
+
+from suiteas_test.importtime import IMPORT_TIME_BUDGET_US, get_import_times
+
+_MODULE_BY_STAGE = {
+    "start": "suiteas.core.run",
+    "daemon client": "suiteas.core.daemon",
+    "check": "suiteas.read.project",
+}
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of the slowest imports to list for each stage.",
+    )
+    args = parser.parse_args()
+
+    print(f"Import time budget to start: {IMPORT_TIME_BUDGET_US / 1000:.1f} ms")
+    for stage, module in _MODULE_BY_STAGE.items():
+        total_import_time, import_time_by_module = min(
+            (get_import_times(module) for _ in range(args.repeat)),
+            key=lambda run: run[0],
+        )
+        print(f"{stage} ({module}): {total_import_time / 1000:.1f} ms")
+        # Parent packages are imported first, so their times include the module's.
+        imports = [
+            (name, import_time_us)
+            for name, import_time_us in import_time_by_module.items()
+            if not f"{module}.".startswith(f"{name}.")
+        ]
+        slowest = sorted(imports, key=lambda item: item[1], reverse=True)
+        for name, import_time_us in slowest[: args.top]:
+            print(f"  {import_time_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
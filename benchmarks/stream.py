@@ -0,0 +1,107 @@
+"""Benchmark the peak memory of checking projects whole, and by streaming their files.
+
+Synthetic projects of increasing size are generated as by benchmarks.project, and each
+is checked in a fresh interpreter, so the two modes don't share any memory. Checking a
+project whole holds every file's facts at once, so its peak resident set size grows
+with the project, whereas streaming should keep it flat.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.project import ProjSpec, write_project
+from suiteas.core.check import get_violations
+from suiteas.core.stream import get_streamed_violations
+from suiteas.read.project import get_project
+
+
+def _get_max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, and macOS reports bytes.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _check(proj_dir: Path, *, stream: bool) -> None:
+    """Check the project in this process, and print the memory and time it took."""
+    start_max_rss = _get_max_rss_bytes()
+    start = time.perf_counter()
+    if stream:
+        n_violations = sum(1 for _ in get_streamed_violations(proj_dir))
+    else:
+        n_violations = sum(1 for _ in get_violations(get_project(proj_dir=proj_dir)))
+    result = {
+        "seconds": time.perf_counter() - start,
+        "peak_bytes": _get_max_rss_bytes() - start_max_rss,
+        "n_violations": n_violations,
+    }
+    print(json.dumps(result))
+
+
+def _measure(proj_dir: Path, *, stream: bool) -> tuple[float, int, int]:
+    output = subprocess.run(
+        [  # noqa: S603
+            sys.executable,
+            "-m",
+            "benchmarks.stream",
+            f"--check={proj_dir}",
+            *(["--stream"] if stream else []),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output)
+    return result["seconds"], result["peak_bytes"], result["n_violations"]
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--funcs", type=int, default=10)
+    parser.add_argument(
+        "--check",
+        type=Path,
+        help="Check only this project, in this process.",
+    )
+    parser.add_argument("--stream", action="store_true")
+    args = parser.parse_args()
+
+    if args.check is not None:
+        _check(args.check, stream=args.stream)
+        return
+
+    print(f"  {'Files':>6}  {'Mode':>6}  {'Time (ms)':>10}  {'Peak (MiB)':>10}")
+    for n_files in args.files:
+        spec = ProjSpec(
+            n_files=n_files,
+            depth=2,
+            n_funcs=args.funcs,
+            coverage=0.5,
+            layout="unit",
+            seed=0,
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_project(Path(tmp_dir), spec)
+            results = {
+                "whole": _measure(Path(tmp_dir), stream=False),
+                "stream": _measure(Path(tmp_dir), stream=True),
+            }
+        (_, _, whole_n_violations), (_, _, stream_n_violations) = results.values()
+        assert whole_n_violations == stream_n_violations
+
+        for name, (elapsed, peak_bytes, _) in results.items():
+            print(
+                f"  {n_files:>6}  {name:>6}  {elapsed * 1000:10.1f}  "
+                f"{peak_bytes / 2**20:10.1f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,13 @@
 
 from pathlib import Path
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, PositiveInt, model_validator
 from typing_extensions import Self
 
 from suiteas.core.rules import RULE_CODES, RuleCode
+from suiteas.domain import CodebaseStore
+from suiteas.read.discover import FileSource
+from suiteas.read.file import ParseEngine
 
 
 class ProjConfig(BaseModel):
@@ -17,6 +20,13 @@ class ProjConfig(BaseModel):
     unittest_dir_name: Path = Path("unit")
     use_consolidated_tests_dir: bool = False
     checks: list[RuleCode] = RULE_CODES
+    parse_engine: ParseEngine = "ast"
+    exclude_dirs: list[str] = []
+    exclude: list[str] = []
+    exclude_generated: bool = False
+    max_file_bytes: PositiveInt | None = None
+    file_source: FileSource = "walk"
+    codebase_store: CodebaseStore = "objects"
 
     @model_validator(mode="after")
     def check_consolidation_consistency(self) -> Self:
@@ -1,10 +1,10 @@
 """Functionality to check whether a test suite is compliant."""
 
 
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
 
-from pydantic.alias_generators import to_snake
-
 from suiteas.core.names import PYTEST_CLASS_PREFIX
 from suiteas.core.path import path_to_pytest_path
 from suiteas.core.rules import (
@@ -13,79 +13,121 @@ from suiteas.core.rules import (
     unimported_tested_func,
 )
 from suiteas.core.violations import Violation
-from suiteas.domain import File, Func, Project, PytestFile
+from suiteas.domain import Codebase, CompactCodebase, Func, Project, PytestFile
 
+# The prefix is normalized like the rest of a pytest class's name, see _get_test_key.
+_TEST_KEY_PREFIX = PYTEST_CLASS_PREFIX.lower()
 
-def get_violations(project: Project) -> list[Violation]:
-    """Check whether a test suite is compliant, and get a list of any violations."""
 
-    violations = []
+@dataclass(slots=True, kw_only=True)
+class _PytestFileIndex:
+    """Hash indexes of a pytest file, to match functions against it in constant time."""
+
+    # The normalized names of the pytest classes, see _get_test_key.
+    test_keys: frozenset[str]
+    imported_objs: frozenset[str]
+
+
+def get_violations(project: Project) -> Iterator[Violation]:
+    """Check whether a test suite is compliant, and get any violations.
 
+    Violations are given as soon as they are found, file by file, so they can be
+    reported before the whole project has been checked.
+    """
     pytest_file_by_rel_path = {
         pytest_file.path.relative_to(project.proj_dir): pytest_file
         for pytest_file in project.pytest_suite.pytest_files
     }
+    # Indexed on demand, since most pytest files are only needed for one file.
+    pytest_index_by_rel_path: dict[Path, _PytestFileIndex] = {}
 
-    for file in project.codebase.files:
-        if not file.funcs:
+    for path, funcs in _iter_public_funcs(project.codebase):
+        if not funcs:
             continue
 
         pytest_rel_path = path_to_pytest_path(
-            path=file.path,
+            path=path,
             proj_config=project.config,
             proj_dir=project.proj_dir,
         ).relative_to(project.proj_dir)
-        pytest_file = pytest_file_by_rel_path.get(pytest_rel_path)
-
-        for func in file.funcs:
-            if func.is_underscored:
-                continue
-
+        pytest_index = pytest_index_by_rel_path.get(pytest_rel_path)
+        if pytest_index is None:
+            pytest_file = pytest_file_by_rel_path.get(pytest_rel_path)
+            if pytest_file is not None:
+                pytest_index = _get_pytest_file_index(pytest_file)
+                pytest_index_by_rel_path[pytest_rel_path] = pytest_index
+
+        for func in funcs:
             if "SUI001" in project.config.checks:
-                violations.extend(
-                    _get_sui001_violations(
-                        pytest_file=pytest_file,
-                        func=func,
-                        file=file,
-                        project=project,
-                        pytest_rel_path=pytest_rel_path,
-                    ),
+                yield from _get_sui001_violations(
+                    pytest_index=pytest_index,
+                    func=func,
+                    path=path,
+                    project=project,
+                    pytest_rel_path=pytest_rel_path,
                 )
 
             if "SUI003" in project.config.checks:
-                violations.extend(
-                    _get_sui003_violations(
-                        pytest_file=pytest_file,
-                        func=func,
-                        file=file,
-                        project=project,
-                        pytest_rel_path=pytest_rel_path,
-                    ),
+                yield from _get_sui003_violations(
+                    pytest_index=pytest_index,
+                    func=func,
+                    path=path,
+                    project=project,
+                    pytest_rel_path=pytest_rel_path,
                 )
 
     # Check SUI002: empty-pytest-class
     if "SUI002" in project.config.checks:
-        violations.extend(_get_sui002_violations(project=project))
-
-    return violations
+        yield from _get_sui002_violations(project=project)
+
+
+def _iter_public_funcs(
+    codebase: Codebase | CompactCodebase,
+) -> Iterator[tuple[Path, list[Func]]]:
+    """Get the public functions of each file, in the order of the codebase's files.
+
+    A compact codebase is read column by column, so only the functions of one file at
+    a time are built as domain objects.
+    """
+    if isinstance(codebase, Codebase):
+        for file in codebase.files:
+            yield file.path, [func for func in file.funcs if not func.is_underscored]
+        return
+
+    strings = codebase.strings
+    for file_idx, module_id in enumerate(codebase.file_module_ids):
+        module_name = strings[module_id]
+        funcs = []
+        for row in range(*codebase.func_starts[file_idx : file_idx + 2]):
+            name = strings[codebase.func_name_ids[row]]
+            if not name.startswith("_"):
+                funcs.append(
+                    Func(
+                        name=name,
+                        full_name=f"{module_name}.{name}",
+                        line_num=codebase.func_line_nums[row],
+                        char_offset=codebase.func_char_offsets[row],
+                    ),
+                )
+        yield Path(strings[codebase.file_path_ids[file_idx]]), funcs
 
 
 def _get_sui001_violations(
     *,
-    pytest_file: PytestFile | None,
+    pytest_index: _PytestFileIndex | None,
     func: Func,
-    file: File,
+    path: Path,
     project: Project,
     pytest_rel_path: Path,
 ) -> list[Violation]:
     if not _pytest_file_has_func_tests(
-        pytest_file=pytest_file,
+        pytest_index=pytest_index,
         func=func,
     ):
         return [
             Violation(
                 rule=missing_test_func,
-                rel_path=file.path.relative_to(project.proj_dir),
+                rel_path=path.relative_to(project.proj_dir),
                 line_num=func.line_num,
                 char_offset=func.char_offset,
                 fmt_info=dict(
@@ -117,20 +159,20 @@ def _get_sui002_violations(
 
 def _get_sui003_violations(
     *,
-    pytest_file: PytestFile | None,
+    pytest_index: _PytestFileIndex | None,
     func: Func,
-    file: File,
+    path: Path,
     project: Project,
     pytest_rel_path: Path,
 ) -> list[Violation]:
     if not _pytest_file_imports_func(
-        pytest_file=pytest_file,
+        pytest_index=pytest_index,
         func=func,
     ):
         return [
             Violation(
                 rule=unimported_tested_func,
-                rel_path=file.path.relative_to(project.proj_dir),
+                rel_path=path.relative_to(project.proj_dir),
                 line_num=func.line_num,
                 char_offset=func.char_offset,
                 fmt_info=dict(
@@ -142,31 +184,44 @@ def _get_sui003_violations(
     return []
 
 
+def _get_pytest_file_index(pytest_file: PytestFile) -> _PytestFileIndex:
+    return _PytestFileIndex(
+        test_keys=frozenset(
+            _get_test_key(pytest_class.name)
+            for pytest_class in pytest_file.pytest_classes
+        ),
+        imported_objs=frozenset(pytest_file.imported_objs),
+    )
+
+
 def _pytest_file_has_func_tests(
     *,
-    pytest_file: PytestFile | None,
+    pytest_index: _PytestFileIndex | None,
     func: Func,
 ) -> bool:
     """Check whether a pytest file has tests for a function."""
-    if pytest_file is None:
+    if pytest_index is None:
         return False
 
-    for pytest_class in pytest_file.pytest_classes:
-        if to_snake(pytest_class.name).replace(
-            "_",
-            "",
-        ) == to_snake(PYTEST_CLASS_PREFIX) + func.name.replace("_", ""):
-            return True
-    return False
+    return _TEST_KEY_PREFIX + func.name.replace("_", "") in pytest_index.test_keys
 
 
 def _pytest_file_imports_func(
     *,
-    pytest_file: PytestFile | None,
+    pytest_index: _PytestFileIndex | None,
     func: Func,
 ) -> bool:
     """Check whether a pytest file imports a function."""
-    if pytest_file is None:
+    if pytest_index is None:
         return True  # Tautologically
 
-    return func.full_name in pytest_file.imported_objs
+    return func.full_name in pytest_index.imported_objs
+
+
+def _get_test_key(pytest_class_name: str) -> str:
+    """Normalize the name of a pytest class, ignoring its case convention.
+
+    A pytest class tests a function if its key is _TEST_KEY_PREFIX followed by the
+    function's name without underscores, e.g. TestFooBar tests foo_bar.
+    """
+    return pytest_class_name.replace("_", "").replace("-", "").lower()
@@ -0,0 +1,296 @@
+"""A long-lived server which keeps a project in memory to check it quickly.
+
+The daemon listens on a Unix socket in a directory only the current user can access,
+and both ends check that the other runs as the same user, so that another user can't
+check files through the daemon or impersonate it.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # The client only needs to talk to the daemon, so it doesn't import the machinery
+    # for checking projects.
+    from concurrent.futures import Executor
+
+    from suiteas.config import ProjConfig
+    from suiteas.read.cache import FactCache
+    from suiteas.read.file import ParseEngine
+
+_RECV_SIZE = 65536
+# How long the daemon waits on a client to send its request, so that a stuck client
+# can't block the others.
+_REQUEST_TIMEOUT_S = 5.0
+# How long a client waits on the daemon to reply, which includes checking the files.
+_REPLY_TIMEOUT_S = 60.0
+# The process ID, user ID and group ID of a socket's peer, as given by SO_PEERCRED.
+_PEERCRED_STRUCT = struct.Struct("3i")
+
+
+class DaemonError(RuntimeError):
+    """Raised when the daemon could not be started or communicated with."""
+
+
+def get_socket_path(proj_dir: Path) -> Path:
+    """Get the path of the socket which the daemon for a project listens on.
+
+    The socket lives in $XDG_RUNTIME_DIR if it's set, and otherwise in a suiteas-<uid>
+    directory in the temporary directory, which is created if needed. Either must be
+    owned by the current user and inaccessible to others, or DaemonError is raised.
+    """
+    # Unix socket paths are limited to around 100 characters, so they can't live
+    # inside arbitrarily deep project directories.
+    proj_digest = hashlib.blake2b(
+        os.fsencode(proj_dir.resolve()),
+        digest_size=8,
+    ).hexdigest()
+    return _get_socket_dir() / f"suiteas-{proj_digest}.sock"
+
+
+def serve(
+    proj_dir: Path,
+    *,
+    socket_path: Path,
+    cache: "FactCache",
+    executor: "Executor | None" = None,
+    parse_engine: "ParseEngine | None" = None,
+) -> None:
+    """Serve checks of a project until asked to stop.
+
+    The facts of files are kept in memory by the cache, so only files which have
+    changed since the previous check are re-read. The configuration is only re-read
+    when pyproject.toml changes.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        msg = "The suiteas daemon is not supported on this platform."
+        raise DaemonError(msg)
+
+    if _request(socket_path, {"ping": True}) is not None:
+        msg = f"Another suiteas daemon is already serving {proj_dir}"
+        raise DaemonError(msg)
+    socket_path.unlink(missing_ok=True)
+
+    config_loader = _ConfigLoader(proj_dir)
+
+    old_umask = os.umask(0o077)
+    try:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(os.fspath(socket_path))
+    finally:
+        os.umask(old_umask)
+
+    with server:
+        server.listen()
+        print(  # noqa: T201
+            f"suiteas daemon serving {proj_dir} at {socket_path}",
+            file=sys.stderr,
+        )
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    try:
+                        conn.settimeout(_REQUEST_TIMEOUT_S)
+                        if not _is_peer_trusted(conn, socket_path=socket_path):
+                            continue
+                        request = _recv_json(conn)
+                        if request.get("stop"):
+                            _send_json(conn, {"stopped": True})
+                            break
+                        if request.get("ping"):
+                            _send_json(conn, {"pong": True})
+                            continue
+                        response = _check(
+                            request,
+                            proj_dir=proj_dir,
+                            config_loader=config_loader,
+                            cache=cache,
+                            executor=executor,
+                            parse_engine=parse_engine,
+                        )
+                        conn.settimeout(_REPLY_TIMEOUT_S)
+                        _send_json(conn, response)
+                    except (OSError, ValueError, KeyError, TypeError):
+                        # A misbehaving client shouldn't bring down the daemon.
+                        continue
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def request_check(socket_path: Path, *, files: list[Path]) -> list[str] | None:
+    """Ask a running daemon to check files, giving formatted violation messages.
+
+    Returns None if no daemon is running, or if the daemon failed to check the files.
+    """
+    response = _request(
+        socket_path,
+        {"files": [os.fspath(path.resolve()) for path in files]},
+    )
+    if response is None or "violations" not in response:
+        return None
+    msgs: list[str] = response["violations"]
+    return msgs
+
+
+def request_stop(socket_path: Path) -> bool:
+    """Ask a running daemon to stop, giving whether there was one to stop."""
+    response = _request(socket_path, {"stop": True})
+    return response is not None
+
+
+class _ConfigLoader:
+    """Loads a project's configuration, re-loading only if it might resolve differently.
+
+    The configuration is fingerprinted as by the cache, from pyproject.toml and the
+    directories it was resolved from, e.g. so that a new package is noticed.
+    """
+
+    def __init__(self, proj_dir: Path) -> None:
+        self.proj_dir = proj_dir
+        self._fingerprint: str | None = None
+        self._config: ProjConfig | None = None
+
+    def get_config(self) -> "ProjConfig":
+        from suiteas.read.cache import get_config_fingerprint
+        from suiteas.read.config import get_config
+
+        # Without a fingerprint, e.g. just after an edit, the config is always reloaded.
+        if (
+            self._config is not None
+            and self._fingerprint is not None
+            and get_config_fingerprint(self.proj_dir, config=self._config)
+            == self._fingerprint
+        ):
+            return self._config
+
+        self._config = get_config(proj_dir=self.proj_dir)
+        self._fingerprint = get_config_fingerprint(
+            self.proj_dir,
+            config=self._config,
+        )
+        return self._config
+
+
+def _check(  # noqa: PLR0913
+    request: dict[str, Any],
+    *,
+    proj_dir: Path,
+    config_loader: _ConfigLoader,
+    cache: "FactCache",
+    executor: "Executor | None",
+    parse_engine: "ParseEngine | None",
+) -> dict[str, Any]:
+    from suiteas.core.check import get_violations
+    from suiteas.core.print import format_violation
+    from suiteas.read.project import get_project
+
+    try:
+        project = get_project(
+            proj_dir=proj_dir,
+            included_files=[Path(path_str) for path_str in request["files"]],
+            cache=cache,
+            executor=executor,
+            config=config_loader.get_config(),
+            parse_engine=parse_engine,
+        )
+        violations = get_violations(project)
+    except Exception as err:  # noqa: BLE001
+        # The client re-runs the check itself to report the error properly.
+        return {"error": str(err)}
+    return {"violations": [format_violation(violation) for violation in violations]}
+
+
+def _request(socket_path: Path, request: dict[str, Any]) -> dict[str, Any] | None:
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(_REPLY_TIMEOUT_S)
+            conn.connect(os.fspath(socket_path))
+            if not _is_peer_trusted(conn, socket_path=socket_path):
+                return None
+            _send_json(conn, request)
+            conn.shutdown(socket.SHUT_WR)
+            return _recv_json(conn)
+    except (OSError, ValueError):
+        return None
+
+
+def _get_socket_dir() -> Path:
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:
+        # Without Unix users, e.g. on Windows, the temporary directory is per-user.
+        return Path(tempfile.gettempdir())
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        socket_dir = Path(runtime_dir)
+    else:
+        socket_dir = Path(tempfile.gettempdir()) / f"suiteas-{getuid()}"
+        try:
+            socket_dir.mkdir(mode=0o700)
+        except FileExistsError:
+            pass
+        except OSError as err:
+            msg = f"Could not create {socket_dir} for the suiteas daemon: {err}"
+            raise DaemonError(msg) from err
+
+    # The directory might have been created by another user, to plant a socket in it.
+    try:
+        dir_stat = socket_dir.lstat()
+    except OSError as err:
+        msg = f"Could not use {socket_dir} for the suiteas daemon: {err}"
+        raise DaemonError(msg) from err
+    if (
+        not stat.S_ISDIR(dir_stat.st_mode)
+        or dir_stat.st_uid != getuid()
+        or stat.S_IMODE(dir_stat.st_mode) & 0o077
+    ):
+        msg = (
+            f"Refusing to use {socket_dir} for the suiteas daemon, since it isn't a "
+            "directory private to the current user"
+        )
+        raise DaemonError(msg)
+    return socket_dir
+
+
+def _is_peer_trusted(conn: socket.socket, *, socket_path: Path) -> bool:
+    """Check whether the other end of a connection runs as the current user."""
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = conn.getsockopt(
+            socket.SOL_SOCKET,
+            socket.SO_PEERCRED,
+            _PEERCRED_STRUCT.size,
+        )
+        _, peer_uid, _ = _PEERCRED_STRUCT.unpack(creds)
+    else:
+        # Only the daemon's own user can connect, given the directory's permissions,
+        # so the owner of the socket is checked instead.
+        peer_uid = socket_path.lstat().st_uid
+    return bool(peer_uid == os.getuid())
+
+
+def _send_json(conn: socket.socket, obj: dict[str, Any]) -> None:
+    conn.sendall(json.dumps(obj).encode("utf8") + b"\n")
+
+
+def _recv_json(conn: socket.socket) -> dict[str, Any]:
+    chunks = []
+    while True:
+        chunk = conn.recv(_RECV_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    obj: dict[str, Any] = json.loads(b"".join(chunks))
+    return obj
@@ -0,0 +1,129 @@
+"""Functionality to check many projects under one root directory, e.g. a monorepo.
+
+Every directory with a pyproject.toml file holding a [tool.suiteas] section is a
+project. The projects are checked one after another in the same process, sharing a
+cache and any worker processes, and violations are reported relative to the root.
+"""
+
+import dataclasses
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor
+from pathlib import Path
+
+import tomli
+
+from suiteas.core.check import get_violations
+from suiteas.core.names import PYPROJTOML_NAME
+from suiteas.core.profile import Profiler, profile_phase
+from suiteas.core.stream import get_streamed_violations
+from suiteas.core.violations import Violation
+from suiteas.read.cache import FactCache
+from suiteas.read.discover import find_files
+from suiteas.read.file import ParseEngine
+from suiteas.read.project import get_project
+
+
+def get_monorepo_violations(  # noqa: PLR0913
+    root_dir: Path,
+    *,
+    included_files: list[Path] | None = None,
+    cache: FactCache | None = None,
+    executor: Executor | None = None,
+    parse_engine: ParseEngine | None = None,
+    profiler: Profiler | None = None,
+    stream: bool = False,
+) -> Iterator[Violation]:
+    """Check every project under a root directory, and get any violations.
+
+    If files are included, then only the projects which contain them are checked, and
+    files outside of every project are ignored. Each project is only read once the
+    previous one has been checked, so violations are given as soon as they are found.
+    If streaming, then each project is checked in constant memory, as by
+    get_streamed_violations.
+    """
+    root_dir = root_dir.resolve()
+    with profile_phase(profiler, "discovery"):
+        proj_dirs = find_proj_dirs(root_dir)
+        if included_files:
+            included_files_by_proj_dir = group_paths_by_proj_dir(
+                included_files,
+                proj_dirs=proj_dirs,
+            )
+        else:
+            included_files_by_proj_dir = {proj_dir: [] for proj_dir in proj_dirs}
+
+    for proj_dir, proj_included_files in included_files_by_proj_dir.items():
+        if stream:
+            violations = get_streamed_violations(
+                proj_dir,
+                included_files=proj_included_files,
+                cache=cache,
+                executor=executor,
+                parse_engine=parse_engine,
+                profiler=profiler,
+            )
+        else:
+            project = get_project(
+                proj_dir=proj_dir,
+                included_files=proj_included_files,
+                cache=cache,
+                executor=executor,
+                parse_engine=parse_engine,
+                profiler=profiler,
+            )
+            violations = get_violations(project)
+
+        rel_proj_dir = proj_dir.relative_to(root_dir)
+        for violation in violations:
+            yield dataclasses.replace(
+                violation,
+                rel_path=rel_proj_dir / violation.rel_path,
+            )
+
+
+def find_proj_dirs(root_dir: Path, *, exclude_dirs: Sequence[str] = ()) -> list[Path]:
+    """Find the directories of the projects configured for suiteas, in sorted order."""
+    return [
+        toml_path.parent
+        for toml_path in find_files(
+            root_dir.resolve(),
+            is_file_name=PYPROJTOML_NAME.__eq__,
+            exclude_dirs=exclude_dirs,
+        )
+        if _has_config_section(toml_path)
+    ]
+
+
+def group_paths_by_proj_dir(
+    paths: Sequence[Path],
+    *,
+    proj_dirs: Sequence[Path],
+) -> dict[Path, list[Path]]:
+    """Group paths by the innermost project which contains them.
+
+    Paths outside of every project are left out, as are projects without any paths.
+    The projects are given in the same order as proj_dirs.
+    """
+    proj_dir_set = set(proj_dirs)
+    paths_by_proj_dir: dict[Path, list[Path]] = {}
+    for path in paths:
+        resolved_path = path.resolve()
+        for parent_dir in resolved_path.parents:
+            if parent_dir in proj_dir_set:
+                paths_by_proj_dir.setdefault(parent_dir, []).append(resolved_path)
+                break
+
+    return {
+        proj_dir: paths_by_proj_dir[proj_dir]
+        for proj_dir in proj_dirs
+        if proj_dir in paths_by_proj_dir
+    }
+
+
+def _has_config_section(toml_path: Path) -> bool:
+    with toml_path.open(mode="rb") as _f:
+        try:
+            parsed_toml = tomli.load(_f)
+        except tomli.TOMLDecodeError:
+            return False
+    return "suiteas" in parsed_toml.get("tool", {})
@@ -7,3 +7,5 @@ PYTEST_FUNC_PREFIX = "test"
 PYTEST_CLASS_PREFIX = "Test"
 
 PYPROJTOML_NAME = "pyproject.toml"
+
+CACHE_DIR_NAME = ".suiteas_cache"
@@ -1,4 +1,6 @@
 """Utilities for manipulating paths."""
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from suiteas.config import ProjConfig
@@ -41,3 +43,97 @@ def _get_main_src_dir(proj_config: ProjConfig, proj_dir: Path) -> Path:
         (pkg_name,) = proj_config.pkg_names
         main_src_dir /= pkg_name
     return main_src_dir
+
+
+@dataclass(slots=True, kw_only=True)
+class _TrieNode:
+    children: dict[str, "_TrieNode"] = field(default_factory=dict)
+    is_src_dir: bool = False
+    is_pytest_dir: bool = False
+
+
+class PathIndex:
+    """An index of a project's directories, to classify and map many paths quickly.
+
+    Paths are given as absolute, normalized strings. Each one is classified by walking
+    a trie of the directories holding source and pytest files, one part of the path at
+    a time, and mapped to its counterpart by slicing strings, so no Path objects are
+    created along the way.
+    """
+
+    def __init__(self, *, proj_config: ProjConfig, proj_dir: Path) -> None:
+        """Index the directories of a project."""
+        self._root = _TrieNode()
+        src_dir = proj_dir / proj_config.src_rel_path
+        for pkg_name in proj_config.pkg_names:
+            self._get_node(src_dir / pkg_name).is_src_dir = True
+
+        tests_dir = proj_dir / proj_config.tests_rel_path
+        unittests_dir = tests_dir / proj_config.unittest_dir_name
+        if proj_config.use_consolidated_tests_dir:
+            self._get_node(tests_dir).is_pytest_dir = True
+        else:
+            for pkg_name in proj_config.pkg_names:
+                self._get_node(unittests_dir / pkg_name).is_pytest_dir = True
+
+        main_src_dir = _get_main_src_dir(proj_config, proj_dir)
+        self._main_src_prefix = os.path.normpath(main_src_dir)
+        self._unittest_prefix = os.path.normpath(unittests_dir)
+
+    def classify(self, path_str: str) -> tuple[bool, bool]:
+        """Get whether a path is within a source directory, and a pytest directory."""
+        is_src_path = is_pytest_path = False
+        node = self._root
+        # Only the directories containing the path count, not the path itself.
+        for part in _split(path_str)[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            is_src_path |= node.is_src_dir
+            is_pytest_path |= node.is_pytest_dir
+        return is_src_path, is_pytest_path
+
+    def to_pytest_path_str(self, path_str: str) -> str:
+        """Convert a source path to its pytest path, like path_to_pytest_path."""
+        rel_dir, _, name = self._get_rel_path_str(
+            path_str,
+            prefix=self._main_src_prefix,
+        ).rpartition(os.sep)
+        stem, _ = os.path.splitext(name)  # noqa: PTH122
+        return os.path.join(  # noqa: PTH118
+            self._unittest_prefix,
+            rel_dir,
+            f"{PYTEST_FILE_PREFIX}{stem}.py",
+        )
+
+    def to_path_str(self, pytest_path_str: str) -> str:
+        """Convert a pytest path to its source path, like pytest_path_to_path."""
+        rel_dir, _, name = self._get_rel_path_str(
+            pytest_path_str,
+            prefix=self._unittest_prefix,
+        ).rpartition(os.sep)
+        return os.path.join(  # noqa: PTH118
+            self._main_src_prefix,
+            rel_dir,
+            name.removeprefix(PYTEST_FILE_PREFIX),
+        )
+
+    def _get_node(self, dir_path: Path) -> _TrieNode:
+        node = self._root
+        for part in _split(os.path.normpath(dir_path)):
+            node = node.children.setdefault(part, _TrieNode())
+        return node
+
+    def _get_rel_path_str(self, path_str: str, *, prefix: str) -> str:
+        if os.path.normcase(path_str[: len(prefix) + 1]) != os.path.normcase(
+            prefix + os.sep,
+        ):
+            msg = f"{path_str!r} is not in the subpath of {prefix!r}"
+            raise ValueError(msg)
+        return path_str[len(prefix) + 1 :]
+
+
+def _split(path_str: str) -> list[str]:
+    # Splitting strings is much faster than splitting Path objects into their parts.
+    return os.path.normcase(path_str).split(os.sep)  # noqa: PTH206
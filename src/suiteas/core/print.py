@@ -1,16 +1,61 @@
 """Functionality for printing to the console."""
 import sys
+from collections.abc import Iterable
 
 from suiteas.core.violations import Violation
 
+# Messages are written in batches, rather than one system call per line.
+_MSGS_PER_WRITE = 256
 
-def print_violations(violations: list[Violation]) -> None:
-    """Print a list of violations."""
-    for violation in violations:
-        fmt_info = violation.fmt_info or {}
-        msg = (
-            f"{violation.rel_path}:{violation.line_num}:{violation.char_offset}: "
-            f"{violation.rule.rule_code} "
-            f"{violation.rule.description.format(**fmt_info)}"
-        )
-        print(msg, file=sys.stderr)  # noqa: T201
+
+def print_violations(
+    violations: Iterable[Violation],
+    *,
+    max_violations: int | None = None,
+) -> int:
+    """Print violations as they are found, giving the number printed."""
+    return print_msgs(
+        (format_violation(violation) for violation in violations),
+        max_msgs=max_violations,
+    )
+
+
+def print_msgs(msgs: Iterable[str], *, max_msgs: int | None = None) -> int:
+    """Print violation messages as they are found, giving the number printed.
+
+    The first message is printed straight away, and the rest in batches. If there are
+    more than max_msgs messages, then no more are requested from the iterable once that
+    many have been printed.
+    """
+    n_printed = 0
+    batch: list[str] = []
+    for msg in msgs:
+        if max_msgs is not None and n_printed >= max_msgs:
+            batch.append(f"Stopped early; there are more than {max_msgs} violations.")
+            break
+
+        batch.append(msg)
+        n_printed += 1
+        if n_printed == 1 or len(batch) >= _MSGS_PER_WRITE:
+            _write_batch(batch)
+
+    _write_batch(batch)
+    return n_printed
+
+
+def format_violation(violation: Violation) -> str:
+    """Format a violation as a single-line message."""
+    fmt_info = violation.fmt_info or {}
+    return (
+        f"{violation.rel_path}:{violation.line_num}:{violation.char_offset}: "
+        f"{violation.rule.rule_code} "
+        f"{violation.rule.description.format(**fmt_info)}"
+    )
+
+
+def _write_batch(batch: list[str]) -> None:
+    if not batch:
+        return
+    sys.stderr.write("".join(f"{msg}\n" for msg in batch))
+    sys.stderr.flush()
+    batch.clear()
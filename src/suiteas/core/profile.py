@@ -0,0 +1,226 @@
+"""Utilities for profiling where the time goes when checking a project."""
+
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+PHASES = ("imports", "config", "discovery", "parsing", "checking", "output")
+
+
+@dataclass(slots=True, kw_only=True)
+class FileSpan:
+    """The time spent reading and parsing a file, possibly in a worker process."""
+
+    path: Path
+    n_bytes: int
+    start_ns: int
+    end_ns: int
+    pid: int
+
+
+@dataclass(slots=True, kw_only=True)
+class _PhaseSpan:
+    name: str
+    start_ns: int
+    end_ns: int
+
+
+class Profiler:
+    """Records the time spent in each phase of a run, and on each file read.
+
+    Phases can be nested, in which case time is only counted towards the innermost
+    phase. CPU time is only measured for the main process, so it excludes the time
+    spent by any worker processes.
+    """
+
+    def __init__(self) -> None:
+        """Start profiling."""
+        self.start_ns = time.perf_counter_ns()
+        self.wall_ns_by_phase: dict[str, int] = {}
+        self.cpu_ns_by_phase: dict[str, int] = {}
+        self.file_spans: list[FileSpan] = []
+        self.n_cached_files = 0
+        self._phase_spans: list[_PhaseSpan] = []
+        # The phases being timed, innermost last, with the times they were resumed.
+        self._stack: list[tuple[str, int, int]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Count the time spent within the context towards a phase."""
+        start_ns = self._push(name)
+        try:
+            yield
+        finally:
+            end_ns = self._pop()
+            self._phase_spans.append(
+                _PhaseSpan(name=name, start_ns=start_ns, end_ns=end_ns),
+            )
+
+    def iter_phase(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Iterate, counting the time spent getting each item towards a phase.
+
+        Getting each item is recorded as a span of the phase, so the trace shows how
+        the phase is interleaved with the one consuming the items.
+        """
+        iterator = iter(iterable)
+        while True:
+            start_ns = self._push(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                end_ns = self._pop()
+                self._phase_spans.append(
+                    _PhaseSpan(name=name, start_ns=start_ns, end_ns=end_ns),
+                )
+            yield item
+
+    def add_file_span(self, span: FileSpan) -> None:
+        """Record the time spent reading and parsing a file."""
+        self.file_spans.append(span)
+
+    def format_report(self, *, proj_dir: Path, n_slowest: int) -> str:
+        """Format a summary of the phases, the files read and the slowest files."""
+        total_wall_ns = time.perf_counter_ns() - self.start_ns
+        other_wall_ns = total_wall_ns - sum(self.wall_ns_by_phase.values())
+
+        lines = [f"{'Phase':<12}{'Wall (ms)':>12}{'CPU (ms)':>12}"]
+        for name in [*PHASES, *sorted(set(self.wall_ns_by_phase) - set(PHASES))]:
+            lines.append(
+                f"{name:<12}"
+                f"{self.wall_ns_by_phase.get(name, 0) / 1e6:>12.1f}"
+                f"{self.cpu_ns_by_phase.get(name, 0) / 1e6:>12.1f}",
+            )
+        lines.append(f"{'other':<12}{other_wall_ns / 1e6:>12.1f}")
+        lines.append(f"{'total':<12}{total_wall_ns / 1e6:>12.1f}")
+
+        n_bytes = sum(span.n_bytes for span in self.file_spans)
+        lines.append(
+            f"Read {len(self.file_spans)} files ({n_bytes / 2**20:.1f} MiB); "
+            f"{self.n_cached_files} more were unchanged in the cache.",
+        )
+
+        slowest = sorted(
+            self.file_spans,
+            key=lambda span: span.end_ns - span.start_ns,
+            reverse=True,
+        )[:n_slowest]
+        if slowest:
+            lines.append("Slowest files to read:")
+        for span in slowest:
+            lines.append(
+                f"{(span.end_ns - span.start_ns) / 1e6:>10.1f} ms  "
+                f"{_get_rel_posix(span.path, proj_dir=proj_dir)}",
+            )
+
+        return "".join(f"{line}\n" for line in lines)
+
+    def write_trace(self, path: Path, *, proj_dir: Path) -> None:
+        """Write the phases and files as a Chrome trace-event JSON file."""
+        main_pid = os.getpid()
+        events: list[dict[str, object]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 0,
+                "args": {"name": "suiteas" if pid == main_pid else "suiteas worker"},
+            }
+            for pid in sorted({main_pid} | {span.pid for span in self.file_spans})
+        ]
+        events += [
+            self._get_trace_event(
+                name=span.name,
+                cat="phase",
+                start_ns=span.start_ns,
+                end_ns=span.end_ns,
+                pid=main_pid,
+            )
+            for span in self._phase_spans
+        ]
+        events += [
+            self._get_trace_event(
+                name=_get_rel_posix(span.path, proj_dir=proj_dir),
+                cat="file",
+                start_ns=span.start_ns,
+                end_ns=span.end_ns,
+                pid=span.pid,
+                args={"bytes": span.n_bytes},
+            )
+            for span in self.file_spans
+        ]
+
+        with path.open(mode="w", encoding="utf8") as _f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, _f)
+
+    def _get_trace_event(  # noqa: PLR0913
+        self,
+        *,
+        name: str,
+        cat: str,
+        start_ns: int,
+        end_ns: int,
+        pid: int,
+        args: dict[str, object] | None = None,
+    ) -> dict[str, object]:
+        return {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self.start_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": pid,
+            "tid": 0,
+            "args": args or {},
+        }
+
+    def _push(self, name: str) -> int:
+        wall_ns, cpu_ns = time.perf_counter_ns(), time.process_time_ns()
+        if self._stack:
+            self._add_time_since_resumed(wall_ns=wall_ns, cpu_ns=cpu_ns)
+        self._stack.append((name, wall_ns, cpu_ns))
+        return wall_ns
+
+    def _pop(self) -> int:
+        wall_ns, cpu_ns = time.perf_counter_ns(), time.process_time_ns()
+        self._add_time_since_resumed(wall_ns=wall_ns, cpu_ns=cpu_ns)
+        self._stack.pop()
+        if self._stack:
+            # Resume the enclosing phase.
+            name, _, _ = self._stack[-1]
+            self._stack[-1] = (name, wall_ns, cpu_ns)
+        return wall_ns
+
+    def _add_time_since_resumed(self, *, wall_ns: int, cpu_ns: int) -> None:
+        name, resumed_wall_ns, resumed_cpu_ns = self._stack[-1]
+        self.wall_ns_by_phase[name] = (
+            self.wall_ns_by_phase.get(name, 0) + wall_ns - resumed_wall_ns
+        )
+        self.cpu_ns_by_phase[name] = (
+            self.cpu_ns_by_phase.get(name, 0) + cpu_ns - resumed_cpu_ns
+        )
+
+
+def profile_phase(
+    profiler: Profiler | None,
+    name: str,
+) -> AbstractContextManager[None]:
+    """Count the time spent within the context towards a phase, if profiling."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
+
+
+def _get_rel_posix(path: Path, *, proj_dir: Path) -> str:
+    try:
+        return path.relative_to(proj_dir).as_posix()
+    except ValueError:
+        return path.as_posix()
@@ -0,0 +1,164 @@
+"""Functionality to replay the violations of an earlier run, if nothing has changed.
+
+Checking the same files again, e.g. when a CI job is re-run, would find the same
+violations. So once a whole project has been checked, its violations are stored in the
+cache along with a fingerprint of the run: the resolved configuration, and a Merkle
+tree of every file discovered in the project (see suiteas.read.fingerprint). The
+suiteas version and its checking logic are covered by the cache, which is discarded
+whenever they change. If a later run has the same fingerprint, then the stored
+violations are given without reading a single file. Otherwise, the project is checked
+as usual, and the directories whose files changed can be logged.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+
+from suiteas.config import ProjConfig
+from suiteas.core.check import get_violations
+from suiteas.core.profile import Profiler, profile_phase
+from suiteas.core.rules import RULE_BY_CODE
+from suiteas.core.violations import Violation
+from suiteas.read.cache import FactCache
+from suiteas.read.config import get_file_filter
+from suiteas.read.discover import discover_py_files
+from suiteas.read.file import ParseEngine
+from suiteas.read.fingerprint import FileTree, get_changed_dirs, get_file_tree
+from suiteas.read.project import _read_config, get_project
+from suiteas.read.snapshot import FsSnapshot
+
+
+def get_replayed_violations(  # noqa: PLR0913
+    proj_dir: Path,
+    *,
+    cache: FactCache,
+    executor: Executor | None = None,
+    parse_engine: ParseEngine | None = None,
+    profiler: Profiler | None = None,
+    log: Callable[[str], None] | None = None,
+) -> Iterator[Violation]:
+    """Check a whole project, replaying the violations of an identical earlier run.
+
+    The violations are only stored once they've all been given, so a run which is
+    stopped early, e.g. by a maximum number of violations, isn't replayed later.
+    """
+    # Directories are listed at most once, both to fingerprint and to read the project.
+    snapshot = FsSnapshot()
+    config = _read_config(proj_dir, cache=cache, profiler=profiler, snapshot=snapshot)
+    if parse_engine is not None:
+        config = config.model_copy(update={"parse_engine": parse_engine})
+
+    with profile_phase(profiler, "discovery"):
+        file_tree = _get_proj_file_tree(proj_dir, config=config, snapshot=snapshot)
+    fingerprint = (
+        None if file_tree is None else _get_fingerprint(config, file_tree=file_tree)
+    )
+
+    run = cache.get_run(proj_dir)
+    if run is not None:
+        stored_fingerprint, stored_file_tree_json, violations_json = run
+        if fingerprint is not None and fingerprint == stored_fingerprint:
+            violations = _violations_from_json(violations_json)
+            if log is not None:
+                log(f"Replaying {len(violations)} violations of an identical run")
+            yield from violations
+            return
+        if log is not None and file_tree is not None:
+            changed_rel_dirs = get_changed_dirs(
+                FileTree.from_json(stored_file_tree_json),
+                file_tree,
+            )
+            log(
+                "Checking again, since files changed in "
+                + (", ".join(rel_dir or "." for rel_dir in changed_rel_dirs) or "."),
+            )
+
+    project = get_project(
+        proj_dir=proj_dir,
+        cache=cache,
+        executor=executor,
+        config=config,
+        profiler=profiler,
+        snapshot=snapshot,
+    )
+    violations = []
+    for violation in get_violations(project):
+        violations.append(violation)
+        yield violation
+
+    if fingerprint is not None and file_tree is not None:
+        cache.put_run(
+            proj_dir,
+            fingerprint=fingerprint,
+            file_tree_json=file_tree.to_json(),
+            violations_json=_violations_to_json(violations),
+        )
+
+
+def _get_proj_file_tree(
+    proj_dir: Path,
+    *,
+    config: ProjConfig,
+    snapshot: FsSnapshot,
+) -> FileTree | None:
+    """Fingerprint every file which could be read while checking the project."""
+    src_dir = proj_dir / config.src_rel_path
+    unit_dir = proj_dir / config.tests_rel_path / config.unittest_dir_name
+    if not (snapshot.exists(src_dir) and snapshot.exists(unit_dir)):
+        # Left for reading the project to report.
+        return None
+
+    file_filter = get_file_filter(config, proj_dir=proj_dir)
+    paths = []
+    blob_ids: list[str | None] = []
+    for dir_path in [src_dir, unit_dir]:
+        dir_paths, dir_blob_ids = discover_py_files(
+            dir_path,
+            exclude_dirs=config.exclude_dirs,
+            file_filter=file_filter,
+            file_source=config.file_source,
+            snapshot=snapshot,
+        )
+        paths.extend(dir_paths)
+        blob_ids.extend(dir_blob_ids)
+    return get_file_tree(paths, root_dir=proj_dir, blob_ids=blob_ids)
+
+
+def _get_fingerprint(config: ProjConfig, *, file_tree: FileTree) -> str:
+    fingerprint_parts = [config.model_dump_json(), file_tree.root_hash]
+    return hashlib.blake2b(
+        "\0".join(fingerprint_parts).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def _violations_to_json(violations: list[Violation]) -> str:
+    return json.dumps(
+        [
+            (
+                violation.rule.rule_code,
+                violation.rel_path.as_posix(),
+                violation.line_num,
+                violation.char_offset,
+                violation.fmt_info,
+            )
+            for violation in violations
+        ],
+    )
+
+
+def _violations_from_json(violations_json: str) -> list[Violation]:
+    return [
+        Violation(
+            rule=RULE_BY_CODE[rule_code],
+            rel_path=Path(rel_posix),
+            line_num=line_num,
+            char_offset=char_offset,
+            fmt_info=fmt_info,
+        )
+        for rule_code, rel_posix, line_num, char_offset, fmt_info in json.loads(
+            violations_json,
+        )
+    ]
@@ -2,37 +2,61 @@
 
 
 import typing
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Literal, TypeAlias
 
-from pydantic import BaseModel
-
 RuleCode: TypeAlias = Literal["SUI001", "SUI002", "SUI003"]
 
 RULE_CODES: list[RuleCode] = list(typing.get_args(RuleCode))
 
+# The facts which a rule can need about a project. The facts about pytest files are
+# either needed for every pytest file, or only for those which test a source file.
+Fact: TypeAlias = Literal[
+    "src_funcs",
+    "pytest_classes",
+    "partner_pytest_classes",
+    "partner_pytest_imports",
+]
+
 
-class Rule(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Rule:
     """A rule enforced by SuiteAs."""
 
     rule_code: RuleCode
     name: str
     description: str
+    needs: frozenset[Fact]
 
 
 missing_test_func = Rule(
     rule_code="SUI001",
     name="missing-test-func",
     description="{func} untested in {pytest_file_rel_posix}",
+    needs=frozenset({"src_funcs", "partner_pytest_classes"}),
 )
 
 empty_pytest_class = Rule(
     rule_code="SUI002",
     name="empty-pytest-class",
     description="{pytest_class_name} has no tests",
+    needs=frozenset({"pytest_classes"}),
 )
 
 unimported_tested_func = Rule(
     rule_code="SUI003",
     name="unimported-tested-func",
     description="{func_fullname} is not imported in {pytest_file_rel_posix}",
+    needs=frozenset({"src_funcs", "partner_pytest_imports"}),
 )
+
+RULE_BY_CODE: dict[RuleCode, Rule] = {
+    rule.rule_code: rule
+    for rule in [missing_test_func, empty_pytest_class, unimported_tested_func]
+}
+
+
+def get_needed_facts(checks: Iterable[RuleCode]) -> frozenset[Fact]:
+    """Get the facts needed by the rules to check."""
+    return frozenset().union(*(RULE_BY_CODE[rule_code].needs for rule_code in checks))
@@ -1,27 +1,86 @@
-"""Run the suiteas command line interface."""
+"""Run the suiteas command line interface.
 
+This is imported whenever suiteas starts, e.g. by every pre-commit hook, so anything
+slow to import is only imported when it's needed. Asking a running daemon to check some
+files shouldn't need to import the configuration models or the parsing logic at all.
+"""
+
+import argparse
 import sys
-from collections.abc import Sequence
+import typing
+from collections.abc import Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from suiteas.core.names import CACHE_DIR_NAME, PYPROJTOML_NAME
+from suiteas.read.file import ParseEngine
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-from suiteas.core.check import get_violations
-from suiteas.core.names import PYPROJTOML_NAME
-from suiteas.core.print import print_violations
-from suiteas.read.project import get_project
+    from suiteas.core.profile import Profiler
+    from suiteas.read.cache import FactCache
 
 MAX_PROJ_DIR_DEPTH = 1000
 
 
 def run_suiteas_main(argv: Sequence[str]) -> None:
     """Run the suiteas command line interface without a system exit."""
-    included_files = [Path(arg) for arg in argv]
+    if argv and argv[0] == "daemon":
+        _run_daemon(argv[1:])
+        return
 
-    proj_dir = _infer_proj_dir()
-    project = get_project(proj_dir=proj_dir, included_files=included_files)
+    args = _parse_args(argv)
+    included_files: list[Path] = args.files
+    profiler = _start_profiler() if args.profile or args.trace is not None else None
+
+    proj_dir = _infer_repo_dir() if args.monorepo else _infer_proj_dir()
+    if args.since is not None:
+        included_files += _get_changed_files(
+            proj_dir,
+            since=args.since,
+            profiler=profiler,
+        )
+        if not included_files:
+            return
+
+    if args.watch:
+        from suiteas.core.watch import watch
+
+        with (
+            _open_long_lived_cache(proj_dir, use_cache=args.use_cache) as cache,
+            _open_executor(jobs=args.jobs, verbose=args.verbose) as executor,
+        ):
+            watch(
+                proj_dir,
+                cache=cache,
+                executor=executor,
+                parse_engine=args.parse_engine,
+            )
+        return
+
+    if args.use_daemon and profiler is None:
+        from suiteas.core.daemon import DaemonError, get_socket_path, request_check
+        from suiteas.core.print import print_msgs
+
+        try:
+            msgs = request_check(get_socket_path(proj_dir), files=included_files)
+        except DaemonError as err:
+            # Checked directly instead, as if no daemon were running.
+            _log(str(err))
+            msgs = None
+        if msgs is not None:
+            if print_msgs(msgs, max_msgs=args.max_violations):
+                sys.exit(1)
+            return
 
-    violations = get_violations(project)
-    if violations:
-        print_violations(violations)
+    if _check(
+        proj_dir=proj_dir,
+        included_files=included_files,
+        profiler=profiler,
+        args=args,
+    ):
         sys.exit(1)
 
 
@@ -36,6 +95,378 @@ def run_suiteas(argv: Sequence[str] | None = None) -> None:
         sys.exit(1)
 
 
+def _get_changed_files(
+    proj_dir: Path,
+    *,
+    since: str,
+    profiler: "Profiler | None",
+) -> list[Path]:
+    from suiteas.core.profile import profile_phase
+    from suiteas.read.git import GitError, get_changed_paths
+
+    try:
+        with profile_phase(profiler, "discovery"):
+            return get_changed_paths(proj_dir, since=since)
+    except GitError as err:
+        _fail(str(err))
+
+
+def _check(
+    *,
+    proj_dir: Path,
+    included_files: list[Path],
+    profiler: "Profiler | None",
+    args: argparse.Namespace,
+) -> int:
+    """Check a project directly, giving the number of violations printed.
+
+    In monorepo mode, the directory is the root of the monorepo, and every project
+    under it is checked.
+    """
+    from suiteas.core.profile import profile_phase
+
+    with profile_phase(profiler, "imports"):
+        from suiteas.core.check import get_violations
+        from suiteas.core.monorepo import get_monorepo_violations
+        from suiteas.core.print import print_violations
+        from suiteas.core.replay import get_replayed_violations
+        from suiteas.core.stream import get_streamed_violations
+        from suiteas.read.project import get_project
+
+    with (
+        _open_cache(proj_dir, use_cache=args.use_cache) as cache,
+        _open_executor(jobs=args.jobs, verbose=args.verbose) as executor,
+    ):
+        if args.monorepo:
+            # Projects are read lazily, so the cache and workers must stay open.
+            violations = get_monorepo_violations(
+                proj_dir,
+                included_files=included_files,
+                cache=cache,
+                executor=executor,
+                parse_engine=args.parse_engine,
+                profiler=profiler,
+                stream=args.stream,
+            )
+        elif args.stream:
+            violations = get_streamed_violations(
+                proj_dir,
+                included_files=included_files,
+                cache=cache,
+                executor=executor,
+                parse_engine=args.parse_engine,
+                profiler=profiler,
+            )
+        elif cache is not None and not included_files:
+            # A whole run is replayed if nothing has changed since the last one.
+            violations = get_replayed_violations(
+                proj_dir,
+                cache=cache,
+                executor=executor,
+                parse_engine=args.parse_engine,
+                profiler=profiler,
+                log=_log if args.verbose else None,
+            )
+        else:
+            project = get_project(
+                proj_dir=proj_dir,
+                included_files=included_files,
+                cache=cache,
+                executor=executor,
+                parse_engine=args.parse_engine,
+                profiler=profiler,
+            )
+            violations = get_violations(project)
+
+        if profiler is not None:
+            violations = profiler.iter_phase("checking", violations)
+        with profile_phase(profiler, "output"):
+            n_violations = print_violations(
+                violations,
+                max_violations=args.max_violations,
+            )
+
+    if profiler is not None:
+        sys.stderr.write(
+            profiler.format_report(proj_dir=proj_dir, n_slowest=args.profile_top),
+        )
+        if args.trace is not None:
+            profiler.write_trace(args.trace, proj_dir=proj_dir)
+
+    return n_violations
+
+
+def _run_daemon(argv: Sequence[str]) -> None:
+    from suiteas.core.daemon import DaemonError, get_socket_path, request_stop, serve
+
+    args = _parse_daemon_args(argv)
+    proj_dir = _infer_proj_dir()
+    try:
+        socket_path = get_socket_path(proj_dir)
+    except DaemonError as err:
+        _fail(str(err))
+
+    if args.stop:
+        if not request_stop(socket_path):
+            print(f"No suiteas daemon is serving {proj_dir}", file=sys.stderr)  # noqa: T201
+        return
+
+    with (
+        _open_long_lived_cache(proj_dir, use_cache=args.use_cache) as cache,
+        _open_executor(jobs=args.jobs, verbose=args.verbose) as executor,
+    ):
+        try:
+            serve(
+                proj_dir,
+                socket_path=socket_path,
+                cache=cache,
+                executor=executor,
+                parse_engine=args.parse_engine,
+            )
+        except DaemonError as err:
+            _fail(str(err))
+
+
+def _parse_daemon_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="suiteas daemon",
+        description=(
+            "Serve checks for the current project, keeping it in memory so that "
+            "`suiteas --use-daemon` can check files quickly."
+        ),
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the daemon serving the current project.",
+    )
+    _add_read_args(parser)
+    return parser.parse_args(argv)
+
+
+def _parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="suiteas",
+        description="An opinionated testing suite organizer and linter for pytest.",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        type=Path,
+        help="Files to check, along with their counterparts. Default: all files.",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="REF",
+        help="Also check files changed since the given git revision, e.g. origin/main.",
+    )
+    parser.add_argument(
+        "--monorepo",
+        action="store_true",
+        help=(
+            "Check every project under the repository's root directory which has a "
+            "[tool.suiteas] section in its pyproject.toml, in a single run."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Read and check a chunk of files at a time, so that memory use doesn't "
+            "grow with the size of the project."
+        ),
+    )
+    parser.add_argument(
+        "--use-daemon",
+        action="store_true",
+        help=(
+            "Ask a running `suiteas daemon` to check the files, falling back to "
+            "checking them directly if there is none."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Check the whole project, then keep re-checking files as they change, "
+            "printing only new and fixed violations."
+        ),
+    )
+    parser.add_argument(
+        "--max-violations",
+        metavar="N",
+        type=_positive_int,
+        help="Stop checking after printing N violations. Default: no limit.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Report the time spent in each phase and the slowest files to read. "
+            "Files are checked directly, rather than by a daemon."
+        ),
+    )
+    parser.add_argument(
+        "--profile-top",
+        metavar="N",
+        type=_non_negative_int,
+        default=10,
+        help="Number of the slowest files to report when profiling. Default: 10.",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        type=Path,
+        help="Profile, and write a Chrome trace-event JSON file with a span per file.",
+    )
+    _add_read_args(parser)
+
+    args = parser.parse_args(argv)
+    if args.watch and (args.profile or args.trace is not None):
+        parser.error("--profile and --trace can't be used with --watch")
+    if args.watch and (args.files or args.since is not None):
+        parser.error("files and --since can't be used with --watch")
+    if args.monorepo and (args.watch or args.use_daemon):
+        parser.error("--monorepo can't be used with --watch or --use-daemon")
+    if args.stream and (args.watch or args.use_daemon):
+        parser.error("--stream can't be used with --watch or --use-daemon")
+    return args
+
+
+def _add_read_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help=f"Neither read from nor write to the {CACHE_DIR_NAME} directory.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_jobs,
+        default="auto",
+        help=(
+            "Number of processes used to read files, 0 to use every CPU, or 'auto' to "
+            "choose between reading serially and using threads or processes "
+            "depending on how much there is to read. Default: auto."
+        ),
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Report how files are read, e.g. how many workers are used.",
+    )
+    parser.add_argument(
+        "--engine",
+        dest="parse_engine",
+        choices=typing.get_args(ParseEngine),
+        help=(
+            "How to extract facts from files, overriding the configuration. 'scan' "
+            "is faster than 'ast' but doesn't necessarily detect syntax errors."
+        ),
+    )
+
+
+def _start_profiler() -> "Profiler":
+    from suiteas.core.profile import Profiler
+
+    return Profiler()
+
+
+def _non_negative_int(arg: str) -> int:
+    value = int(arg)
+    if value < 0:
+        msg = f"must be non-negative, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
+
+def _positive_int(arg: str) -> int:
+    value = int(arg)
+    if value <= 0:
+        msg = f"must be positive, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
+
+def _open_cache(
+    proj_dir: Path,
+    *,
+    use_cache: bool,
+) -> AbstractContextManager["FactCache | None"]:
+    if not use_cache:
+        return nullcontext()
+
+    import sqlite3
+
+    from suiteas.read.cache import FactCache
+
+    try:
+        return FactCache(proj_dir / CACHE_DIR_NAME)
+    except (OSError, sqlite3.Error):
+        # e.g. a read-only filesystem; caching is only ever an optimization.
+        return nullcontext()
+
+
+@contextmanager
+def _open_long_lived_cache(
+    proj_dir: Path,
+    *,
+    use_cache: bool,
+) -> Iterator["FactCache"]:
+    """Open a cache which keeps facts in memory, even if no cache is to be persisted."""
+    from suiteas.read.cache import FactCache
+
+    with _open_cache(proj_dir, use_cache=use_cache) as disk_cache:
+        if disk_cache is not None:
+            yield disk_cache
+            return
+
+    with FactCache(None) as cache:
+        yield cache
+
+
+def _jobs(arg: str) -> int | Literal["auto"]:
+    if arg == "auto":
+        return "auto"
+    return _non_negative_int(arg)
+
+
+def _open_executor(
+    *,
+    jobs: int | Literal["auto"],
+    verbose: bool,
+) -> AbstractContextManager["Executor | None"]:
+    if jobs == 1:
+        return nullcontext()
+
+    import os
+
+    from suiteas.core.schedule import ScheduledExecutor
+
+    if jobs == "auto":
+        return ScheduledExecutor(
+            max_workers=os.cpu_count() or 1,
+            log=_log if verbose else None,
+        )
+    return ScheduledExecutor(
+        max_workers=jobs or os.cpu_count() or 1,
+        execution="process",
+        log=_log if verbose else None,
+    )
+
+
+def _log(msg: str) -> None:
+    print(f"suiteas: {msg}", file=sys.stderr)  # noqa: T201
+
+
+def _fail(msg: str) -> typing.NoReturn:
+    """Report an error which stops the run, without a traceback."""
+    _log(f"error: {msg}")
+    sys.exit(2)
+
+
 INFER_PROJ_DIR_FAIL_MSG = "Could not infer the project directory for the project."
 
 
@@ -45,11 +476,7 @@ def _infer_proj_dir() -> Path:
         if (candidate_dir / PYPROJTOML_NAME).is_file():
             return candidate_dir
 
-        if (
-            (candidate_dir / ".git").is_dir()
-            or (candidate_dir / ".hg").is_dir()
-            or (candidate_dir / ".svn").is_dir()
-        ):
+        if _is_repo_dir(candidate_dir):
             return candidate_dir
 
         if candidate_dir.parent == candidate_dir:
@@ -58,3 +485,28 @@ def _infer_proj_dir() -> Path:
         candidate_dir = candidate_dir.parent
 
     raise ValueError(INFER_PROJ_DIR_FAIL_MSG)
+
+
+INFER_REPO_DIR_FAIL_MSG = "Could not infer the root directory of the repository."
+
+
+def _infer_repo_dir() -> Path:
+    candidate_dir = Path.cwd().resolve()
+    for _ in range(MAX_PROJ_DIR_DEPTH):
+        if _is_repo_dir(candidate_dir):
+            return candidate_dir
+
+        if candidate_dir.parent == candidate_dir:
+            raise ValueError(INFER_REPO_DIR_FAIL_MSG)
+
+        candidate_dir = candidate_dir.parent
+
+    raise ValueError(INFER_REPO_DIR_FAIL_MSG)
+
+
+def _is_repo_dir(candidate_dir: Path) -> bool:
+    return (
+        (candidate_dir / ".git").is_dir()
+        or (candidate_dir / ".hg").is_dir()
+        or (candidate_dir / ".svn").is_dir()
+    )
@@ -0,0 +1,221 @@
+"""Functionality to choose how to read files: serially, or with threads or processes.
+
+Each time files are to be read, a cost model estimates how long reading them would
+take from their number and total size, both serially and spread over workers, taking
+into account the time to start the workers. The quickest option is chosen, so a few
+files are read without starting any workers, while many files use every CPU.
+
+Threads only help if Python can run them in parallel, i.e. on free-threaded builds,
+since parsing holds the global interpreter lock. Processes are only used if starting
+them won't run the main script again, see _can_start_processes; otherwise threads are
+used instead.
+"""
+
+import multiprocessing
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Literal, ParamSpec, TypeAlias, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# How files are read: in this thread, or by a pool of worker threads or processes.
+Execution: TypeAlias = Literal["serial", "thread", "process"]
+
+# Rough costs, measured by parsing synthetic projects with the "ast" engine.
+_SECONDS_PER_FILE = 5e-5
+_SECONDS_PER_BYTE = 3e-7
+# The cost of sending a file's path to a worker process and its facts back.
+_PROCESS_SECONDS_PER_FILE = 2e-5
+_START_SECONDS_BY_EXECUTION: dict[Execution, float] = {
+    "serial": 0.0,
+    "thread": 0.001,
+    "process": 0.1,
+}
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class Schedule:
+    """A choice of how to read some files, and how long it's expected to take."""
+
+    execution: Execution
+    n_workers: int
+    n_files: int
+    n_bytes: int
+    est_seconds: float
+
+
+def choose_schedule(
+    *,
+    n_files: int,
+    n_bytes: int,
+    max_workers: int,
+    execution: Execution | None = None,
+) -> Schedule:
+    """Choose the quickest way to read files, according to the cost model.
+
+    If an execution is given, then it is used rather than the quickest one, although
+    its cost is still estimated. If processes can't be started safely, then they are
+    never chosen, and threads are used instead of them when they are given.
+    """
+    executions: list[Execution]
+    if execution is not None:
+        executions = [execution]
+    else:
+        executions = ["serial"]
+        if max_workers > 1 and n_files > 1:
+            executions.append("process")
+            if not _is_gil_enabled():
+                executions.append("thread")
+    if "process" in executions and not _can_start_processes():
+        executions = (
+            ["thread"]
+            if execution is not None
+            else [execution for execution in executions if execution != "process"]
+        )
+
+    schedules = [
+        _get_schedule(
+            execution,
+            n_files=n_files,
+            n_bytes=n_bytes,
+            max_workers=max_workers,
+        )
+        for execution in executions
+    ]
+    return min(schedules, key=lambda schedule: schedule.est_seconds)
+
+
+def format_schedule(schedule: Schedule) -> str:
+    """Describe a schedule, e.g. for verbose output."""
+    if schedule.execution == "serial":
+        how = "serially"
+    else:
+        workers = "threads" if schedule.execution == "thread" else "processes"
+        how = f"with {schedule.n_workers} {workers}"
+    return (
+        f"Reading {schedule.n_files} files ({schedule.n_bytes / 2**10:.1f} KiB) {how}, "
+        f"estimated to take {schedule.est_seconds * 1000:.0f} ms"
+    )
+
+
+class ScheduledExecutor(Executor):
+    """An executor which chooses how to run the work for each set of files read.
+
+    Worker pools are only started once a schedule needs them, and then kept for any
+    later work. Work submitted directly, rather than scheduled, is run by processes,
+    or by threads if processes can't be started safely.
+    If an execution is given, then it is always used rather than chosen, e.g. for an
+    explicit number of jobs.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        execution: Execution | None = None,
+        log: Callable[[str], None] | None = None,
+    ) -> None:
+        """Prepare to schedule work for up to max_workers workers."""
+        self._max_workers = max_workers
+        self._execution = execution
+        self._log = log
+        self._pools: dict[Execution, Executor] = {}
+
+    def schedule(self, *, n_files: int, n_bytes: int) -> tuple[Executor, int] | None:
+        """Get the pool to read files with and how many of its workers to use.
+
+        None is given if the files are to be read serially.
+        """
+        schedule = choose_schedule(
+            n_files=n_files,
+            n_bytes=n_bytes,
+            max_workers=self._max_workers,
+            execution=self._execution,
+        )
+        if self._log is not None:
+            self._log(format_schedule(schedule))
+        if schedule.execution == "serial":
+            return None
+        return self._get_pool(schedule.execution), schedule.n_workers
+
+    def submit(
+        self,
+        fn: Callable[P, T],
+        /,
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> "Future[T]":
+        """Run a function in a worker process, or a worker thread if need be."""
+        execution: Execution = "process" if _can_start_processes() else "thread"
+        return self._get_pool(execution).submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:  # noqa: FBT001, FBT002
+        """Shut down any worker pools which were started."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+        self._pools.clear()
+
+    def _get_pool(self, execution: Execution) -> Executor:
+        pool = self._pools.get(execution)
+        if pool is None:
+            pool = (
+                ThreadPoolExecutor(max_workers=self._max_workers)
+                if execution == "thread"
+                else ProcessPoolExecutor(max_workers=self._max_workers)
+            )
+            self._pools[execution] = pool
+        return pool
+
+
+def _get_schedule(
+    execution: Execution,
+    *,
+    n_files: int,
+    n_bytes: int,
+    max_workers: int,
+) -> Schedule:
+    serial_seconds = n_files * _SECONDS_PER_FILE + n_bytes * _SECONDS_PER_BYTE
+    n_workers = 1 if execution == "serial" else max(1, min(max_workers, n_files))
+    est_seconds = _START_SECONDS_BY_EXECUTION[execution] + serial_seconds / n_workers
+    if execution == "process":
+        est_seconds += n_files * _PROCESS_SECONDS_PER_FILE
+    return Schedule(
+        execution=execution,
+        n_workers=n_workers,
+        n_files=n_files,
+        n_bytes=n_bytes,
+        est_seconds=est_seconds,
+    )
+
+
+def _can_start_processes() -> bool:
+    """Check whether worker processes can be started without running suiteas again.
+
+    Unless they are forked, worker processes set up the main module in the same way as
+    multiprocessing does: a package's main module is skipped, e.g. for
+    `python -m suiteas`, but any other main module or script is run again, e.g. a
+    pre-commit hook. Whether it is guarded by `if __name__ == "__main__"` can't be
+    known, so then workers might run suiteas again rather than reading files.
+    """
+    start_method = (
+        multiprocessing.get_start_method(allow_none=True)
+        or multiprocessing.get_all_start_methods()[0]
+    )
+    if start_method == "fork":
+        return True
+
+    main_module = sys.modules.get("__main__")
+    main_spec = getattr(main_module, "__spec__", None)
+    main_name: str | None = getattr(main_spec, "name", None)
+    if main_name is not None:
+        return main_name == "__main__" or main_name.endswith(".__main__")
+    # Interactive sessions have no script to run again.
+    return getattr(main_module, "__file__", None) is None
+
+
+def _is_gil_enabled() -> bool:
+    is_gil_enabled: Callable[[], bool] | None = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
@@ -0,0 +1,225 @@
+"""Functionality to check a project in constant memory, by streaming its files.
+
+Rather than reading the whole project before checking it, the source files are read a
+chunk at a time along with their partner pytest files, checked, and then discarded.
+The pytest files without a partner are read in a final pass, since only SUI002 needs
+them. Only the paths of the project's files, and their git blob IDs, are held for the
+whole run.
+"""
+
+import os
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+
+from suiteas.config import ProjConfig
+from suiteas.core.check import get_violations
+from suiteas.core.path import PathIndex
+from suiteas.core.profile import Profiler, profile_phase
+from suiteas.core.rules import Fact, get_needed_facts
+from suiteas.core.violations import Violation
+from suiteas.domain import Codebase, Project
+from suiteas.read.cache import FactCache
+from suiteas.read.codebase import get_codebase
+from suiteas.read.config import get_file_filter
+from suiteas.read.discover import discover_py_files, sort_paths
+from suiteas.read.file import ParseEngine
+from suiteas.read.project import (
+    _get_needed_pytest_files,
+    _read_config,
+    get_included_files,
+)
+from suiteas.read.pytest_suite import get_pytest_suite
+from suiteas.read.snapshot import FsSnapshot
+
+# The number of source files read at once. This bounds the memory used, while still
+# giving worker processes enough files to share between them.
+_CHUNK_N_FILES = 256
+
+
+def get_streamed_violations(  # noqa: PLR0913
+    proj_dir: Path,
+    *,
+    included_files: list[Path] | None = None,
+    cache: FactCache | None = None,
+    executor: Executor | None = None,
+    parse_engine: ParseEngine | None = None,
+    profiler: Profiler | None = None,
+) -> Iterator[Violation]:
+    """Check a project a chunk of files at a time, and get any violations.
+
+    The same violations are found as by checking the whole project at once, but
+    SUI002 violations are given alongside the others, rather than after them.
+    """
+    # Only kept while finding the files, since it holds every directory's entries.
+    snapshot = FsSnapshot()
+    config = _read_config(proj_dir, cache=cache, profiler=profiler, snapshot=snapshot)
+    if parse_engine is not None:
+        config = config.model_copy(update={"parse_engine": parse_engine})
+    needed_facts = get_needed_facts(config.checks)
+
+    with profile_phase(profiler, "discovery"):
+        src_paths, pytest_paths, blob_id_by_path = _get_paths(
+            included_files or [],
+            proj_dir=proj_dir,
+            config=config,
+            snapshot=snapshot,
+        )
+    del snapshot
+    # A dictionary is used as an ordered set, of the pytest files not yet checked.
+    unchecked_pytest_paths = dict.fromkeys(pytest_paths)
+
+    if "src_funcs" in needed_facts:
+        path_index = PathIndex(proj_config=config, proj_dir=proj_dir)
+        for start in range(0, len(src_paths), _CHUNK_N_FILES):
+            chunk_src_paths = src_paths[start : start + _CHUNK_N_FILES]
+            chunk_pytest_paths = [
+                pytest_path
+                for path in chunk_src_paths
+                if (pytest_path := _get_partner_path(path, path_index=path_index))
+                in unchecked_pytest_paths
+            ]
+            for pytest_path in chunk_pytest_paths:
+                del unchecked_pytest_paths[pytest_path]
+            yield from _get_chunk_violations(
+                chunk_src_paths,
+                chunk_pytest_paths,
+                proj_dir=proj_dir,
+                config=config,
+                needed_facts=needed_facts,
+                blob_id_by_path=blob_id_by_path,
+                cache=cache,
+                executor=executor,
+                profiler=profiler,
+            )
+
+    if "pytest_classes" in needed_facts:
+        rest_pytest_paths = list(unchecked_pytest_paths)
+        for start in range(0, len(rest_pytest_paths), _CHUNK_N_FILES):
+            yield from _get_chunk_violations(
+                [],
+                rest_pytest_paths[start : start + _CHUNK_N_FILES],
+                proj_dir=proj_dir,
+                config=config,
+                needed_facts=needed_facts,
+                blob_id_by_path=blob_id_by_path,
+                cache=cache,
+                executor=executor,
+                profiler=profiler,
+            )
+
+
+def _get_paths(
+    included_files: list[Path],
+    *,
+    proj_dir: Path,
+    config: ProjConfig,
+    snapshot: FsSnapshot,
+) -> tuple[list[Path], list[Path], dict[Path, str] | None]:
+    """Get the paths of the source and pytest files to check, in sorted order.
+
+    The git blob IDs of the files are given too, if they were discovered through git.
+    """
+    src_dir = proj_dir / config.src_rel_path
+    unit_dir = proj_dir / config.tests_rel_path / config.unittest_dir_name
+    for dir_path in [src_dir, unit_dir]:
+        if not snapshot.exists(dir_path):
+            msg = f"Could not find {dir_path}"
+            raise FileNotFoundError(msg)
+
+    src_paths, pytest_paths = get_included_files(
+        included_files,
+        proj_dir=proj_dir,
+        config=config,
+        snapshot=snapshot,
+    )
+    if src_paths is None or pytest_paths is None:
+        file_filter = get_file_filter(config, proj_dir=proj_dir)
+        src_paths, src_blob_ids = discover_py_files(
+            src_dir,
+            exclude_dirs=config.exclude_dirs,
+            file_filter=file_filter,
+            file_source=config.file_source,
+            snapshot=snapshot,
+        )
+        pytest_paths, pytest_blob_ids = discover_py_files(
+            unit_dir,
+            exclude_dirs=config.exclude_dirs,
+            file_filter=file_filter,
+            file_source=config.file_source,
+            snapshot=snapshot,
+        )
+        blob_id_by_path = {
+            path: blob_id
+            for paths, blob_ids in [
+                (src_paths, src_blob_ids),
+                (pytest_paths, pytest_blob_ids),
+            ]
+            for path, blob_id in zip(paths, blob_ids, strict=True)
+            if blob_id is not None
+        }
+        return src_paths, pytest_paths, blob_id_by_path or None
+
+    return sort_paths(src_paths), sort_paths(pytest_paths), None
+
+
+def _get_partner_path(path: Path, *, path_index: PathIndex) -> Path | None:
+    try:
+        return Path(path_index.to_pytest_path_str(os.fspath(path)))
+    except ValueError:
+        # Outside the main source directory, so it has no pytest file.
+        return None
+
+
+def _get_chunk_violations(  # noqa: PLR0913
+    src_paths: list[Path],
+    pytest_paths: list[Path],
+    *,
+    proj_dir: Path,
+    config: ProjConfig,
+    needed_facts: frozenset[Fact],
+    blob_id_by_path: dict[Path, str] | None,
+    cache: FactCache | None,
+    executor: Executor | None,
+    profiler: Profiler | None,
+) -> Iterator[Violation]:
+    """Read and check some files, which are discarded once they're checked.
+
+    As when reading a whole project, only the pytest files holding needed facts are
+    read.
+    """
+    codebase = (
+        get_codebase(
+            proj_dir=proj_dir,
+            config=config,
+            included_src_files=src_paths,
+            blob_id_by_path=blob_id_by_path,
+            cache=cache,
+            executor=executor,
+            profiler=profiler,
+        )
+        if src_paths
+        else Codebase(files=[])
+    )
+    pytest_suite = get_pytest_suite(
+        proj_dir=proj_dir,
+        config=config,
+        included_pytest_files=pytest_paths,
+        needed_pytest_files=_get_needed_pytest_files(
+            needed_facts,
+            codebase=codebase,
+            proj_dir=proj_dir,
+            config=config,
+        ),
+        blob_id_by_path=blob_id_by_path,
+        cache=cache,
+        executor=executor,
+        profiler=profiler,
+    )
+    project = Project(
+        codebase=codebase,
+        pytest_suite=pytest_suite,
+        config=config,
+        proj_dir=proj_dir,
+    )
+    yield from get_violations(project)
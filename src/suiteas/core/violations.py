@@ -1,13 +1,13 @@
 """Utilities for recording violations of the test suite rules."""
 
+from dataclasses import dataclass
 from pathlib import Path
 
-from pydantic import BaseModel
-
 from suiteas.core.rules import Rule
 
 
-class Violation(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Violation:
     """A violation of the test suite rules."""
 
     rule: Rule
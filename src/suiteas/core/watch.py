@@ -0,0 +1,469 @@
+"""Functionality to keep re-checking a project as its files change."""
+
+import abc
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from contextlib import suppress
+from pathlib import Path
+from types import TracebackType
+
+from typing_extensions import Self
+
+from suiteas.config import ProjConfig
+from suiteas.core.check import get_violations
+from suiteas.core.names import PYPROJTOML_NAME
+from suiteas.core.print import format_violation
+from suiteas.domain import Project
+from suiteas.read.cache import FactCache
+from suiteas.read.config import get_config, get_file_filter
+from suiteas.read.discover import DEFAULT_EXCLUDE_DIRS, get_dir_name_matcher
+from suiteas.read.file import AnalyzedFileSyntaxError, ParseEngine
+from suiteas.read.project import get_project
+
+# Changes arriving within this window are handled together, since saving a file
+# often involves several filesystem operations.
+_DEBOUNCE_SECS = 0.05
+_POLL_INTERVAL_SECS = 0.5
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_MASK = (
+    _IN_MODIFY
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+)
+# Errors caused by a broken state of the project, which the user is likely to fix
+# soon, e.g. while they are in the middle of editing a file.
+_RECOVERABLE_ERRORS = (AnalyzedFileSyntaxError, FileNotFoundError, ValueError)
+
+_IN_EVENT_HEADER = struct.Struct("iIII")
+_IN_READ_SIZE = 65536
+
+
+def watch(  # noqa: PLR0913
+    proj_dir: Path,
+    *,
+    cache: FactCache,
+    executor: Executor | None = None,
+    config: ProjConfig | None = None,
+    parse_engine: ParseEngine | None = None,
+    use_inotify: bool = True,
+    stop_event: threading.Event | None = None,
+) -> None:
+    """Check a project, then keep re-checking the files which change.
+
+    Only the violations which have appeared or disappeared since the previous check
+    are printed. Changes to a source file or its test file only cause that pair of
+    files to be re-read and re-checked; changes to pyproject.toml or to directories
+    cause the whole project to be re-checked.
+    """
+    if config is None:
+        config = get_config(proj_dir=proj_dir)
+
+    tracker = _ViolationTracker(proj_dir)
+    while stop_event is None or not stop_event.is_set():
+        # Start watching before checking, so no changes are missed in the meantime.
+        with _get_watcher(
+            _get_watched_dirs(proj_dir, config=config),
+            proj_dir=proj_dir,
+            exclusions=_Exclusions(proj_dir, config=config),
+            use_inotify=use_inotify,
+        ) as watcher:
+            try:
+                project = get_project(
+                    proj_dir=proj_dir,
+                    cache=cache,
+                    executor=executor,
+                    config=config,
+                    parse_engine=parse_engine,
+                )
+            except _RECOVERABLE_ERRORS as err:
+                # Wait for a change which might fix the project, then start afresh.
+                _print_error(err)
+                _wait_for_changes(watcher, stop_event=stop_event)
+                continue
+            _print_changes(*tracker.update(project, full=True), n_total=tracker.n_total)
+
+            while stop_event is None or not stop_event.is_set():
+                changed_paths = _wait_for_changes(watcher, stop_event=stop_event)
+                if not changed_paths:
+                    continue
+
+                if any(path.suffix != ".py" for path in changed_paths):
+                    # The configuration or the directories to watch might have changed,
+                    # so start afresh.
+                    if proj_dir / PYPROJTOML_NAME in changed_paths:
+                        try:
+                            config = get_config(proj_dir=proj_dir)
+                        except _RECOVERABLE_ERRORS as err:
+                            # Keep using the previous configuration until it is fixed.
+                            _print_error(err)
+                            continue
+                    break
+
+                try:
+                    project = get_project(
+                        proj_dir=proj_dir,
+                        included_files=sorted(changed_paths),
+                        cache=cache,
+                        executor=executor,
+                        config=config,
+                        parse_engine=parse_engine,
+                    )
+                except _RECOVERABLE_ERRORS as err:
+                    _print_error(err)
+                    continue
+                _print_changes(
+                    *tracker.update(project, full=False, changed_paths=changed_paths),
+                    n_total=tracker.n_total,
+                )
+
+
+def _wait_for_changes(
+    watcher: "_Watcher",
+    *,
+    stop_event: threading.Event | None,
+) -> set[Path]:
+    """Wait until some files change or the watching is stopped."""
+    while stop_event is None or not stop_event.is_set():
+        changed_paths = watcher.wait(timeout=_POLL_INTERVAL_SECS)
+        if changed_paths:
+            return changed_paths
+    return set()
+
+
+class _ViolationTracker:
+    """Keeps track of the violations of a project, file by file."""
+
+    def __init__(self, proj_dir: Path) -> None:
+        self.proj_dir = proj_dir
+        self._msgs_by_rel_path: dict[Path, list[str]] = {}
+
+    @property
+    def n_total(self) -> int:
+        return sum(len(msgs) for msgs in self._msgs_by_rel_path.values())
+
+    def update(
+        self,
+        project: Project,
+        *,
+        full: bool,
+        changed_paths: Iterable[Path] = (),
+    ) -> tuple[list[str], list[str]]:
+        """Record the violations of a (partial) project, giving added and removed."""
+        new_msgs_by_rel_path: dict[Path, list[str]] = {}
+        for path in (
+            *(file.path for file in project.codebase.files),
+            *(pytest_file.path for pytest_file in project.pytest_suite.pytest_files),
+            *changed_paths,
+        ):
+            new_msgs_by_rel_path[path.relative_to(self.proj_dir)] = []
+        if full:
+            new_msgs_by_rel_path.update(
+                (rel_path, []) for rel_path in self._msgs_by_rel_path
+            )
+        for violation in get_violations(project):
+            new_msgs_by_rel_path.setdefault(violation.rel_path, []).append(
+                format_violation(violation),
+            )
+
+        added_msgs: list[str] = []
+        removed_msgs: list[str] = []
+        for rel_path, new_msgs in new_msgs_by_rel_path.items():
+            old_msgs = self._msgs_by_rel_path.pop(rel_path, [])
+            added_msgs.extend(msg for msg in new_msgs if msg not in old_msgs)
+            removed_msgs.extend(msg for msg in old_msgs if msg not in new_msgs)
+            if new_msgs:
+                self._msgs_by_rel_path[rel_path] = new_msgs
+
+        return added_msgs, removed_msgs
+
+
+def _print_changes(
+    added_msgs: list[str],
+    removed_msgs: list[str],
+    *,
+    n_total: int,
+) -> None:
+    for msg in removed_msgs:
+        print(f"Fixed: {msg}", file=sys.stderr)  # noqa: T201
+    for msg in added_msgs:
+        print(msg, file=sys.stderr)  # noqa: T201
+    if added_msgs or removed_msgs or not n_total:
+        print(  # noqa: T201
+            f"Found {n_total} violation(s). Watching for changes...",
+            file=sys.stderr,
+        )
+
+
+def _print_error(err: Exception) -> None:
+    print(f"{type(err).__name__}: {err}", file=sys.stderr)  # noqa: T201
+    print("Watching for changes...", file=sys.stderr)  # noqa: T201
+
+
+def _get_watched_dirs(proj_dir: Path, *, config: ProjConfig) -> list[Path]:
+    candidate_dirs = [
+        proj_dir / config.src_rel_path,
+        proj_dir / config.tests_rel_path / config.unittest_dir_name,
+    ]
+    watched_dirs: list[Path] = []
+    for candidate_dir in sorted({path.resolve() for path in candidate_dirs}):
+        if not any(candidate_dir.is_relative_to(path) for path in watched_dirs):
+            watched_dirs.append(candidate_dir)
+    return watched_dirs
+
+
+class _Exclusions:
+    """Which directories and files are skipped, in the same way as by discovery."""
+
+    def __init__(self, proj_dir: Path, *, config: ProjConfig) -> None:
+        self._is_excluded_dir_name = get_dir_name_matcher(
+            [*DEFAULT_EXCLUDE_DIRS, *config.exclude_dirs],
+        )
+        self._file_filter = get_file_filter(config, proj_dir=proj_dir)
+
+    def is_excluded_dir(self, path_str: str) -> bool:
+        """Check whether a directory is skipped, by its name or its path."""
+        name = os.path.basename(path_str)  # noqa: PTH119
+        return self._is_excluded_dir_name(name) or self.is_excluded_file(path_str)
+
+    def is_excluded_file(self, path_str: str) -> bool:
+        """Check whether a file is skipped by its path."""
+        if self._file_filter is None:
+            return False
+        return self._file_filter.is_excluded_path(path_str)
+
+
+class _Watcher(abc.ABC):
+    """Waits for changes to the Python files under some directories."""
+
+    @abc.abstractmethod
+    def wait(self, *, timeout: float) -> set[Path]:
+        """Wait for changes, giving the changed paths, or nothing upon a timeout."""
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Stop watching."""
+
+    def __enter__(self) -> Self:
+        """Use the watcher as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Stop watching upon leaving the context."""
+        self.close()
+
+
+def _get_watcher(
+    watched_dirs: list[Path],
+    *,
+    proj_dir: Path,
+    exclusions: _Exclusions,
+    use_inotify: bool,
+) -> _Watcher:
+    if use_inotify and sys.platform == "linux":
+        try:
+            return _InotifyWatcher(
+                watched_dirs,
+                proj_dir=proj_dir,
+                exclusions=exclusions,
+            )
+        except OSError:
+            pass
+    return _PollingWatcher(watched_dirs, proj_dir=proj_dir, exclusions=exclusions)
+
+
+class _PollingWatcher(_Watcher):
+    """Detects changes by periodically comparing the size and mtime of each file."""
+
+    def __init__(
+        self,
+        watched_dirs: list[Path],
+        *,
+        proj_dir: Path,
+        exclusions: _Exclusions,
+    ) -> None:
+        self.watched_dirs = watched_dirs
+        self.proj_dir = proj_dir
+        self.exclusions = exclusions
+        self._snapshot = self._get_snapshot()
+
+    def wait(self, *, timeout: float) -> set[Path]:
+        time.sleep(timeout)
+        snapshot = self._get_snapshot()
+        changed_paths = {
+            path
+            for path in self._snapshot.keys() | snapshot.keys()
+            if self._snapshot.get(path) != snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        return changed_paths
+
+    def close(self) -> None:
+        # Nothing is held open between polls.
+        pass
+
+    def _get_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        toml_path = self.proj_dir / PYPROJTOML_NAME
+        with suppress(FileNotFoundError):
+            stat = toml_path.stat()
+            snapshot[toml_path] = (stat.st_size, stat.st_mtime_ns)
+
+        dir_strs = [os.fspath(path) for path in self.watched_dirs]
+        while dir_strs:
+            try:
+                with os.scandir(dir_strs.pop()) as entry_iter:
+                    entries = list(entry_iter)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not self.exclusions.is_excluded_dir(entry.path):
+                        dir_strs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    if self.exclusions.is_excluded_file(entry.path):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+
+class _InotifyWatcher(_Watcher):
+    """Detects changes using the Linux inotify API."""
+
+    def __init__(
+        self,
+        watched_dirs: list[Path],
+        *,
+        proj_dir: Path,
+        exclusions: _Exclusions,
+    ) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.proj_dir = proj_dir
+        self.exclusions = exclusions
+        self._dir_by_wd: dict[int, Path] = {}
+        try:
+            self._add_watch(proj_dir, recursive=False)
+            for watched_dir in watched_dirs:
+                self._add_watch(watched_dir, recursive=True)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, *, timeout: float) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed_paths: set[Path] = set()
+        while readable:
+            changed_paths |= self._read_events()
+            readable, _, _ = select.select([self._fd], [], [], _DEBOUNCE_SECS)
+        return changed_paths
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watch(self, dir_path: Path, *, recursive: bool) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd,
+            os.fsencode(dir_path),
+            _IN_MASK,
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), os.fspath(dir_path))
+        self._dir_by_wd[wd] = dir_path
+
+        if recursive:
+            # The directory is closed before recursing, so deep trees don't hold an
+            # open file descriptor per level.
+            with os.scandir(dir_path) as entries:
+                child_dirs = [
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                    and not self.exclusions.is_excluded_dir(entry.path)
+                ]
+            for child_dir in child_dirs:
+                self._add_watch(child_dir, recursive=True)
+
+    def _read_events(self) -> set[Path]:
+        try:
+            data = os.read(self._fd, _IN_READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changed_paths: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = _IN_EVENT_HEADER.unpack_from(data, offset)
+            offset += _IN_EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + name_len].rstrip(b"\0"))
+            offset += name_len
+
+            changed_path = self._get_changed_path(wd, mask=mask, name=name)
+            if changed_path is not None:
+                changed_paths.add(changed_path)
+
+        return changed_paths
+
+    def _get_changed_path(self, wd: int, *, mask: int, name: str) -> Path | None:
+        if mask & _IN_Q_OVERFLOW:
+            # Events were lost, so assume everything has changed.
+            return self.proj_dir
+
+        dir_path = self._dir_by_wd.get(wd)
+        if dir_path is None:
+            return None
+        path = dir_path / name if name else dir_path
+
+        if dir_path == self.proj_dir:
+            is_changed = name == PYPROJTOML_NAME
+        elif mask & _IN_ISDIR:
+            is_changed = not self.exclusions.is_excluded_dir(os.fspath(path))
+            if is_changed and mask & (_IN_CREATE | _IN_MOVED_TO):
+                # If the directory has already gone again, there's nothing to watch.
+                with suppress(OSError):
+                    self._add_watch(path, recursive=True)
+        else:
+            is_changed = bool(mask & _IN_DELETE_SELF) or (
+                name.endswith(".py")
+                and not self.exclusions.is_excluded_file(os.fspath(path))
+            )
+        return path if is_changed else None
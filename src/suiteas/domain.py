@@ -1,13 +1,23 @@
-"""Value objects for code instances."""
+"""Value objects for code instances.
 
-from pathlib import Path
+These are created for every definition in every file, so they are lightweight slotted
+dataclasses which aren't validated upon construction. Pydantic is reserved for the
+configuration, which is read from user input. For huge codebases, even these take a lot
+of memory, so a codebase can instead be stored column-wise, see CompactCodebase.
+"""
 
-from pydantic import BaseModel
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, TypeAlias
 
-from suiteas.config import ProjConfig
+if TYPE_CHECKING:
+    from suiteas.config import ProjConfig
 
 
-class TestableCodeObject(BaseModel, extra="forbid"):
+@dataclass(slots=True, kw_only=True)
+class TestableCodeObject:
     """A testable code object."""
 
     name: str
@@ -21,17 +31,20 @@ class TestableCodeObject(BaseModel, extra="forbid"):
         return self.name.startswith("_")
 
 
+@dataclass(slots=True, kw_only=True)
 class Class(TestableCodeObject):
     """A Python class."""
 
     has_funcs: bool
 
 
+@dataclass(slots=True, kw_only=True)
 class Func(TestableCodeObject):
     """A Python function."""
 
 
-class File(BaseModel, extra="forbid"):
+@dataclass(slots=True, kw_only=True)
+class File:
     """A Python file."""
 
     path: Path
@@ -40,20 +53,106 @@ class File(BaseModel, extra="forbid"):
     imported_objs: list[str]
 
 
-class Codebase(BaseModel, extra="forbid"):
+@dataclass(slots=True, kw_only=True)
+class Codebase:
     """A codebase."""
 
     files: list[File]
 
 
-class PytestClass(BaseModel, extra="forbid"):
+# How a codebase is held in memory: as domain objects, or column-wise.
+CodebaseStore: TypeAlias = Literal["objects", "compact"]
+
+# Arrays aren't subscriptable at runtime until Python 3.12.
+_IntArray: TypeAlias = "array[int]"
+
+
+def _get_empty_column() -> _IntArray:
+    return array("I")
+
+
+def _get_empty_starts() -> _IntArray:
+    return array("I", [0])
+
+
+@dataclass(slots=True, kw_only=True)
+class CompactCodebase:
+    """A codebase stored column-wise, with every string stored once in a shared table.
+
+    Each file, function, class and import is a row of the columns for its kind, with
+    strings given by their indices in the string table. The rows for the file at index
+    idx are those from starts[idx] up to starts[idx + 1] of each kind.
+
+    Full names aren't stored; they are the module name and the name joined by a dot.
+    """
+
+    strings: list[str] = field(default_factory=list)
+
+    file_path_ids: _IntArray = field(default_factory=_get_empty_column)
+    file_module_ids: _IntArray = field(default_factory=_get_empty_column)
+
+    func_starts: _IntArray = field(default_factory=_get_empty_starts)
+    func_name_ids: _IntArray = field(default_factory=_get_empty_column)
+    func_line_nums: _IntArray = field(default_factory=_get_empty_column)
+    func_char_offsets: _IntArray = field(default_factory=_get_empty_column)
+
+    cls_starts: _IntArray = field(default_factory=_get_empty_starts)
+    cls_name_ids: _IntArray = field(default_factory=_get_empty_column)
+    cls_line_nums: _IntArray = field(default_factory=_get_empty_column)
+    cls_char_offsets: _IntArray = field(default_factory=_get_empty_column)
+    cls_has_funcs: _IntArray = field(default_factory=lambda: array("B"))
+
+    import_starts: _IntArray = field(default_factory=_get_empty_starts)
+    import_ids: _IntArray = field(default_factory=_get_empty_column)
+
+    @property
+    def files(self) -> list[File]:
+        """Build the files as domain objects, e.g. to compare against a Codebase."""
+        return list(self.iter_files())
+
+    def iter_files(self) -> Iterator[File]:
+        """Build the files as domain objects, one at a time."""
+        strings = self.strings
+        for file_idx, module_id in enumerate(self.file_module_ids):
+            module_name = strings[module_id]
+            func_rows = range(*self.func_starts[file_idx : file_idx + 2])
+            cls_rows = range(*self.cls_starts[file_idx : file_idx + 2])
+            import_rows = range(*self.import_starts[file_idx : file_idx + 2])
+            yield File(
+                path=Path(strings[self.file_path_ids[file_idx]]),
+                funcs=[
+                    Func(
+                        name=strings[self.func_name_ids[row]],
+                        full_name=f"{module_name}.{strings[self.func_name_ids[row]]}",
+                        line_num=self.func_line_nums[row],
+                        char_offset=self.func_char_offsets[row],
+                    )
+                    for row in func_rows
+                ],
+                clses=[
+                    Class(
+                        name=strings[self.cls_name_ids[row]],
+                        full_name=f"{module_name}.{strings[self.cls_name_ids[row]]}",
+                        line_num=self.cls_line_nums[row],
+                        char_offset=self.cls_char_offsets[row],
+                        has_funcs=bool(self.cls_has_funcs[row]),
+                    )
+                    for row in cls_rows
+                ],
+                imported_objs=[strings[self.import_ids[row]] for row in import_rows],
+            )
+
+
+@dataclass(slots=True, kw_only=True)
+class PytestClass:
     """A Pytest test class."""
 
     name: str
     has_funcs: bool
 
 
-class PytestFile(BaseModel, extra="forbid"):
+@dataclass(slots=True, kw_only=True)
+class PytestFile:
     """A Pytest test file."""
 
     path: Path
@@ -61,16 +160,18 @@ class PytestFile(BaseModel, extra="forbid"):
     imported_objs: list[str]
 
 
-class PytestSuite(BaseModel, extra="forbid"):
+@dataclass(slots=True, kw_only=True)
+class PytestSuite:
     """A Pytest unit test suite."""
 
     pytest_files: list[PytestFile]
 
 
-class Project(BaseModel, extra="forbid"):
+@dataclass(slots=True, kw_only=True)
+class Project:
     """A Python project."""
 
-    codebase: Codebase
+    codebase: Codebase | CompactCodebase
     pytest_suite: PytestSuite
-    config: ProjConfig
+    config: "ProjConfig"
     proj_dir: Path
@@ -0,0 +1,528 @@
+"""Utilities for persistently caching the facts extracted from files.
+
+The resolved configuration of each project is cached alongside, since resolving it
+probes the filesystem many times, and so are the violations of each project's last
+run, keyed by a fingerprint of the run.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import suppress
+from pathlib import Path
+from types import TracebackType
+from typing import TypeAlias
+
+from typing_extensions import Self
+
+import suiteas.config
+import suiteas.core.check
+import suiteas.read.config
+import suiteas.read.file
+from suiteas.config import ProjConfig
+from suiteas.core.names import PYPROJTOML_NAME
+from suiteas.read.config import get_config, get_config_dirs
+from suiteas.read.file import (
+    FileFacts,
+    ParseEngine,
+    SourceBytes,
+    get_source_facts,
+    open_source,
+)
+
+CACHE_DB_NAME = "facts.sqlite3"
+
+# Files modified more recently than this might be modified again within the
+# resolution of the filesystem's timestamps, so their stat info can't be trusted.
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+# How long to wait for another process to finish writing to the cache, in seconds.
+_BUSY_TIMEOUT_S = 10.0
+
+# Parts of the messages of the errors raised by SQLite for a corrupt database, as
+# opposed to e.g. one which is locked by another process.
+_CORRUPT_DB_MSGS = ("file is not a database", "malformed")
+
+# A cache entry: the size, mtime and content digest of a file, and its facts.
+_Entry: TypeAlias = tuple[int, int, str, FileFacts]
+
+
+class FactCache:
+    """A persistent on-disk cache of the facts extracted from Python files.
+
+    Entries are keyed by path and parse engine, and validated against the file's size
+    and modification time, falling back to a hash of the file's contents. The engines
+    give the same facts for valid files, but the scan engine accepts some files which
+    the ast engine rejects, so their entries aren't shared. The whole cache is discarded
+    whenever the suiteas version, the Python version, or the fact extraction logic
+    changes.
+
+    Facts can also be keyed by git blob ID, i.e. by the file's contents as git hashed
+    them, so files which git knows to be unchanged are never read nor even stat'ed.
+
+    The configuration of a project is keyed by the project directory, and validated
+    against the modification times of pyproject.toml and of the directories which
+    the configuration's heuristics look into.
+
+    The last run of each project is keyed by the project directory too, and stored
+    along with its fingerprint, so it can be replayed if a later run has the same one.
+
+    Entries are also kept in memory for the lifetime of the cache object, so a
+    long-lived cache only re-reads files which have changed since they were last read.
+    Without a cache directory, entries are only kept in memory.
+    """
+
+    def __init__(self, cache_dir: Path | None) -> None:
+        """Open the cache stored in a directory, creating it if necessary."""
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            gitignore_path = cache_dir / ".gitignore"
+            if not gitignore_path.exists():
+                gitignore_path.write_text("# Automatically created by suiteas.\n*\n")
+
+        self.cache_dir = cache_dir
+        self._conn = _connect(None if cache_dir is None else cache_dir / CACHE_DB_NAME)
+        self._entry_by_key: dict[str, _Entry] = {}
+        self._facts_by_blob_id: dict[str, FileFacts] = {}
+
+    def get_file_facts(
+        self,
+        path: Path,
+        *,
+        parse_engine: ParseEngine = "ast",
+        blob_id: str | None = None,
+    ) -> FileFacts:
+        """Get the facts of a file, reading and parsing it only if it has changed.
+
+        If the file's current git blob ID is given, it's used to recognize the file.
+        """
+        if blob_id is None:
+            return self._get_file_facts_by_path(path, parse_engine=parse_engine)
+
+        facts = self._get_blob_facts(blob_id, parse_engine=parse_engine)
+        if facts is None:
+            facts = self._get_file_facts_by_path(path, parse_engine=parse_engine)
+            self.put_blob_facts(blob_id, facts, parse_engine=parse_engine)
+        return facts
+
+    def get_cached_file_facts(
+        self,
+        path: Path,
+        *,
+        parse_engine: ParseEngine = "ast",
+        blob_id: str | None = None,
+    ) -> FileFacts | None:
+        """Get the facts of a file without reading it, if they are known to be fresh."""
+        return self.lookup_file_facts(
+            path,
+            parse_engine=parse_engine,
+            blob_id=blob_id,
+        )[0]
+
+    def lookup_file_facts(
+        self,
+        path: Path,
+        *,
+        parse_engine: ParseEngine = "ast",
+        blob_id: str | None = None,
+    ) -> tuple[FileFacts | None, os.stat_result | None]:
+        """Get the facts of a file without reading it, and its stat info if it was read.
+
+        The file is only stat'ed if it has an entry to check, so that callers needn't
+        stat it again when they do.
+        """
+        if blob_id is not None:
+            facts = self._get_blob_facts(blob_id, parse_engine=parse_engine)
+            if facts is not None:
+                return facts, None
+
+        entry = self._get_entry(path, parse_engine=parse_engine)
+        if entry is None:
+            return None, None
+        stat = _stat(path)
+        return (entry[3] if _is_entry_fresh(entry, stat=stat) else None), stat
+
+    def get_config(self, proj_dir: Path) -> ProjConfig:
+        """Get the configuration of a project, only resolving it if it might differ."""
+        key = _get_key(proj_dir)
+        row: tuple[str, str] | None = self._conn.execute(
+            "SELECT fingerprint, config FROM configs WHERE proj_dir = ?",
+            (key,),
+        ).fetchone()
+        if row is not None:
+            fingerprint, config_json = row
+            config = ProjConfig.model_validate_json(config_json)
+            if get_config_fingerprint(proj_dir, config=config) == fingerprint:
+                return config
+
+        config = get_config(proj_dir=proj_dir)
+        new_fingerprint = get_config_fingerprint(proj_dir, config=config)
+        if new_fingerprint is not None:
+            with suppress(sqlite3.OperationalError):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO configs VALUES (?, ?, ?)",
+                    (key, new_fingerprint, config.model_dump_json()),
+                )
+        return config
+
+    def get_run(self, proj_dir: Path) -> tuple[str, str, str] | None:
+        """Get the last run of a project: its fingerprint, file tree and violations.
+
+        The file tree and the violations are given as JSON, as they were stored.
+        """
+        row: tuple[str, str, str] | None = self._conn.execute(
+            "SELECT fingerprint, file_tree, violations FROM runs WHERE proj_dir = ?",
+            (_get_key(proj_dir),),
+        ).fetchone()
+        return row
+
+    def put_run(
+        self,
+        proj_dir: Path,
+        *,
+        fingerprint: str,
+        file_tree_json: str,
+        violations_json: str,
+    ) -> None:
+        """Store the last run of a project, replacing any earlier one."""
+        with suppress(sqlite3.OperationalError):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+                (_get_key(proj_dir), fingerprint, file_tree_json, violations_json),
+            )
+
+    def put_blob_facts(
+        self,
+        blob_id: str,
+        facts: FileFacts,
+        *,
+        parse_engine: ParseEngine = "ast",
+    ) -> None:
+        """Store the facts of a file with the given git blob ID."""
+        key = _get_blob_key(blob_id, parse_engine=parse_engine)
+        self._facts_by_blob_id[key] = facts
+        with suppress(sqlite3.OperationalError):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blob_facts VALUES (?, ?)",
+                (key, json.dumps(facts)),
+            )
+
+    def put_file_facts(  # noqa: PLR0913
+        self,
+        path: Path,
+        *,
+        size: int,
+        mtime_ns: int,
+        digest: str,
+        facts: FileFacts,
+        parse_engine: ParseEngine = "ast",
+        blob_id: str | None = None,
+    ) -> None:
+        """Store the facts of a file, as read when it had the given stat info."""
+        if blob_id is not None:
+            self.put_blob_facts(blob_id, facts, parse_engine=parse_engine)
+
+        if time.time_ns() - mtime_ns < _RACY_MTIME_WINDOW_NS:
+            # Force the contents to be re-hashed next time.
+            mtime_ns = -1
+
+        key = _get_facts_key(path, parse_engine=parse_engine)
+        self._entry_by_key[key] = (size, mtime_ns, digest, facts)
+        with suppress(sqlite3.OperationalError):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?)",
+                (key, size, mtime_ns, digest, json.dumps(facts)),
+            )
+
+    def close(self) -> None:
+        """Write any pending entries and close the cache."""
+        # If e.g. the database is locked by a concurrent run, the new entries are lost
+        # but the cache stays consistent.
+        with suppress(sqlite3.OperationalError):
+            self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        """Use the cache as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Close the cache upon leaving the context."""
+        self.close()
+
+    def _get_file_facts_by_path(
+        self,
+        path: Path,
+        *,
+        parse_engine: ParseEngine,
+    ) -> FileFacts:
+        stat = _stat(path)
+        entry = self._get_entry(path, parse_engine=parse_engine)
+        if entry is not None and _is_entry_fresh(entry, stat=stat):
+            return entry[3]
+
+        # The stat info is re-read from the opened file, so it matches the contents.
+        with open_source(path) as (contents, stat):
+            digest = get_digest(contents)
+            if entry is not None and entry[2] == digest:
+                facts = entry[3]
+            else:
+                facts = get_source_facts(
+                    contents,
+                    path=path,
+                    parse_engine=parse_engine,
+                )
+
+        self.put_file_facts(
+            path,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            digest=digest,
+            facts=facts,
+            parse_engine=parse_engine,
+        )
+        return facts
+
+    def _get_entry(self, path: Path, *, parse_engine: ParseEngine) -> _Entry | None:
+        key = _get_facts_key(path, parse_engine=parse_engine)
+        entry = self._entry_by_key.get(key)
+        if entry is not None:
+            return entry
+
+        row: tuple[int, int, str, str] | None = self._conn.execute(
+            "SELECT size, mtime_ns, digest, facts FROM facts WHERE path = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        size, mtime_ns, digest, facts_json = row
+        entry = (size, mtime_ns, digest, _facts_from_json(facts_json))
+        self._entry_by_key[key] = entry
+        return entry
+
+    def _get_blob_facts(
+        self,
+        blob_id: str,
+        *,
+        parse_engine: ParseEngine,
+    ) -> FileFacts | None:
+        key = _get_blob_key(blob_id, parse_engine=parse_engine)
+        facts = self._facts_by_blob_id.get(key)
+        if facts is not None:
+            return facts
+
+        row: tuple[str] | None = self._conn.execute(
+            "SELECT facts FROM blob_facts WHERE blob_id = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        (facts_json,) = row
+        facts = _facts_from_json(facts_json)
+        self._facts_by_blob_id[key] = facts
+        return facts
+
+
+def _get_key(path: Path) -> str:
+    return os.path.abspath(path)  # noqa: PTH100
+
+
+def _get_facts_key(path: Path, *, parse_engine: ParseEngine) -> str:
+    return f"{parse_engine}:{_get_key(path)}"
+
+
+def _get_blob_key(blob_id: str, *, parse_engine: ParseEngine) -> str:
+    return f"{parse_engine}:{blob_id}"
+
+
+def get_digest(contents: SourceBytes) -> str:
+    """Get the digest of a file's contents, by which cache entries are validated."""
+    return hashlib.blake2b(contents, digest_size=16).hexdigest()
+
+
+def _stat(path: Path) -> os.stat_result:
+    try:
+        return os.stat(path)  # noqa: PTH116
+    except FileNotFoundError:
+        msg = f"Could not find {path}"
+        raise FileNotFoundError(msg) from None
+
+
+def get_config_fingerprint(proj_dir: Path, *, config: ProjConfig) -> str | None:
+    """Get a key which changes whenever the configuration might resolve differently.
+
+    If anything was modified too recently for its mtime to be trusted, there is none.
+    """
+    now_ns = time.time_ns()
+    fingerprint = []
+    for path in [
+        proj_dir / PYPROJTOML_NAME,
+        *get_config_dirs(proj_dir=proj_dir, config=config),
+    ]:
+        try:
+            stat = os.stat(path)  # noqa: PTH116
+        except OSError:
+            fingerprint.append((os.fspath(path), -1, -1))
+            continue
+        if now_ns - stat.st_mtime_ns < _RACY_MTIME_WINDOW_NS:
+            return None
+        fingerprint.append((os.fspath(path), stat.st_size, stat.st_mtime_ns))
+    return json.dumps(fingerprint)
+
+
+def _is_entry_fresh(entry: _Entry, *, stat: os.stat_result) -> bool:
+    size, mtime_ns, _, _ = entry
+    return size == stat.st_size and mtime_ns == stat.st_mtime_ns
+
+
+def _connect(db_path: Path | None) -> sqlite3.Connection:
+    if db_path is None:
+        return _connect_unchecked(":memory:")
+
+    try:
+        conn = _connect_unchecked(db_path)
+    except sqlite3.DatabaseError as err:
+        # Errors such as the database being locked by another run are raised, so the
+        # caller can run without the cache, rather than deleting a healthy one.
+        if not _is_corrupt_db_error(err):
+            raise
+        # The database is corrupt, so start afresh.
+        db_path.unlink(missing_ok=True)
+        conn = _connect_unchecked(db_path)
+    return conn
+
+
+def _is_corrupt_db_error(err: sqlite3.DatabaseError) -> bool:
+    msg = str(err).lower()
+    return any(corrupt_msg in msg for corrupt_msg in _CORRUPT_DB_MSGS)
+
+
+def _connect_unchecked(db_path: Path | str) -> sqlite3.Connection:
+    # The timeout sets SQLite's busy timeout, to wait for other runs' locks.
+    conn = sqlite3.connect(db_path, timeout=_BUSY_TIMEOUT_S)
+    try:
+        _init_db(conn)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS facts ("
+        "path TEXT PRIMARY KEY, "
+        "size INTEGER NOT NULL, "
+        "mtime_ns INTEGER NOT NULL, "
+        "digest TEXT NOT NULL, "
+        "facts TEXT NOT NULL"
+        ")",
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS blob_facts ("
+        "blob_id TEXT PRIMARY KEY, "
+        "facts TEXT NOT NULL"
+        ")",
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS configs ("
+        "proj_dir TEXT PRIMARY KEY, "
+        "fingerprint TEXT NOT NULL, "
+        "config TEXT NOT NULL"
+        ")",
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS runs ("
+        "proj_dir TEXT PRIMARY KEY, "
+        "fingerprint TEXT NOT NULL, "
+        "file_tree TEXT NOT NULL, "
+        "violations TEXT NOT NULL"
+        ")",
+    )
+
+    cache_version = _get_cache_version()
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if row is None or row[0] != cache_version:
+        conn.execute("DELETE FROM facts")
+        conn.execute("DELETE FROM blob_facts")
+        conn.execute("DELETE FROM configs")
+        conn.execute("DELETE FROM runs")
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+            (cache_version,),
+        )
+        conn.commit()
+
+
+@functools.cache
+def _get_cache_version() -> str:
+    """Get a key which changes whenever cached facts, configs or runs might be stale.
+
+    This is only worked out once per process, since the modules can't change while
+    they are in use, and a long-lived process might open many caches.
+    """
+    # Importing the metadata machinery is slow, and is only needed to open a cache.
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        suiteas_version = version("suiteas")
+    except PackageNotFoundError:
+        suiteas_version = "unknown"
+
+    # The extraction logic lives in suiteas.read.file and suiteas.read.scan, the
+    # configuration logic in suiteas.config and suiteas.read.config, the logic turning
+    # facts into a project in the other suiteas.read modules and suiteas.domain, and
+    # the checking logic in suiteas.core.check and the modules it uses, so any edit to
+    # them invalidates the cache, even between releases.
+    file_module_path = Path(suiteas.read.file.__file__)
+    check_module_path = Path(suiteas.core.check.__file__)
+    extractor_digest = get_digest(
+        b"".join(
+            module_path.read_bytes()
+            for module_path in (
+                file_module_path,
+                file_module_path.with_name("scan.py"),
+                Path(suiteas.config.__file__),
+                Path(suiteas.read.config.__file__),
+                file_module_path.with_name("codebase.py"),
+                file_module_path.with_name("pytest_file.py"),
+                file_module_path.with_name("pytest_suite.py"),
+                file_module_path.with_name("project.py"),
+                Path(suiteas.config.__file__).with_name("domain.py"),
+                check_module_path,
+                check_module_path.with_name("names.py"),
+                check_module_path.with_name("path.py"),
+                check_module_path.with_name("rules.py"),
+            )
+        ),
+    )
+
+    python_version = ".".join(str(part) for part in sys.version_info[:2])
+
+    return f"{suiteas_version}-{python_version}-{extractor_digest}"
+
+
+def _facts_from_json(facts_json: str) -> FileFacts:
+    funcs, clses, imported_objs = json.loads(facts_json)
+    return (
+        tuple((name, line_num, char_offset) for name, line_num, char_offset in funcs),
+        tuple(
+            (name, line_num, char_offset, has_funcs)
+            for name, line_num, char_offset, has_funcs in clses
+        ),
+        tuple(imported_objs),
+    )
@@ -1,38 +1,133 @@
 """Utilities for reading-in a Python codebase."""
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import Executor
 from pathlib import Path
 
 from suiteas.config import ProjConfig
-from suiteas.domain import Codebase
-from suiteas.read.file import get_file
+from suiteas.core.profile import Profiler, profile_phase
+from suiteas.domain import Codebase, CompactCodebase
+from suiteas.read.cache import FactCache
+from suiteas.read.config import get_file_filter
+from suiteas.read.discover import discover_py_files, sort_paths
+from suiteas.read.file import FileFacts, file_from_facts
+from suiteas.read.parallel import get_files_facts
+from suiteas.read.snapshot import FsSnapshot
 
 
-def get_codebase(
+def get_codebase(  # noqa: PLR0913
     *,
     proj_dir: Path,
     config: ProjConfig,
     included_src_files: list[Path] | None = None,
-) -> Codebase:
-    """Read the codebase for a project."""
+    blob_id_by_path: Mapping[Path, str | None] | None = None,
+    cache: FactCache | None = None,
+    executor: Executor | None = None,
+    profiler: Profiler | None = None,
+    snapshot: FsSnapshot | None = None,
+) -> Codebase | CompactCodebase:
+    """Read the codebase for a project, stored as configured.
+
+    Any git blob IDs given for the included files are used to look them up in the
+    cache. Directories are looked up in the snapshot, if one is given.
+    """
     src_dir = proj_dir / config.src_rel_path
 
-    if not src_dir.exists():
+    if snapshot is None:
+        snapshot = FsSnapshot()
+    if not snapshot.exists(src_dir):
         msg = f"Could not find {src_dir}"
         raise FileNotFoundError(msg)
 
-    if included_src_files is None:
-        included_src_files = list(src_dir.glob("**/*.py"))
-    files = [
-        get_file(
-            path,
-            module_name=_get_module_name(path=path, root_dir=src_dir),
+    with profile_phase(profiler, "discovery"):
+        blob_ids: Sequence[str | None] | None
+        if included_src_files is None:
+            paths, blob_ids = discover_py_files(
+                src_dir,
+                exclude_dirs=config.exclude_dirs,
+                file_filter=get_file_filter(config, proj_dir=proj_dir),
+                file_source=config.file_source,
+                snapshot=snapshot,
+            )
+        else:
+            paths = sort_paths(included_src_files)
+            blob_ids = (
+                None
+                if blob_id_by_path is None
+                else [blob_id_by_path.get(path) for path in paths]
+            )
+
+    with profile_phase(profiler, "parsing"):
+        facts_list = get_files_facts(
+            paths,
+            cache=cache,
+            executor=executor,
+            parse_engine=config.parse_engine,
+            profiler=profiler,
+            blob_ids=blob_ids,
         )
-        for path in sorted(included_src_files)
-    ]
+        if config.codebase_store == "compact":
+            return compact_codebase_from_facts(paths, facts_list, root_dir=src_dir)
+
+        files = [
+            file_from_facts(
+                path,
+                facts,
+                module_name=get_module_name(path=path, root_dir=src_dir),
+            )
+            for path, facts in zip(paths, facts_list, strict=True)
+        ]
 
     return Codebase(files=files)
 
 
-def _get_module_name(*, path: Path, root_dir: Path) -> str:
+def compact_codebase_from_facts(
+    paths: Iterable[Path],
+    facts_list: Iterable[FileFacts],
+    *,
+    root_dir: Path,
+) -> CompactCodebase:
+    """Build a column-wise codebase from the facts of its files, in the same order.
+
+    Names, paths and imports are stored once each in a shared string table.
+    """
+    codebase = CompactCodebase()
+    # Dictionaries keep their insertion order, so the IDs are the indices of the keys.
+    string_ids: dict[str, int] = {}
+    for path, (funcs, clses, imported_objs) in zip(paths, facts_list, strict=True):
+        codebase.file_path_ids.append(
+            string_ids.setdefault(os.fspath(path), len(string_ids)),
+        )
+        module_name = get_module_name(path=path, root_dir=root_dir)
+        codebase.file_module_ids.append(
+            string_ids.setdefault(module_name, len(string_ids)),
+        )
+
+        for name, line_num, char_offset in funcs:
+            codebase.func_name_ids.append(string_ids.setdefault(name, len(string_ids)))
+            codebase.func_line_nums.append(line_num)
+            codebase.func_char_offsets.append(char_offset)
+        codebase.func_starts.append(len(codebase.func_name_ids))
+
+        for name, line_num, char_offset, has_funcs in clses:
+            codebase.cls_name_ids.append(string_ids.setdefault(name, len(string_ids)))
+            codebase.cls_line_nums.append(line_num)
+            codebase.cls_char_offsets.append(char_offset)
+            codebase.cls_has_funcs.append(has_funcs)
+        codebase.cls_starts.append(len(codebase.cls_name_ids))
+
+        codebase.import_ids.extend(
+            string_ids.setdefault(imported_obj, len(string_ids))
+            for imported_obj in imported_objs
+        )
+        codebase.import_starts.append(len(codebase.import_ids))
+
+    codebase.strings = list(string_ids)
+    return codebase
+
+
+def get_module_name(*, path: Path, root_dir: Path) -> str:
+    """Get the dotted name of the module in a file, relative to a root directory."""
     return (
         path.relative_to(root_dir)
         .with_suffix("")
@@ -3,11 +3,15 @@ from pathlib import Path
 from typing import Any
 
 import tomli
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, PositiveInt, ValidationError
 
 from suiteas.config import ProjConfig
 from suiteas.core.names import PYPROJTOML_NAME
 from suiteas.core.rules import RULE_CODES, RuleCode
+from suiteas.domain import CodebaseStore
+from suiteas.read.discover import FileFilter, FileSource
+from suiteas.read.file import ParseEngine
+from suiteas.read.snapshot import FsSnapshot
 
 
 class ConfigFileError(ValueError):
@@ -32,11 +36,24 @@ class TOMLProjConfig(BaseModel):
     project_name: str | None = None
     setuptools_pkg_names: list[str] | None = None
     ignore: list[RuleCode] | None = None
+    parse_engine: ParseEngine | None = None
+    exclude_dirs: list[str] | None = None
+    exclude: list[str] | None = None
+    exclude_generated: bool | None = None
+    max_file_bytes: PositiveInt | None = None
+    file_source: FileSource | None = None
+    codebase_store: CodebaseStore | None = None
     model_config = dict(extra="forbid")
 
 
-def get_config(*, proj_dir: Path) -> ProjConfig:
-    """Find the configuration for a project in the pyproject.toml file."""
+def get_config(*, proj_dir: Path, snapshot: FsSnapshot | None = None) -> ProjConfig:
+    """Find the configuration for a project in the pyproject.toml file.
+
+    The directories of the project are looked up in the snapshot, if one is given.
+    """
+    if snapshot is None:
+        snapshot = FsSnapshot()
+
     toml_path = proj_dir / PYPROJTOML_NAME
     try:
         toml_config = get_toml_config(toml_path)
@@ -61,67 +78,121 @@ def get_config(*, proj_dir: Path) -> ProjConfig:
             proj_dir=proj_dir,
             pkg_names=pkg_names,
             found_toml=found_toml,
+            snapshot=snapshot,
         )
-    _validate_src_rel_path(src_rel_path, proj_dir=proj_dir)
+    _validate_src_rel_path(src_rel_path, proj_dir=proj_dir, snapshot=snapshot)
 
     src_dir = proj_dir / src_rel_path
 
     if pkg_names is None:
-        pkg_names = _heuristic2_pkg_names(src_dir=src_dir)
+        pkg_names = _heuristic2_pkg_names(src_dir=src_dir, snapshot=snapshot)
     pkg_names.sort()
 
     if tests_rel_path is None:
-        tests_rel_path = _heuristic_tests_rel_path(proj_dir=proj_dir)
-    _validate_tests_rel_path(tests_rel_path, proj_dir=proj_dir)
+        tests_rel_path = _heuristic_tests_rel_path(proj_dir=proj_dir, snapshot=snapshot)
+    _validate_tests_rel_path(tests_rel_path, proj_dir=proj_dir, snapshot=snapshot)
     tests_dir = proj_dir / tests_rel_path
 
     if unittest_dir_name is None:
         unittest_dir_name = _heuristic1_unittest_dir_name(
             tests_dir=tests_dir,
+            snapshot=snapshot,
         )
     use_consolidated_tests_dir = _is_consolidated_tests_dir(
         pkg_names=pkg_names,
         tests_dir=tests_dir,
         unittest_dir_name=unittest_dir_name,
+        snapshot=snapshot,
     )
     if unittest_dir_name is None:
         unittest_dir_name = _heuristic2_unittest_dir_name(
             use_consolidated_tests_dir=use_consolidated_tests_dir,
         )
     unittests_dir = tests_dir / unittest_dir_name
-    _validate_unittest_dir_name(unittests_dir=unittests_dir)
+    _validate_unittest_dir_name(unittests_dir=unittests_dir, snapshot=snapshot)
 
     _validate_pkg_names(
         pkg_names,
         src_dir=src_dir,
         unittests_dir=unittests_dir,
         use_consolidated_tests_dir=use_consolidated_tests_dir,
+        snapshot=snapshot,
     )
     checks = list(set(RULE_CODES) - set(toml_config.ignore or []))
     checks.sort()
 
-    return ProjConfig(
+    config = ProjConfig(
         pkg_names=pkg_names,
         src_rel_path=src_rel_path,
         tests_rel_path=tests_rel_path,
         unittest_dir_name=unittest_dir_name,
         use_consolidated_tests_dir=use_consolidated_tests_dir,
         checks=checks,
+        exclude_dirs=toml_config.exclude_dirs or [],
+    )
+    # Settings with defaults which don't depend on the project's layout.
+    return config.model_copy(
+        update=toml_config.model_dump(
+            include={
+                "parse_engine",
+                "file_source",
+                "codebase_store",
+                "exclude",
+                "exclude_generated",
+                "max_file_bytes",
+            },
+            exclude_none=True,
+        ),
+    )
+
+
+def get_file_filter(config: ProjConfig, *, proj_dir: Path) -> FileFilter | None:
+    """Get the filter for the files of a project, or None if none are to be skipped."""
+    if not (
+        config.exclude or config.exclude_generated or config.max_file_bytes is not None
+    ):
+        return None
+    return FileFilter(
+        base_dir=proj_dir,
+        exclude=config.exclude,
+        exclude_generated=config.exclude_generated,
+        max_file_bytes=config.max_file_bytes,
     )
 
 
+def get_config_dirs(*, proj_dir: Path, config: ProjConfig) -> list[Path]:
+    """Get the directories whose entries the configuration of a project depends on.
+
+    The heuristics and validation only check for entries in the project directory, the
+    source and tests directories and the directories leading to them, so if none of
+    these directories changes, the configuration resolves the same way.
+    """
+    config_dirs = {proj_dir}
+    for rel_path in (
+        config.src_rel_path,
+        config.tests_rel_path,
+        config.tests_rel_path / config.unittest_dir_name,
+    ):
+        config_dirs.update(
+            proj_dir.joinpath(*rel_path.parts[:idx])
+            for idx in range(1, len(rel_path.parts) + 1)
+        )
+    return sorted(config_dirs)
+
+
 def _heuristic_src_rel_path(
     *,
     proj_dir: Path,
     pkg_names: list[str] | None,
     found_toml: bool,
+    snapshot: FsSnapshot,
 ) -> Path:
-    if (proj_dir / "src").exists():
+    if snapshot.exists(proj_dir / "src"):
         return Path("src")
 
     if pkg_names is not None:
         for pkg_name in pkg_names:
-            if not (proj_dir / pkg_name).exists():
+            if not snapshot.exists(proj_dir / pkg_name):
                 break
             return Path(".")
 
@@ -135,8 +206,8 @@ def _heuristic_src_rel_path(
 
     if found_toml:
         msg = (
-            "Could not automatically determine source directory for the project. " +
-            course_of_action
+            "Could not automatically determine source directory for the project. "
+            + course_of_action
         )
         raise ConfigFileError(msg)
 
@@ -157,11 +228,11 @@ def _heuristic1_pkg_names(*, toml_config: TOMLProjConfig) -> list[str] | None:
     return None
 
 
-def _heuristic2_pkg_names(*, src_dir: Path) -> list[str]:
+def _heuristic2_pkg_names(*, src_dir: Path, snapshot: FsSnapshot) -> list[str]:
     package_names = [
-        path.name
-        for path in src_dir.iterdir()
-        if path.is_dir() and path.name.isidentifier()
+        entry.name
+        for entry in snapshot.scandir(src_dir)
+        if entry.is_dir() and entry.name.isidentifier()
     ]
     if package_names:
         return package_names
@@ -175,8 +246,8 @@ def _heuristic2_pkg_names(*, src_dir: Path) -> list[str]:
     raise ConfigFileError(msg)
 
 
-def _heuristic_tests_rel_path(*, proj_dir: Path) -> Path:
-    if (proj_dir / "tests").exists():
+def _heuristic_tests_rel_path(*, proj_dir: Path, snapshot: FsSnapshot) -> Path:
+    if snapshot.exists(proj_dir / "tests"):
         return Path("tests")
 
     msg = (
@@ -188,8 +259,12 @@ def _heuristic_tests_rel_path(*, proj_dir: Path) -> Path:
     raise ConfigFileError(msg)
 
 
-def _heuristic1_unittest_dir_name(*, tests_dir: Path) -> Path | None:
-    if (tests_dir / "unit").exists():
+def _heuristic1_unittest_dir_name(
+    *,
+    tests_dir: Path,
+    snapshot: FsSnapshot,
+) -> Path | None:
+    if snapshot.exists(tests_dir / "unit"):
         return Path("unit")
 
     return None
@@ -213,19 +288,25 @@ def _is_consolidated_tests_dir(
     pkg_names: list[str],
     tests_dir: Path,
     unittest_dir_name: Path | None,
+    snapshot: FsSnapshot,
 ) -> bool:
     if len(pkg_names) == 1:
         (pkg_name,) = pkg_names
-        if (unittest_dir_name is None or unittest_dir_name == Path(".")) and not (
-            tests_dir / pkg_name
-        ).exists():
+        if (
+            unittest_dir_name is None or unittest_dir_name == Path(".")
+        ) and not snapshot.exists(tests_dir / pkg_name):
             return True
     return False
 
 
-def _validate_src_rel_path(src_rel_path: Path, *, proj_dir: Path) -> None:
+def _validate_src_rel_path(
+    src_rel_path: Path,
+    *,
+    proj_dir: Path,
+    snapshot: FsSnapshot,
+) -> None:
     src_path = proj_dir / src_rel_path
-    if not src_path.exists():
+    if not snapshot.exists(src_path):
         msg = f"Could not find source directory {src_path}"
         raise FileNotFoundError(msg)
 
@@ -236,18 +317,19 @@ def _validate_pkg_names(
     src_dir: Path,
     unittests_dir: Path,
     use_consolidated_tests_dir: bool,
+    snapshot: FsSnapshot,
 ) -> None:
     if use_consolidated_tests_dir:
         return
 
     for pkg_name in pkg_names:
         pkg_dir = src_dir / pkg_name
-        if not pkg_dir.exists():
+        if not snapshot.exists(pkg_dir):
             msg = f"Could not find package directory of {pkg_name} at {pkg_dir}"
             raise FileNotFoundError(msg)
 
         test_pkg_dir = unittests_dir / pkg_name
-        if not test_pkg_dir.exists():
+        if not snapshot.exists(test_pkg_dir):
             msg = (
                 f"Could not find unit test directory of {pkg_name} at {test_pkg_dir}.\n"
                 f"HINT: If you are not expecting a unit test directory for {pkg_name}, "
@@ -257,27 +339,32 @@ def _validate_pkg_names(
             raise FileNotFoundError(msg)
 
 
-def _validate_unittest_dir_name(unittests_dir: Path) -> None:
-    if not unittests_dir.exists():
+def _validate_unittest_dir_name(unittests_dir: Path, *, snapshot: FsSnapshot) -> None:
+    if not snapshot.exists(unittests_dir):
         msg = f"Could not find unit tests directory {unittests_dir}"
         raise FileNotFoundError(msg)
 
 
-def _validate_tests_rel_path(tests_rel_path: Path, *, proj_dir: Path) -> None:
+def _validate_tests_rel_path(
+    tests_rel_path: Path,
+    *,
+    proj_dir: Path,
+    snapshot: FsSnapshot,
+) -> None:
     tests_path = proj_dir / tests_rel_path
-    if not tests_path.exists():
+    if not snapshot.exists(tests_path):
         msg = f"Could not find tests directory {tests_path}"
         raise FileNotFoundError(msg)
 
 
 def get_toml_config(toml_path: Path) -> TOMLProjConfig:
     """Find the configuration for a project, forced at a specific location."""
-    if not toml_path.exists():
+    try:
+        with toml_path.open(mode="r", encoding="utf8") as file:
+            pyproject_contents = file.read()
+    except FileNotFoundError:
         msg = f"Could not find TOML configuration file at {toml_path}"
-        raise FileNotFoundError(msg)
-
-    with toml_path.open(mode="r", encoding="utf8") as file:
-        pyproject_contents = file.read()
+        raise FileNotFoundError(msg) from None
 
     if not pyproject_contents:
         msg = f"Configuration file is empty at {toml_path}"
@@ -0,0 +1,375 @@
+"""Utilities for finding the Python files in a directory tree."""
+
+import fnmatch
+import os
+import re
+from collections.abc import Callable, Iterable, Sequence
+from contextlib import suppress
+from pathlib import Path
+from typing import Literal, TypeAlias
+
+from suiteas.read.git import GitError, get_tracked_paths
+from suiteas.read.snapshot import FsSnapshot
+
+# Where the files to check are found: by walking the filesystem, or by asking git for
+# the tracked files along with their blob IDs.
+FileSource: TypeAlias = Literal["walk", "git"]
+
+# Directories which never hold a project's own source code or tests.
+DEFAULT_EXCLUDE_DIRS = (
+    ".*",
+    "__pycache__",
+    "*.egg-info",
+    "node_modules",
+    "site-packages",
+)
+
+# A directory holding this file is a virtual environment.
+_VENV_MARKER_NAME = "pyvenv.cfg"
+
+# Generated files are recognized by a marker near their start: an at sign followed by
+# "generated", or the "do not edit" comment (in capitals) written by e.g. the protocol
+# buffer compiler. The markers are spelled out indirectly, so this file doesn't match.
+_GENERATED_MARKER_RE = re.compile(rb"@(?:generated)\b|\bDO NOT (?:EDIT)\b")
+_GENERATED_SNIFF_N_BYTES = 1 << 12
+
+
+class FileFilter:
+    """Which files to skip, by their paths, sizes and contents.
+
+    Paths are matched against glob patterns relative to a base directory, as by
+    get_path_matcher. These complement the exclude_dirs patterns, which only match the
+    names of directories, see get_dir_name_matcher. Optionally, files larger than a
+    number of bytes, or with a generated-file marker near their start, are skipped too.
+    Checking for the marker means reading the start of every file, but a file which is
+    skipped is never read in full or parsed.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_dir: Path,
+        exclude: Sequence[str] = (),
+        exclude_generated: bool = False,
+        max_file_bytes: int | None = None,
+    ) -> None:
+        """Compile the patterns to match paths against."""
+        self._is_excluded_path = get_path_matcher(exclude, base_dir=base_dir)
+        self._exclude_generated = exclude_generated
+        self._max_file_bytes = max_file_bytes
+
+    def is_excluded_path(self, path_str: str) -> bool:
+        """Check whether a path matches the patterns, without looking at the file."""
+        return self._is_excluded_path(path_str)
+
+    def filter_path_strs(self, path_strs: Iterable[str]) -> list[str]:
+        """Keep only the paths of files which aren't to be skipped."""
+        path_strs = [
+            path_str for path_str in path_strs if not self.is_excluded_path(path_str)
+        ]
+        if not self._exclude_generated and self._max_file_bytes is None:
+            return path_strs
+        return [
+            path_str for path_str in path_strs if not self._is_excluded_file(path_str)
+        ]
+
+    def _is_excluded_file(self, path_str: str) -> bool:
+        try:
+            if not self._exclude_generated:
+                return self._is_too_large(os.stat(path_str).st_size)  # noqa: PTH116
+
+            fd = os.open(path_str, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                if self._is_too_large(os.fstat(fd).st_size):
+                    return True
+                start = os.read(fd, _GENERATED_SNIFF_N_BYTES)
+            finally:
+                os.close(fd)
+        except OSError:
+            # Left for reading the file to report.
+            return False
+        return _GENERATED_MARKER_RE.search(start) is not None
+
+    def _is_too_large(self, n_bytes: int) -> bool:
+        return self._max_file_bytes is not None and n_bytes > self._max_file_bytes
+
+
+def discover_py_files(
+    root_dir: Path,
+    *,
+    exclude_dirs: Sequence[str] = (),
+    file_filter: FileFilter | None = None,
+    file_source: FileSource = "walk",
+    snapshot: FsSnapshot | None = None,
+) -> tuple[list[Path], list[str | None]]:
+    """Find the Python files in a directory tree, along with any known git blob IDs.
+
+    With git as the file source, only the files which git tracks or doesn't ignore are
+    found, and excluded directories and files are skipped just as they are when
+    walking the filesystem. Outside a git repository, the filesystem is walked instead.
+    """
+    blob_id_by_path = None
+    if file_source == "git":
+        with suppress(GitError):
+            blob_id_by_path = get_tracked_paths(root_dir)
+    if blob_id_by_path is None:
+        paths = find_py_files(
+            root_dir,
+            exclude_dirs=exclude_dirs,
+            file_filter=file_filter,
+            snapshot=snapshot,
+        )
+        return paths, [None] * len(paths)
+
+    is_excluded_dir_name = get_dir_name_matcher([*DEFAULT_EXCLUDE_DIRS, *exclude_dirs])
+    blob_id_by_path = {
+        path: blob_id
+        for path, blob_id in blob_id_by_path.items()
+        if not any(
+            is_excluded_dir_name(name) for name in path.relative_to(root_dir).parts[:-1]
+        )
+    }
+    if file_filter is not None:
+        kept_path_strs = file_filter.filter_path_strs(map(os.fspath, blob_id_by_path))
+        blob_id_by_path = {
+            Path(path_str): blob_id_by_path[Path(path_str)]
+            for path_str in kept_path_strs
+        }
+    paths = sort_paths(blob_id_by_path)
+    return paths, [blob_id_by_path[path] for path in paths]
+
+
+def find_py_files(
+    root_dir: Path,
+    *,
+    exclude_dirs: Sequence[str] = (),
+    file_filter: FileFilter | None = None,
+    snapshot: FsSnapshot | None = None,
+) -> list[Path]:
+    """Find the Python files in a directory tree, in sorted order.
+
+    Directories whose names match the default exclusions or any of the given glob
+    patterns are skipped without being listed, as are virtual environments. Symlinked
+    directories are followed, but each directory is only searched once, so symlink
+    loops are harmless. Files and directories skipped by the file filter are left out
+    too.
+    """
+    return find_files(
+        root_dir,
+        is_file_name=lambda name: name.endswith(".py"),
+        exclude_dirs=exclude_dirs,
+        file_filter=file_filter,
+        snapshot=snapshot,
+    )
+
+
+def find_files(
+    root_dir: Path,
+    *,
+    is_file_name: Callable[[str], bool],
+    exclude_dirs: Sequence[str] = (),
+    file_filter: FileFilter | None = None,
+    snapshot: FsSnapshot | None = None,
+) -> list[Path]:
+    """Find the files with matching names in a directory tree, in sorted order.
+
+    Directories are skipped in the same way as by find_py_files. If a snapshot is
+    given, then directories are listed through it, so their listings are shared.
+    """
+    is_excluded_dir_name = get_dir_name_matcher([*DEFAULT_EXCLUDE_DIRS, *exclude_dirs])
+    is_excluded_path = (
+        _is_never_excluded if file_filter is None else file_filter.is_excluded_path
+    )
+
+    path_strs: list[str] = []
+    root_stat = root_dir.stat()
+    seen_dir_ids = {(root_stat.st_dev, root_stat.st_ino)}
+    dir_strs = [os.fspath(root_dir)]
+    while dir_strs:
+        try:
+            entries = _list_dir(dir_strs.pop(), snapshot=snapshot)
+        except OSError:
+            continue
+
+        if any(entry.name == _VENV_MARKER_NAME for entry in entries):
+            continue
+
+        for entry in entries:
+            name = entry.name
+            if is_file_name(name):
+                if entry.is_file():
+                    path_strs.append(entry.path)
+            elif (
+                not is_excluded_dir_name(name)
+                and entry.is_dir()
+                and not is_excluded_path(entry.path)
+            ):
+                dir_id = _get_dir_id(entry)
+                if dir_id is not None and dir_id not in seen_dir_ids:
+                    seen_dir_ids.add(dir_id)
+                    dir_strs.append(entry.path)
+
+    if file_filter is not None:
+        path_strs = file_filter.filter_path_strs(path_strs)
+    path_strs.sort(key=_get_sort_key)
+    return [Path(path_str) for path_str in path_strs]
+
+
+def filter_existing_path_strs(
+    path_strs: Iterable[str],
+    *,
+    snapshot: FsSnapshot | None = None,
+) -> list[str]:
+    """Keep only the paths which exist, listing each directory at most once.
+
+    Many paths in the same directory are checked against a single listing of it,
+    rather than with a system call each.
+    """
+    if snapshot is None:
+        snapshot = FsSnapshot()
+    return [path_str for path_str in path_strs if snapshot.exists(path_str)]
+
+
+def sort_paths(paths: Iterable[Path]) -> list[Path]:
+    """Sort paths in the same order as Path objects, but faster.
+
+    Comparing Path objects splits them into parts every time, so instead they are
+    compared as strings whose separators sort before any other character.
+    """
+    return sorted(paths, key=lambda path: _get_sort_key(os.fspath(path)))
+
+
+def get_dir_name_matcher(patterns: Sequence[str]) -> Callable[[str], bool]:
+    """Get a function which checks whether a name matches any of the glob patterns."""
+    literals = frozenset(pattern for pattern in patterns if not _has_magic(pattern))
+    globs = [pattern for pattern in patterns if _has_magic(pattern)]
+    if not globs:
+        return literals.__contains__
+
+    glob_re = re.compile("|".join(fnmatch.translate(pattern) for pattern in globs))
+    return lambda name: name in literals or glob_re.match(name) is not None
+
+
+def get_path_matcher(
+    patterns: Sequence[str],
+    *,
+    base_dir: Path,
+) -> Callable[[str], bool]:
+    """Get a function which checks whether a path matches any of the glob patterns.
+
+    A pattern with a slash is matched against the path relative to the base
+    directory, e.g. "src/pkg/*_pb2.py", while a pattern without one is matched against
+    the name of every file and directory in the path, e.g. "*_pb2.py". Unlike with
+    fnmatch, "*", "?" and "[...]" never match a slash, while a "**" component matches
+    any number of directories, e.g. "src/**/models". A path matches if any of its parent
+    directories do. All the patterns are compiled into one regular expression, so each
+    path is only matched once however many patterns there are. The base directory and
+    the paths are made absolute before they are compared, so either can be relative.
+    """
+    if not patterns:
+        return _is_never_excluded
+
+    base_dir_str = os.path.abspath(base_dir)  # noqa: PTH100
+    base_prefix = base_dir_str.replace(os.sep, "/").rstrip("/") + "/"
+    path_re = re.compile(
+        re.escape(base_prefix)
+        + "(?:"
+        + "|".join(_translate_path_pattern(pattern) for pattern in patterns)
+        + r")(?:/.*)?\Z",
+        flags=re.DOTALL,
+    )
+    abspath = os.path.abspath
+    if os.sep == "/":
+        return lambda path_str: path_re.match(abspath(path_str)) is not None
+    return lambda path_str: (
+        path_re.match(abspath(path_str).replace(os.sep, "/")) is not None
+    )
+
+
+def _translate_path_pattern(pattern: str) -> str:
+    """Translate a glob pattern into a regular expression, without anchoring its end.
+
+    The end isn't anchored since the path might continue past a matching directory.
+    """
+    parts = pattern.strip("/").split("/")
+    if len(parts) == 1:
+        # Matched against the name of every file and directory in the path.
+        parts.insert(0, "**")
+    regex = "".join(
+        "(?:.*/)?" if part == "**" else _translate_path_part(part) + "/"
+        for part in parts
+    )
+    # A trailing "**" matches anything, while any other part doesn't need its slash.
+    return regex[:-1] if regex.endswith("/") else regex + ".*"
+
+
+def _translate_path_part(part: str) -> str:
+    """Translate the glob pattern of a single path component, as fnmatch would.
+
+    Unlike with fnmatch, wildcards never match a slash.
+    """
+    regex_parts = []
+    idx = 0
+    while idx < len(part):
+        char = part[idx]
+        idx += 1
+        if char == "*":
+            regex_parts.append("[^/]*")
+        elif char == "?":
+            regex_parts.append("[^/]")
+        elif char == "[" and (char_set := _translate_char_set(part, start=idx)):
+            char_set_regex, idx = char_set
+            regex_parts.append(char_set_regex)
+        else:
+            regex_parts.append(re.escape(char))
+    return "".join(regex_parts)
+
+
+def _translate_char_set(part: str, *, start: int) -> tuple[str, int] | None:
+    """Translate a "[...]" set starting after its bracket, giving the index after it.
+
+    None is given if the set isn't closed, in which case the bracket is literal.
+    """
+    end = start
+    if part[end : end + 1] == "!":
+        end += 1
+    if part[end : end + 1] == "]":
+        end += 1
+    end = part.find("]", end)
+    if end < 0:
+        return None
+
+    chars = part[start:end].replace("\\", "\\\\")
+    chars = chars.replace("[", "\\[").replace("]", "\\]")
+    if chars.startswith("!"):
+        chars = "^/" + chars[1:]
+    elif chars.startswith("^"):
+        chars = "\\" + chars
+    return f"[{chars}]", end + 1
+
+
+def _get_dir_id(entry: os.DirEntry[str]) -> tuple[int, int] | None:
+    try:
+        stat = entry.stat()
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _is_never_excluded(_: str) -> bool:
+    return False
+
+
+def _list_dir(dir_str: str, *, snapshot: FsSnapshot | None) -> list[os.DirEntry[str]]:
+    if snapshot is not None:
+        return snapshot.scandir(dir_str)
+    with os.scandir(dir_str) as entries_iter:
+        return list(entries_iter)
+
+
+def _get_sort_key(path_str: str) -> str:
+    return os.path.normcase(path_str).replace(os.sep, "\0")
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[")
@@ -1,13 +1,50 @@
-"""Utilities for reading-in source code files."""
+"""Utilities for reading-in source code files.
+
+Files are read as bytes, and parsed without decoding them first, so the parser detects
+their encoding from a PEP 263 encoding cookie or a byte-order mark, just as the
+interpreter would. Large files are memory-mapped rather than copied into memory.
+"""
 import ast
+import io
+import mmap
+import os
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import TypeAlias
+from typing import TYPE_CHECKING, Literal, TypeAlias
 
 from suiteas.domain import Class, File, Func
 
+if TYPE_CHECKING:
+    from suiteas.read.cache import FactCache
+
 TEST_EXPR = False
 
+# The contents of a source file, which is memory-mapped if it's large.
+SourceBytes: TypeAlias = bytes | mmap.mmap
+
+# Files at least this large are memory-mapped. Reading them into memory would copy
+# them, which is wasted when e.g. the file is only hashed to check if it has changed.
+_MMAP_MIN_N_BYTES = 1 << 20
+_READ_CHUNK_N_BYTES = 1 << 16
+
+# How facts are extracted from source code: by building a full syntax tree, or with a
+# faster scanner which falls back to building a syntax tree when in doubt.
+ParseEngine: TypeAlias = Literal["ast", "scan"]
+
+# Compact, module-independent facts extracted from a file:
+# (name, line_num, char_offset) for each function,
+# (name, line_num, char_offset, has_funcs) for each class,
+# and the fully-qualified name of each imported object.
+FuncFacts: TypeAlias = tuple[str, int, int]
+ClassFacts: TypeAlias = tuple[str, int, int, bool]
+FileFacts: TypeAlias = tuple[
+    tuple[FuncFacts, ...],
+    tuple[ClassFacts, ...],
+    tuple[str, ...],
+]
+
 
 class AnalyzedFileSyntaxError(SyntaxError):
     """Raised when the file being analyzed has a syntax error."""
@@ -82,63 +119,165 @@ else:
     )
 
 
-def get_file(path: Path, *, module_name: str) -> File:
+def get_file(
+    path: Path,
+    *,
+    module_name: str,
+    cache: "FactCache | None" = None,
+) -> File:
     """Read a file."""
-    if not path.exists():
+    facts = get_file_facts(path) if cache is None else cache.get_file_facts(path)
+    return file_from_facts(path, facts, module_name=module_name)
+
+
+def get_file_facts(path: Path, *, parse_engine: ParseEngine = "ast") -> FileFacts:
+    """Read a file and extract its facts."""
+    with open_source(path) as (contents, _):
+        return get_source_facts(contents, path=path, parse_engine=parse_engine)
+
+
+@contextmanager
+def open_source(path: Path) -> Iterator[tuple[SourceBytes, os.stat_result]]:
+    """Open a source file, giving its contents and the stat info of the opened file.
+
+    The file is opened once, without first checking that it exists, and read with as
+    few system calls as possible: small files with a single read sized by their stat
+    info, and large files by memory-mapping them, in which case their contents can't
+    be used once the context is left.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except FileNotFoundError:
         msg = f"Could not find {path}"
-        raise FileNotFoundError(msg)
+        raise FileNotFoundError(msg) from None
+
+    try:
+        stat = os.fstat(fd)
+        if stat.st_size < _MMAP_MIN_N_BYTES:
+            yield _read_all(fd, size_hint=stat.st_size), stat
+            return
+
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as contents:
+            yield contents, stat
+    finally:
+        os.close(fd)
+
+
+def _read_all(fd: int, *, size_hint: int) -> bytes:
+    # Asking for one more byte than expected tells apart the end of the file from a
+    # file which grew since it was stat-ed, without a further read.
+    contents = os.read(fd, size_hint + 1)
+    if len(contents) <= size_hint:
+        return contents
+
+    chunks = [contents]
+    while chunk := os.read(fd, _READ_CHUNK_N_BYTES):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def decode_source(contents: SourceBytes) -> str:
+    """Decode source code using its PEP 263 encoding cookie or byte-order mark.
+
+    Like the interpreter, UTF-8 is assumed if there is neither.
+    """
+    # The tokenizer is slow to import, and only needed by the scan engine.
+    from tokenize import detect_encoding
+
+    if isinstance(contents, mmap.mmap):
+        contents.seek(0)
+        encoding, _ = detect_encoding(contents.readline)
+    else:
+        encoding, _ = detect_encoding(io.BytesIO(contents).readline)
+    return str(contents, encoding)
+
+
+def get_source_facts(
+    source: str | SourceBytes,
+    *,
+    path: Path,
+    parse_engine: ParseEngine = "ast",
+) -> FileFacts:
+    """Extract the facts from the source code of a file, given as text or as bytes.
+
+    The "scan" engine avoids building a syntax tree, falling back to the "ast" engine
+    for any source code which it can't scan reliably. Unlike the "ast" engine, it
+    doesn't necessarily detect syntax errors.
+    """
+    if parse_engine == "scan":
+        # Compiling the scanner's patterns takes a while, so only do it when needed.
+        from suiteas.read.scan import AmbiguousSourceError, scan_source
 
-    with path.open(mode="r", encoding="utf8") as _f:
-        source = _f.read()
         try:
-            tree = ast.parse(source)
-        except SyntaxError as err:
+            text = source if isinstance(source, str) else decode_source(source)
+        except (SyntaxError, UnicodeDecodeError) as err:
             msg = f"Syntax error in {path}: {err}"
             raise AnalyzedFileSyntaxError(msg) from None
-        funcs, clses, imported_objs = _parse_tree(tree, module_name=module_name)
 
-    return File(path=path, funcs=funcs, clses=clses, imported_objs=imported_objs)
+        try:
+            funcs, clses, imported_objs = scan_source(text)
+        except AmbiguousSourceError:
+            pass
+        else:
+            return tuple(funcs), tuple(clses), tuple(imported_objs)
+
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as err:
+        msg = f"Syntax error in {path}: {err}"
+        raise AnalyzedFileSyntaxError(msg) from None
+    funcs, clses, imported_objs = _parse_tree(tree)
+
+    return tuple(funcs), tuple(clses), tuple(imported_objs)
+
+
+def file_from_facts(path: Path, facts: FileFacts, *, module_name: str) -> File:
+    """Build a file's domain object from the facts extracted from it."""
+    funcs, clses, imported_objs = facts
+    return File(
+        path=path,
+        funcs=[
+            Func(
+                name=name,
+                full_name=f"{module_name}.{name}",
+                line_num=line_num,
+                char_offset=char_offset,
+            )
+            for name, line_num, char_offset in funcs
+        ],
+        clses=[
+            Class(
+                name=name,
+                full_name=f"{module_name}.{name}",
+                line_num=line_num,
+                char_offset=char_offset,
+                has_funcs=has_funcs,
+            )
+            for name, line_num, char_offset, has_funcs in clses
+        ],
+        imported_objs=list(imported_objs),
+    )
 
 
 def _parse_tree(  # noqa: PLR0912, C901
     tree: ast.Module | FlowCtrlTree,
-    *,
-    module_name: str,
-) -> tuple[list[Func], list[Class], list[str]]:
-    """Get a File object from an ast tree."""
-    funcs = []
-    clses = []
-    imported_objs = []
+) -> tuple[list[FuncFacts], list[ClassFacts], list[str]]:
+    """Get the facts of a file from an ast tree."""
+    funcs: list[FuncFacts] = []
+    clses: list[ClassFacts] = []
+    imported_objs: list[str] = []
 
     for node in tree.body:
         if isinstance(node, _FLOW_CTRL):
-            subfuncs, subclses, subimported_objs = _parse_tree(
-                node,
-                module_name=module_name,
-            )
+            subfuncs, subclses, subimported_objs = _parse_tree(node)
             funcs.extend(subfuncs)
             clses.extend(subclses)
             imported_objs.extend(subimported_objs)
         elif isinstance(node, _FUNC_DEF):
-            funcs.append(
-                Func(
-                    name=node.name,
-                    full_name=f"{module_name}.{node.name}",
-                    line_num=node.lineno,
-                    char_offset=node.col_offset,
-                ),
-            )
+            funcs.append((node.name, node.lineno, node.col_offset))
         elif isinstance(node, _CLS_DEF):
             has_funcs = any(isinstance(n, _FUNC_DEF) for n in node.body)
-            clses.append(
-                Class(
-                    name=node.name,
-                    full_name=f"{module_name}.{node.name}",
-                    line_num=node.lineno,
-                    char_offset=node.col_offset,
-                    has_funcs=has_funcs,
-                ),
-            )
+            clses.append((node.name, node.lineno, node.col_offset, has_funcs))
         elif isinstance(node, _IMPORT):
             if isinstance(node, ast.Import):
                 for alias in node.names:
@@ -0,0 +1,164 @@
+"""Utilities for fingerprinting the files of a project, as a Merkle tree.
+
+Each file is identified by its size and modification time, or by its git blob ID where
+git knows it. Each directory is hashed from the files directly within it and from the
+hashes of its subdirectories, so the hash of the root directory changes whenever any
+file does. Comparing two trees a directory at a time then finds which subtrees changed,
+without looking into any unchanged ones.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeAlias
+
+from suiteas.read.cache import _RACY_MTIME_WINDOW_NS
+
+# The hash of a directory's whole subtree, and the hash of only its own files.
+DirHashes: TypeAlias = tuple[str, str]
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class FileTree:
+    """The hashes of the directories holding some files, by their relative paths.
+
+    Paths use forward slashes, and the root directory is given as the empty string.
+    """
+
+    hashes_by_rel_dir: dict[str, DirHashes]
+
+    @property
+    def root_hash(self) -> str:
+        """Get the hash of the whole tree."""
+        hashes = self.hashes_by_rel_dir.get("")
+        return _hash([]) if hashes is None else hashes[0]
+
+    def to_json(self) -> str:
+        """Serialize the tree, e.g. to store it."""
+        return json.dumps(self.hashes_by_rel_dir)
+
+    @classmethod
+    def from_json(cls, tree_json: str) -> "FileTree":
+        """Deserialize a tree stored by to_json."""
+        hashes_by_rel_dir: dict[str, list[str]] = json.loads(tree_json)
+        return cls(
+            hashes_by_rel_dir={
+                rel_dir: (hashes[0], hashes[1])
+                for rel_dir, hashes in hashes_by_rel_dir.items()
+            },
+        )
+
+
+def get_file_tree(
+    paths: Iterable[Path],
+    *,
+    root_dir: Path,
+    blob_ids: Sequence[str | None] | None = None,
+) -> FileTree | None:
+    """Hash files into a Merkle tree of their directories, relative to a root directory.
+
+    A file is identified by its git blob ID if one is given, and otherwise by its size
+    and modification time. If a file was modified too recently for its modification
+    time to be trusted, or has since been deleted, then there is no tree.
+    """
+    now_ns = time.time_ns()
+    root_dir_str = os.fspath(root_dir)
+    root_prefix = os.path.join(root_dir_str, "")  # noqa: PTH118
+    leaves_by_rel_dir: dict[str, list[str]] = {}
+    for idx, path in enumerate(paths):
+        path_str = os.fspath(path)
+        blob_id = None if blob_ids is None else blob_ids[idx]
+        if blob_id is not None:
+            id_str = blob_id
+        else:
+            try:
+                stat = os.stat(path_str)  # noqa: PTH116
+            except OSError:
+                return None
+            if now_ns - stat.st_mtime_ns < _RACY_MTIME_WINDOW_NS:
+                return None
+            id_str = f"{stat.st_size}:{stat.st_mtime_ns}"
+
+        rel_path = (
+            path_str[len(root_prefix) :]
+            if path_str.startswith(root_prefix)
+            else os.path.relpath(path_str, root_dir_str)
+        ).replace(os.sep, "/")
+        rel_dir, _, name = rel_path.rpartition("/")
+        leaves_by_rel_dir.setdefault(rel_dir, []).append(f"{name}\0{id_str}")
+
+    return FileTree(hashes_by_rel_dir=_hash_dirs(leaves_by_rel_dir))
+
+
+def get_changed_dirs(old_tree: FileTree, new_tree: FileTree) -> list[str]:
+    """Get the directories whose own files differ between two trees, in sorted order.
+
+    Only directories whose subtree hashes differ are looked into, so unchanged subtrees
+    are skipped whole. A directory which was added or removed counts as changed.
+    """
+    old_hashes_by_rel_dir = old_tree.hashes_by_rel_dir
+    new_hashes_by_rel_dir = new_tree.hashes_by_rel_dir
+    child_rel_dirs_by_rel_dir = _get_child_rel_dirs(
+        old_hashes_by_rel_dir.keys() | new_hashes_by_rel_dir.keys(),
+    )
+
+    changed_rel_dirs = []
+    rel_dirs = [""]
+    while rel_dirs:
+        rel_dir = rel_dirs.pop()
+        old_hashes = old_hashes_by_rel_dir.get(rel_dir)
+        new_hashes = new_hashes_by_rel_dir.get(rel_dir)
+        if old_hashes is not None and old_hashes == new_hashes:
+            continue
+        if old_hashes is None or new_hashes is None or old_hashes[1] != new_hashes[1]:
+            changed_rel_dirs.append(rel_dir)
+        rel_dirs.extend(child_rel_dirs_by_rel_dir.get(rel_dir, []))
+    changed_rel_dirs.sort()
+    return changed_rel_dirs
+
+
+def _hash_dirs(leaves_by_rel_dir: dict[str, list[str]]) -> dict[str, DirHashes]:
+    """Hash each directory from its files' leaves and its subdirectories' hashes."""
+    child_rel_dirs_by_rel_dir = _get_child_rel_dirs(leaves_by_rel_dir)
+
+    hashes_by_rel_dir: dict[str, DirHashes] = {}
+    # Deeper directories are hashed first, since their parents' hashes depend on them.
+    all_rel_dirs = {"", *child_rel_dirs_by_rel_dir}
+    for child_rel_dirs in child_rel_dirs_by_rel_dir.values():
+        all_rel_dirs.update(child_rel_dirs)
+    for rel_dir in sorted(all_rel_dirs, key=_get_depth, reverse=True):
+        files_hash = _hash(sorted(leaves_by_rel_dir.get(rel_dir, [])))
+        child_hashes = sorted(
+            f"{child_rel_dir}\0{hashes_by_rel_dir[child_rel_dir][0]}"
+            for child_rel_dir in child_rel_dirs_by_rel_dir.get(rel_dir, [])
+        )
+        hashes_by_rel_dir[rel_dir] = (_hash([files_hash, *child_hashes]), files_hash)
+    return hashes_by_rel_dir
+
+
+def _get_child_rel_dirs(rel_dirs: Iterable[str]) -> dict[str, list[str]]:
+    """Get the subdirectories of each directory, including any intermediate ones."""
+    child_rel_dirs_by_rel_dir: dict[str, list[str]] = {}
+    seen_rel_dirs = {""}
+    for rel_dir in rel_dirs:
+        child_rel_dir = rel_dir
+        while child_rel_dir not in seen_rel_dirs:
+            seen_rel_dirs.add(child_rel_dir)
+            parent_rel_dir = child_rel_dir.rpartition("/")[0]
+            child_rel_dirs_by_rel_dir.setdefault(parent_rel_dir, []).append(
+                child_rel_dir,
+            )
+            child_rel_dir = parent_rel_dir
+    return child_rel_dirs_by_rel_dir
+
+
+def _get_depth(rel_dir: str) -> int:
+    return rel_dir.count("/") + bool(rel_dir)
+
+
+def _hash(parts: Iterable[str]) -> str:
+    return hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
@@ -0,0 +1,117 @@
+"""Utilities for querying git about the files in a project."""
+
+import subprocess
+from pathlib import Path
+
+# The modes of regular files in the git index, rather than symlinks or submodules.
+_FILE_MODES = ("100644", "100755")
+_GITLINK_MODE = "160000"
+
+
+class GitError(RuntimeError):
+    """Raised when git could not be queried."""
+
+
+def get_changed_paths(proj_dir: Path, *, since: str) -> list[Path]:
+    """Get the Python files which have changed since a git revision.
+
+    Changes are taken relative to the merge base of the revision and HEAD, and
+    include uncommitted and untracked files. Deleted files and the old names of renamed
+    files are included too, since their counterparts might need to be re-checked.
+    """
+    toplevel = Path(_run_git("rev-parse", "--show-toplevel", cwd=proj_dir).strip())
+    merge_base = _run_git("merge-base", since, "HEAD", cwd=proj_dir).strip()
+
+    changed = _run_git(
+        "diff",
+        "--name-only",
+        "--no-renames",
+        "-z",
+        merge_base,
+        "--",
+        "*.py",
+        cwd=toplevel,
+    )
+    untracked = _run_git(
+        "ls-files",
+        "--others",
+        "--exclude-standard",
+        "-z",
+        "--",
+        "*.py",
+        cwd=toplevel,
+    )
+
+    rel_posixes = {
+        rel_posix for rel_posix in (changed + untracked).split("\0") if rel_posix
+    }
+    return [toplevel / rel_posix for rel_posix in sorted(rel_posixes)]
+
+
+def get_tracked_paths(root_dir: Path) -> dict[Path, str | None]:
+    """Get the Python files tracked by git in a directory, with their git blob IDs.
+
+    Untracked files which git doesn't ignore are included too, since they are usually
+    new files which are yet to be added. A blob ID is only given for a file whose
+    contents are known to match it, so untracked files and files which have been
+    modified since they were staged have none, and neither do symlinks or files with
+    merge conflicts. Files which have since been deleted are excluded.
+    """
+    staged = _run_git("ls-files", "--stage", "-z", "--", "*.py", cwd=root_dir)
+    modified = _run_git("ls-files", "--modified", "-z", "--", "*.py", cwd=root_dir)
+    untracked = _run_git(
+        "ls-files",
+        "--others",
+        "--exclude-standard",
+        "-z",
+        "--",
+        "*.py",
+        cwd=root_dir,
+    )
+
+    blob_id_by_rel_posix: dict[str, str | None] = {}
+    for entry in staged.split("\0"):
+        if not entry:
+            continue
+        info, rel_posix = entry.split("\t", maxsplit=1)
+        mode, blob_id, stage = info.split(" ")
+        if mode == _GITLINK_MODE:
+            continue
+        is_blob_current = mode in _FILE_MODES and stage == "0"
+        if rel_posix in blob_id_by_rel_posix:
+            # Listed once per stage of a merge conflict.
+            is_blob_current = False
+        blob_id_by_rel_posix[rel_posix] = blob_id if is_blob_current else None
+
+    for rel_posix in modified.split("\0"):
+        if rel_posix in blob_id_by_rel_posix:
+            blob_id_by_rel_posix[rel_posix] = None
+            if not (root_dir / rel_posix).exists():
+                del blob_id_by_rel_posix[rel_posix]
+
+    for rel_posix in untracked.split("\0"):
+        if rel_posix:
+            blob_id_by_rel_posix[rel_posix] = None
+
+    return {
+        root_dir / rel_posix: blob_id
+        for rel_posix, blob_id in blob_id_by_rel_posix.items()
+    }
+
+
+def _run_git(*args: str, cwd: Path) -> str:
+    try:
+        result = subprocess.run(
+            ["git", *args],  # noqa: S603, S607
+            cwd=cwd,
+            capture_output=True,
+            check=True,
+            encoding="utf8",
+        )
+    except FileNotFoundError:
+        msg = "Could not find git, which is needed to determine changed files."
+        raise GitError(msg) from None
+    except subprocess.CalledProcessError as err:
+        msg = f"git {' '.join(args)} failed: {err.stderr.strip()}"
+        raise GitError(msg) from None
+    return result.stdout
@@ -0,0 +1,213 @@
+"""Utilities for reading-in many files, possibly in parallel."""
+
+import os
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+
+from suiteas.core.profile import FileSpan, Profiler
+from suiteas.core.schedule import ScheduledExecutor
+from suiteas.read.cache import FactCache, get_digest
+from suiteas.read.file import (
+    FileFacts,
+    ParseEngine,
+    get_file_facts,
+    get_source_facts,
+    open_source,
+)
+
+# Each batch sent to a worker should be large enough to amortize the overhead of
+# inter-process communication, but small enough to balance the load between workers.
+_BATCHES_PER_WORKER = 4
+_MAX_BATCH_SIZE = 256
+
+# What a worker sends back for each file: its facts, size, mtime and content digest,
+# and the worker's process ID with the times it started and finished with the file.
+_WorkerResult = tuple[FileFacts, int, int, str, tuple[int, int, int]]
+
+
+def get_files_facts(  # noqa: PLR0913
+    paths: Sequence[Path],
+    *,
+    cache: FactCache | None = None,
+    executor: Executor | None = None,
+    parse_engine: ParseEngine = "ast",
+    profiler: Profiler | None = None,
+    blob_ids: Sequence[str | None] | None = None,
+) -> list[FileFacts]:
+    """Read files and extract their facts, in the same order as the given paths.
+
+    Files which are fresh in the cache are never read. When an executor is given, the
+    remaining files are read and parsed by its workers in batches, largest files first
+    so that none is left running alone at the end. A scheduled executor may choose to
+    read them serially instead. Any git blob IDs given for the files are used to look
+    them up in the cache.
+    """
+    if blob_ids is None:
+        blob_ids = [None] * len(paths)
+
+    if executor is None and profiler is None:
+        if cache is None:
+            return [get_file_facts(path, parse_engine=parse_engine) for path in paths]
+        return [
+            cache.get_file_facts(path, parse_engine=parse_engine, blob_id=blob_id)
+            for path, blob_id in zip(paths, blob_ids, strict=True)
+        ]
+
+    facts_list, stat_by_idx = _look_up_cached(
+        paths,
+        cache=cache,
+        parse_engine=parse_engine,
+        blob_ids=blob_ids,
+    )
+    if profiler is not None:
+        profiler.n_cached_files += len(paths) - len(stat_by_idx)
+
+    batches, results_iter = _read_missing(
+        paths,
+        stat_by_idx=stat_by_idx,
+        executor=executor,
+        parse_engine=parse_engine,
+    )
+    for batch, results in zip(batches, results_iter, strict=True):
+        for idx, (facts, size, mtime_ns, digest, span) in zip(
+            batch,
+            results,
+            strict=True,
+        ):
+            facts_list[idx] = facts
+            if profiler is not None:
+                pid, start_ns, end_ns = span
+                profiler.add_file_span(
+                    FileSpan(
+                        path=paths[idx],
+                        n_bytes=size,
+                        start_ns=start_ns,
+                        end_ns=end_ns,
+                        pid=pid,
+                    ),
+                )
+            if cache is not None:
+                cache.put_file_facts(
+                    paths[idx],
+                    size=size,
+                    mtime_ns=mtime_ns,
+                    digest=digest,
+                    facts=facts,
+                    parse_engine=parse_engine,
+                    blob_id=blob_ids[idx],
+                )
+
+    return [_assert_read(facts) for facts in facts_list]
+
+
+def _look_up_cached(
+    paths: Sequence[Path],
+    *,
+    cache: FactCache | None,
+    parse_engine: ParseEngine,
+    blob_ids: Sequence[str | None],
+) -> tuple[list[FileFacts | None], dict[int, os.stat_result | None]]:
+    """Get the facts of files fresh in the cache, and the other files' stat info.
+
+    The stat info is only given for files which were stat'ed to check the cache.
+    """
+    facts_list: list[FileFacts | None] = [None] * len(paths)
+    stat_by_idx: dict[int, os.stat_result | None] = {}
+    for idx, (path, blob_id) in enumerate(zip(paths, blob_ids, strict=True)):
+        stat = None
+        if cache is not None:
+            facts_list[idx], stat = cache.lookup_file_facts(
+                path,
+                parse_engine=parse_engine,
+                blob_id=blob_id,
+            )
+        if facts_list[idx] is None:
+            stat_by_idx[idx] = stat
+    return facts_list, stat_by_idx
+
+
+def _read_missing(
+    paths: Sequence[Path],
+    *,
+    stat_by_idx: dict[int, os.stat_result | None],
+    executor: Executor | None,
+    parse_engine: ParseEngine,
+) -> tuple[list[list[int]], Iterator[list[_WorkerResult]]]:
+    """Read the files missing from the cache, giving their batches and the results.
+
+    Without an executor, the files are read serially in order, and aren't stat'ed
+    beforehand.
+    """
+    read_batch = partial(_read_batch, parse_engine=parse_engine)
+    if executor is None:
+        missing_idxs = list(stat_by_idx)
+        path_strs = [os.fspath(paths[idx]) for idx in missing_idxs]
+        return [missing_idxs], iter([read_batch(path_strs)])
+
+    # A file stat'ed to check its cache entry isn't stat'ed again.
+    size_by_idx = {
+        idx: _get_size(paths[idx]) if stat is None else stat.st_size
+        for idx, stat in stat_by_idx.items()
+    }
+    missing_idxs = sorted(size_by_idx, key=size_by_idx.__getitem__, reverse=True)
+    # Other executors don't say how many workers they have, so assume one per CPU.
+    pool_workers: tuple[Executor, int] | None = (executor, os.cpu_count() or 1)
+    if isinstance(executor, ScheduledExecutor):
+        pool_workers = executor.schedule(
+            n_files=len(missing_idxs),
+            n_bytes=sum(size_by_idx.values()),
+        )
+
+    if pool_workers is None:
+        path_strs = [os.fspath(paths[idx]) for idx in missing_idxs]
+        return [missing_idxs], iter([read_batch(path_strs)])
+
+    pool, n_workers = pool_workers
+    batches = _get_batches(missing_idxs, max_workers=n_workers)
+    return batches, pool.map(
+        read_batch,
+        [[os.fspath(paths[idx]) for idx in batch] for batch in batches],
+    )
+
+
+def _read_batch(
+    path_strs: list[str],
+    *,
+    parse_engine: ParseEngine,
+) -> list[_WorkerResult]:
+    """Read and parse a batch of files in a worker."""
+    return [
+        _read_file(Path(path_str), parse_engine=parse_engine) for path_str in path_strs
+    ]
+
+
+def _read_file(path: Path, *, parse_engine: ParseEngine) -> _WorkerResult:
+    start_ns = time.perf_counter_ns()
+    with open_source(path) as (contents, stat):
+        facts = get_source_facts(contents, path=path, parse_engine=parse_engine)
+        digest = get_digest(contents)
+    span = (os.getpid(), start_ns, time.perf_counter_ns())
+    return facts, stat.st_size, stat.st_mtime_ns, digest, span
+
+
+def _get_size(path: Path) -> int:
+    try:
+        return os.stat(path).st_size  # noqa: PTH116
+    except OSError:
+        # Reading the file will fail too, which is reported then.
+        return 0
+
+
+def _assert_read(facts: FileFacts | None) -> FileFacts:
+    if facts is None:
+        raise AssertionError
+    return facts
+
+
+def _get_batches(idxs: list[int], *, max_workers: int) -> list[list[int]]:
+    n_batches = max_workers * _BATCHES_PER_WORKER
+    batch_size = min(max(1, -(-len(idxs) // n_batches)), _MAX_BATCH_SIZE)
+    return [idxs[i : i + batch_size] for i in range(0, len(idxs), batch_size)]
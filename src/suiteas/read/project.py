@@ -1,78 +1,93 @@
 """Utilities to reading-in a Python project."""
 
+import os
+from collections.abc import Iterator
+from concurrent.futures import Executor
 from pathlib import Path
 
-from suiteas.core.path import path_to_pytest_path, pytest_path_to_path
-from suiteas.domain import Project
+from suiteas.config import ProjConfig
+from suiteas.core.path import PathIndex
+from suiteas.core.profile import Profiler, profile_phase
+from suiteas.core.rules import Fact, get_needed_facts
+from suiteas.domain import Codebase, CompactCodebase, Project
+from suiteas.read.cache import FactCache
 from suiteas.read.codebase import get_codebase
-from suiteas.read.config import get_config
+from suiteas.read.config import get_config, get_file_filter
+from suiteas.read.discover import filter_existing_path_strs
+from suiteas.read.file import ParseEngine
 from suiteas.read.pytest_suite import get_pytest_suite
+from suiteas.read.snapshot import FsSnapshot
 
 
-def get_project(*, proj_dir: Path, included_files: list[Path] | None = None) -> Project:
-    """Get a project from a directory."""
+def get_project(  # noqa: PLR0913
+    *,
+    proj_dir: Path,
+    included_files: list[Path] | None = None,
+    cache: FactCache | None = None,
+    executor: Executor | None = None,
+    config: ProjConfig | None = None,
+    parse_engine: ParseEngine | None = None,
+    profiler: Profiler | None = None,
+    snapshot: FsSnapshot | None = None,
+) -> Project:
+    """Get a project from a directory, using its configuration unless one is given.
+
+    A parse engine overrides the one in the configuration. Only the files holding facts
+    needed by the configured checks are read: the source code is skipped if no check
+    needs it, and so are the pytest files which don't test any source file.
+    Directories are looked up in the snapshot, if one is given.
+    """
     if included_files is None:
         included_files = []
+    if snapshot is None:
+        # Directories are listed at most once while the project is read.
+        snapshot = FsSnapshot()
 
-    config = get_config(proj_dir=proj_dir)
-
-    included_files = [path.resolve() for path in included_files]
-
-    if included_files:
-        included_src_files = [
-            proj_dir / path
-            for path in included_files
-            if any(
-                proj_dir / config.src_rel_path / pkg_name in path.parents
-                for pkg_name in config.pkg_names
-            )
-        ]
-        if config.use_consolidated_tests_dir:
-            included_pytest_files = [
-                proj_dir / path
-                for path in included_files
-                if proj_dir / config.tests_rel_path in path.parents
-            ]
-        else:
-            included_pytest_files = [
-                proj_dir / path
-                for path in included_files
-                if any(
-                    proj_dir
-                    / config.tests_rel_path
-                    / config.unittest_dir_name
-                    / pkg_name
-                    in path.parents
-                    for pkg_name in config.pkg_names
-                )
-            ]
-        included_src_files += [
-            pytest_path_to_path(test_path, proj_config=config, proj_dir=proj_dir)
-            for test_path in included_pytest_files
-        ]
-        included_pytest_files += [
-            path_to_pytest_path(path, proj_config=config, proj_dir=proj_dir)
-            for path in included_src_files
-        ]
-        included_src_files = list(
-            {path for path in included_src_files if path.exists()},
+    if config is None:
+        config = _read_config(
+            proj_dir,
+            cache=cache,
+            profiler=profiler,
+            snapshot=snapshot,
         )
-        included_pytest_files = list(
-            {path for path in included_pytest_files if path.exists()},
+    if parse_engine is not None:
+        config = config.model_copy(update={"parse_engine": parse_engine})
+
+    with profile_phase(profiler, "discovery"):
+        included_src_files, included_pytest_files = get_included_files(
+            included_files,
+            proj_dir=proj_dir,
+            config=config,
+            snapshot=snapshot,
         )
-    else:
-        included_src_files = None
-        included_pytest_files = None
+
+    needed_facts = get_needed_facts(config.checks)
+    if "src_funcs" not in needed_facts:
+        included_src_files = []
 
     codebase = get_codebase(
         proj_dir=proj_dir,
         config=config,
         included_src_files=included_src_files,
+        cache=cache,
+        executor=executor,
+        profiler=profiler,
+        snapshot=snapshot,
     )
     pytest_suite = get_pytest_suite(
         proj_dir=proj_dir,
         config=config,
         included_pytest_files=included_pytest_files,
+        needed_pytest_files=_get_needed_pytest_files(
+            needed_facts,
+            codebase=codebase,
+            proj_dir=proj_dir,
+            config=config,
+        ),
+        cache=cache,
+        executor=executor,
+        profiler=profiler,
+        snapshot=snapshot,
     )
 
     project = Project(
@@ -82,3 +97,109 @@ def get_project(*, proj_dir: Path, included_files: list[Path] | None = None) ->
         proj_dir=proj_dir,
     )
     return project
+
+
+def _read_config(
+    proj_dir: Path,
+    *,
+    cache: FactCache | None,
+    profiler: Profiler | None,
+    snapshot: FsSnapshot | None = None,
+) -> ProjConfig:
+    with profile_phase(profiler, "config"):
+        if cache is None:
+            return get_config(proj_dir=proj_dir, snapshot=snapshot)
+        return cache.get_config(proj_dir)
+
+
+def _get_needed_pytest_files(
+    needed_facts: frozenset[Fact],
+    *,
+    codebase: Codebase | CompactCodebase,
+    proj_dir: Path,
+    config: ProjConfig,
+) -> set[Path] | None:
+    """Get the pytest files holding needed facts, or None if they all might."""
+    if "pytest_classes" in needed_facts:
+        return None
+    if not needed_facts & {"partner_pytest_classes", "partner_pytest_imports"}:
+        return set()
+
+    path_index = PathIndex(proj_config=config, proj_dir=proj_dir)
+    return {
+        Path(path_index.to_pytest_path_str(path_str))
+        for path_str in _iter_path_strs_with_public_funcs(codebase)
+    }
+
+
+def _iter_path_strs_with_public_funcs(
+    codebase: Codebase | CompactCodebase,
+) -> Iterator[str]:
+    """Get the paths of the source files with public functions, which need tests."""
+    if isinstance(codebase, Codebase):
+        for file in codebase.files:
+            if not all(func.is_underscored for func in file.funcs):
+                yield os.fspath(file.path)
+        return
+
+    strings = codebase.strings
+    for file_idx, path_id in enumerate(codebase.file_path_ids):
+        func_rows = range(*codebase.func_starts[file_idx : file_idx + 2])
+        if not all(
+            strings[codebase.func_name_ids[row]].startswith("_") for row in func_rows
+        ):
+            yield strings[path_id]
+
+
+def get_included_files(
+    included_files: list[Path],
+    *,
+    proj_dir: Path,
+    config: ProjConfig,
+    snapshot: FsSnapshot | None = None,
+) -> tuple[list[Path] | None, list[Path] | None]:
+    """Get the source and pytest files to read, along with their counterparts.
+
+    If no files are included, then every file is to be read, which is given as None.
+    """
+    if not included_files:
+        return None, None
+
+    path_index = PathIndex(proj_config=config, proj_dir=proj_dir)
+    cwd_str = os.getcwd()  # noqa: PTH109
+    # Dictionaries are used as ordered sets.
+    src_path_strs: dict[str, None] = {}
+    pytest_path_strs: dict[str, None] = {}
+    for path in included_files:
+        path_str = os.path.normpath(os.path.join(cwd_str, path))  # noqa: PTH118
+        is_src_path, is_pytest_path = path_index.classify(path_str)
+        if not (is_src_path or is_pytest_path):
+            # The path might only be within the project once symlinks are resolved.
+            path_str = os.fspath(path.resolve())
+            is_src_path, is_pytest_path = path_index.classify(path_str)
+
+        if is_src_path:
+            src_path_strs[path_str] = None
+        if is_pytest_path:
+            pytest_path_strs[path_str] = None
+
+    for pytest_path_str in list(pytest_path_strs):
+        src_path_strs[path_index.to_path_str(pytest_path_str)] = None
+    for path_str in src_path_strs:
+        pytest_path_strs[path_index.to_pytest_path_str(path_str)] = None
+
+    existing_src_path_strs = filter_existing_path_strs(src_path_strs, snapshot=snapshot)
+    existing_pytest_path_strs = filter_existing_path_strs(
+        pytest_path_strs,
+        snapshot=snapshot,
+    )
+    file_filter = get_file_filter(config, proj_dir=proj_dir)
+    if file_filter is not None:
+        existing_src_path_strs = file_filter.filter_path_strs(existing_src_path_strs)
+        existing_pytest_path_strs = file_filter.filter_path_strs(
+            existing_pytest_path_strs,
+        )
+    return (
+        [Path(path_str) for path_str in existing_src_path_strs],
+        [Path(path_str) for path_str in existing_pytest_path_strs],
+    )
@@ -3,13 +3,23 @@
 from pathlib import Path
 
 from suiteas.core.names import PYTEST_CLASS_PREFIX
-from suiteas.domain import Class, PytestClass, PytestFile
+from suiteas.domain import Class, File, PytestClass, PytestFile
+from suiteas.read.cache import FactCache
 from suiteas.read.file import get_file
 
 
-def get_pytest_file(path: Path, *, module_name: str) -> PytestFile:
+def get_pytest_file(
+    path: Path,
+    *,
+    module_name: str,
+    cache: FactCache | None = None,
+) -> PytestFile:
     """Read a pytest test file."""
-    file = get_file(path, module_name=module_name)
+    file = get_file(path, module_name=module_name, cache=cache)
+    return _pytest_file_from_file(file)
+
+
+def _pytest_file_from_file(file: File) -> PytestFile:
     pytest_classes = [
         PytestClass(
             name=cls.name,
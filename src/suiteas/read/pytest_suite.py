@@ -1,34 +1,112 @@
 """Utilities for reading-in a pytest test suite."""
 
+from collections.abc import Collection, Mapping, Sequence
+from concurrent.futures import Executor
 from pathlib import Path
 
 from suiteas.config import ProjConfig
+from suiteas.core.profile import Profiler, profile_phase
 from suiteas.domain import PytestSuite
-from suiteas.read.codebase import _get_module_name
-from suiteas.read.pytest_file import get_pytest_file
+from suiteas.read.cache import FactCache
+from suiteas.read.codebase import get_module_name
+from suiteas.read.config import get_file_filter
+from suiteas.read.discover import discover_py_files, sort_paths
+from suiteas.read.file import file_from_facts
+from suiteas.read.parallel import get_files_facts
+from suiteas.read.pytest_file import _pytest_file_from_file
+from suiteas.read.snapshot import FsSnapshot
 
 
-def get_pytest_suite(
+def get_pytest_suite(  # noqa: PLR0913
     *,
     proj_dir: Path,
     config: ProjConfig,
     included_pytest_files: list[Path] | None,
+    needed_pytest_files: Collection[Path] | None = None,
+    blob_id_by_path: Mapping[Path, str | None] | None = None,
+    cache: FactCache | None = None,
+    executor: Executor | None = None,
+    profiler: Profiler | None = None,
+    snapshot: FsSnapshot | None = None,
 ) -> PytestSuite:
-    """Read the pytest unit test suite for a project."""
+    """Read the pytest unit test suite for a project.
+
+    If the needed pytest files are given, then any other pytest files are left out of
+    the suite without being read. Any git blob IDs given for the included files are
+    used to look them up in the cache. Directories are looked up in the snapshot, if
+    one is given.
+    """
     unit_dir = proj_dir / config.tests_rel_path / config.unittest_dir_name
 
-    if not unit_dir.exists():
+    if snapshot is None:
+        snapshot = FsSnapshot()
+    if not snapshot.exists(unit_dir):
         msg = f"Could not find {unit_dir}"
         raise FileNotFoundError(msg)
 
-    if included_pytest_files is None:
-        included_pytest_files = list(unit_dir.glob("**/*.py"))
-    pytest_files = [
-        get_pytest_file(
-            path,
-            module_name=_get_module_name(path=path, root_dir=unit_dir),
+    with profile_phase(profiler, "discovery"):
+        paths: list[Path]
+        blob_ids: Sequence[str | None] | None
+        if needed_pytest_files is not None and not needed_pytest_files:
+            paths, blob_ids = [], None
+        elif included_pytest_files is None:
+            paths, blob_ids = discover_py_files(
+                unit_dir,
+                exclude_dirs=config.exclude_dirs,
+                file_filter=get_file_filter(config, proj_dir=proj_dir),
+                file_source=config.file_source,
+                snapshot=snapshot,
+            )
+        else:
+            paths = sort_paths(included_pytest_files)
+            blob_ids = (
+                None
+                if blob_id_by_path is None
+                else [blob_id_by_path.get(path) for path in paths]
+            )
+
+        if needed_pytest_files is not None:
+            paths, blob_ids = _keep_needed_paths(
+                paths,
+                blob_ids=blob_ids,
+                needed_paths=needed_pytest_files,
+            )
+
+    with profile_phase(profiler, "parsing"):
+        facts_list = get_files_facts(
+            paths,
+            cache=cache,
+            executor=executor,
+            parse_engine=config.parse_engine,
+            profiler=profiler,
+            blob_ids=blob_ids,
         )
-        for path in sorted(included_pytest_files)
-    ]
+        pytest_files = [
+            _pytest_file_from_file(
+                file_from_facts(
+                    path,
+                    facts,
+                    module_name=get_module_name(path=path, root_dir=unit_dir),
+                ),
+            )
+            for path, facts in zip(paths, facts_list, strict=True)
+        ]
 
     return PytestSuite(pytest_files=pytest_files)
+
+
+def _keep_needed_paths(
+    paths: list[Path],
+    *,
+    blob_ids: Sequence[str | None] | None,
+    needed_paths: Collection[Path],
+) -> tuple[list[Path], list[str | None] | None]:
+    if blob_ids is None:
+        return [path for path in paths if path in needed_paths], None
+
+    kept_pairs = [
+        (path, blob_id)
+        for path, blob_id in zip(paths, blob_ids, strict=True)
+        if path in needed_paths
+    ]
+    return [path for path, _ in kept_pairs], [blob_id for _, blob_id in kept_pairs]
@@ -0,0 +1,468 @@
+"""Utilities for quickly scanning source code for facts, without a full parse.
+
+Building an abstract syntax tree includes parsing the body of every function, but the
+facts of a file only depend on the top-level statements (and those nested in
+flow-control blocks). The scanner here only tokenizes source code as much as is needed
+to find the logical lines and their indentation, and skips over the rest.
+"""
+
+import functools
+import re
+import unicodedata
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from suiteas.read.file import ClassFacts, FuncFacts
+
+
+class AmbiguousSourceError(ValueError):
+    """Raised when the scanner can't be sure of the facts of some source code.
+
+    This happens for unusual or invalid source code, which should be parsed properly
+    instead.
+    """
+
+
+# The kinds of block which the lines of a file can belong to.
+_COLLECT = 0  # The module, or the body of a flow-control block within it.
+_CLASS = 1  # The body of a class whose methods are to be found.
+_SKIP = 2  # Anything else, e.g. a function body.
+
+_INDENT_RE = re.compile(r"[ \t]*")
+_TOKEN_RE = re.compile(
+    r"""
+    ([(\[{])
+    |([)\]}])
+    |(\n)
+    |((?:(?<!\w)[rRbBuUfFtT]{1,2})?)('''|\"\"\"|'|")
+    |(:(?!=))
+    |(;)
+    |(\#[^\n]*)
+    |(\\\n)
+    |((?<!\w)lambda(?!\w))
+    """,
+    re.VERBOSE,
+)
+(
+    _OPEN,
+    _CLOSE,
+    _NEWLINE,
+    _PREFIX,
+    _QUOTE,
+    _COLON,
+    _SEMICOLON,
+    _COMMENT,
+    _CONTINUATION,
+    _LAMBDA,
+) = range(1, 11)
+_STRING_END_RE_BY_QUOTE = {
+    "'": re.compile(r"[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'"),
+    '"': re.compile(r'[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"'),
+    "'''": re.compile(r"[^'\\]*(?:(?:\\[\s\S]|'(?!''))[^'\\]*)*'''"),
+    '"""': re.compile(r'[^"\\]*(?:(?:\\[\s\S]|"(?!""))[^"\\]*)*"""'),
+}
+_FORMATTED_PREFIXES = frozenset({"f", "rf", "fr", "t", "rt", "tr"})
+_BRACE_RE = re.compile(r"[{}]")
+
+_KEYWORD_RE = re.compile(
+    r"(?:async[ \t]+(?=def|for|with))?"
+    r"(def|class|if|for|while|with|try|import|from"
+    r"|else|elif|except|finally|match|case)\b",
+)
+_FLOW_CTRL_KEYWORDS = frozenset({"if", "for", "while", "with", "try"})
+_OTHER_COMPOUND_KEYWORDS = frozenset(
+    {"else", "elif", "except", "finally", "match", "case"},
+)
+_SOFT_KEYWORDS = frozenset({"match", "case"})
+_NAME_RE_BY_KEYWORD = {
+    "def": re.compile(r"(?:async[ \t]+)?def[ \t]+(\w+)[ \t]*[(\[]"),
+    "class": re.compile(r"class[ \t]+(\w+)[ \t]*[(\[:]"),
+}
+_BLANK_RE = re.compile(r"[ \t]*(?:#[^\n]*)?")
+
+# Patterns to consume whole logical lines in one go, as long as they only contain
+# unremarkable code: strings whose formatted replacement fields are simple, and
+# brackets which aren't nested too deeply. Anything else is left to the tokenizer.
+_LINE_CHAR = r"""[^'"#\\\n()\[\]{}]"""
+_BRACKETED_CHAR = r"""[^'"#\\()\[\]{}]"""
+_REPLACEMENT_FIELD = r"""\{\{|\}\}|\{[^{}'"\\\n]*\}"""
+
+
+def _get_string_pattern(*, is_formatted: bool) -> str:
+    # Formatted strings mustn't follow the prefix of a formatted string, and vice versa.
+    prefix_check = (
+        r"(?:(?<=[fFtT])|(?<=[fFtT][rR]))"
+        if is_formatted
+        else r"(?<![fFtT])(?<![fFtT][rR])"
+    )
+    braces = "{}" if is_formatted else ""
+    field = f"|{_REPLACEMENT_FIELD}" if is_formatted else ""
+    quote_patterns: list[str] = []
+    for quote in ("'", '"'):
+        triple_char = rf"[^{quote}\\{braces}]"
+        quote_patterns.append(
+            rf"{quote * 3}{triple_char}*"
+            rf"(?:(?:\\[\s\S]|{quote}(?!{quote * 2}){field}){triple_char}*)*"
+            rf"{quote * 3}",
+        )
+    for quote in ("'", '"'):
+        single_char = rf"[^{quote}\\\n{braces}]"
+        quote_patterns.append(
+            rf"{quote}{single_char}*(?:(?:\\[\s\S]{field}){single_char}*)*{quote}",
+        )
+    return rf"{prefix_check}(?:{'|'.join(quote_patterns)})"
+
+
+_STRING = (
+    rf"(?:{_get_string_pattern(is_formatted=False)}"
+    rf"|{_get_string_pattern(is_formatted=True)})"
+)
+# Comments must run to the end of the line, so they can't be partially backtracked.
+_LINE_COMMENT = r"#[^\n]*(?![^\n])"
+_MAX_FAST_BRACKET_DEPTH = 3
+
+
+def _get_bracketed_pattern(depth: int) -> str:
+    nested = f"|{_get_bracketed_pattern(depth - 1)}" if depth > 1 else ""
+    return (
+        rf"[(\[{{]{_BRACKETED_CHAR}*"
+        rf"(?:(?:{_STRING}|{_LINE_COMMENT}{nested}){_BRACKETED_CHAR}*)*[)\]}}]"
+    )
+
+
+_LINE_CONTENT = (
+    rf"{_LINE_CHAR}*"
+    rf"(?:(?:{_STRING}|{_get_bracketed_pattern(_MAX_FAST_BRACKET_DEPTH)})"
+    rf"{_LINE_CHAR}*)*"
+    rf"(?:{_LINE_COMMENT})?"
+)
+_LINE_RE = re.compile(rf"{_LINE_CONTENT}(?:\n|\Z)")
+_BLANK_LINE = r"[ \t]*(?:#[^\n]*)?\n"
+
+_COMMENT_RE = re.compile(r"#[^\n]*")
+_DOTTED_NAME = r"\w+(?:\s*\.\s*\w+)*"
+_IMPORT_RE = re.compile(r"\s*import\s+(.*)", re.DOTALL)
+_FROM_IMPORT_RE = re.compile(
+    rf"\s*from\b[\s.]*?({_DOTTED_NAME})??\s*\bimport\b(.*)",
+    re.DOTALL,
+)
+_ALIAS_RE_BY_DOTTED = {
+    True: re.compile(rf"\s*({_DOTTED_NAME})(?:\s+as\s+\w+)?\s*"),
+    False: re.compile(r"\s*(\w+|\*)(?:\s+as\s+\w+)?\s*"),
+}
+
+
+def scan_source(  # noqa: C901, PLR0912, PLR0915
+    source: str,
+) -> tuple[list["FuncFacts"], list["ClassFacts"], list[str]]:
+    """Get the facts of a file from its source code, without building a syntax tree.
+
+    For valid source code, the facts are the same as those extracted from its syntax
+    tree. Invalid source code is not necessarily detected.
+
+    Raises:
+        AmbiguousSourceError: If the source code can't be scanned reliably.
+    """
+    if "\r" in source:
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+    if "\0" in source or source.startswith("\ufeff"):
+        raise AmbiguousSourceError
+
+    funcs: list[FuncFacts] = []
+    clses: list[tuple[str, int, int]] = []
+    has_funcs_by_cls: list[bool] = []
+    imported_objs: list[str] = []
+
+    # The stack of enclosing blocks: their indentation, kind and (for classes) index.
+    indents = [""]
+    kinds = [_COLLECT]
+    cls_idxs = [-1]
+    # The block opened by the previous logical line, if any.
+    pending_kind: int | None = None
+    pending_cls_idx = -1
+
+    pos = 0
+    line_num = 1
+    while True:
+        start = _INDENT_RE.match(source, pos).end()  # type: ignore[union-attr]
+        char = source[start : start + 1]
+        if char == "\n":
+            pos = start + 1
+            line_num += 1
+            continue
+        if char == "#":
+            pos = source.find("\n", start) + 1
+            if not pos:
+                break
+            line_num += 1
+            continue
+        if not char:
+            break
+        if char in "\f\\":
+            raise AmbiguousSourceError
+
+        indent = source[pos:start]
+        if pending_kind is not None:
+            if len(indent) <= len(indents[-1]) or not indent.startswith(indents[-1]):
+                # The block is missing its indented body.
+                raise AmbiguousSourceError
+            indents.append(indent)
+            kinds.append(pending_kind)
+            cls_idxs.append(pending_cls_idx)
+            pending_kind = None
+        else:
+            while indent != indents[-1]:
+                if kinds[-1] == _SKIP and indent.startswith(indents[-1]):
+                    break
+                if len(indent) >= len(indents[-1]) or len(indents) == 1:
+                    # An unexpected or inconsistent indent.
+                    raise AmbiguousSourceError
+                indents.pop()
+                kinds.pop()
+                cls_idxs.pop()
+
+        kind = kinds[-1]
+        if kind == _SKIP:
+            skip_end = _get_skip_re(indents[-1]).match(source, pos).end()  # type: ignore[union-attr]
+            if skip_end == pos:
+                skip_end = _find_line_end(source, start)[0] + 1
+            line_num += source.count("\n", pos, skip_end)
+            pos = skip_end
+            continue
+
+        match = _KEYWORD_RE.match(source, start)
+        keyword = None if match is None else match.group(1)
+        if keyword is None:
+            line_match = _LINE_RE.match(source, start)
+            if line_match is not None and (
+                kind == _CLASS or source.find(";", start, line_match.end()) < 0
+            ):
+                # A simple statement, which can't import anything.
+                line_num += source.count("\n", start, line_match.end())
+                pos = line_match.end()
+                continue
+
+        end, n_newlines, colon_idxs, semicolon_idxs = _find_line_end(source, start)
+        stmt_line_num = line_num
+        pos = end + 1
+        line_num += n_newlines
+
+        if keyword is None or keyword in ("import", "from"):
+            if colon_idxs and _BLANK_RE.fullmatch(source, colon_idxs[-1] + 1, end):
+                # An unrecognized compound statement.
+                raise AmbiguousSourceError
+            if kind == _COLLECT and (keyword is not None or semicolon_idxs):
+                _add_imported_objs(
+                    imported_objs,
+                    source=source,
+                    start=start,
+                    end=end,
+                    semicolon_idxs=semicolon_idxs,
+                )
+            continue
+
+        if not colon_idxs:
+            if keyword in _SOFT_KEYWORDS:
+                # e.g. an assignment to a variable named "match".
+                continue
+            raise AmbiguousSourceError
+        colon_idx = colon_idxs[0]
+        has_block = _BLANK_RE.fullmatch(source, colon_idx + 1, end) is not None
+
+        if keyword in ("def", "class"):
+            name_match = _NAME_RE_BY_KEYWORD[keyword].match(source, start)
+            if name_match is None:
+                raise AmbiguousSourceError
+            name = _normalize_name(name_match.group(1))
+
+        body_kind = _SKIP
+        if kind == _COLLECT and keyword == "def":
+            funcs.append((name, stmt_line_num, len(indent)))
+        elif kind == _COLLECT and keyword == "class":
+            clses.append((name, stmt_line_num, len(indent)))
+            has_funcs_by_cls.append(False)
+            body_kind = _CLASS
+            pending_cls_idx = len(clses) - 1
+        elif kind == _CLASS and keyword == "def":
+            has_funcs_by_cls[cls_idxs[-1]] = True
+        elif kind == _COLLECT and keyword in _FLOW_CTRL_KEYWORDS:
+            body_kind = _COLLECT
+            if not has_block:
+                _add_imported_objs(
+                    imported_objs,
+                    source=source,
+                    start=colon_idx + 1,
+                    end=end,
+                    semicolon_idxs=semicolon_idxs,
+                )
+
+        if has_block:
+            pending_kind = body_kind
+
+    return (
+        funcs,
+        [
+            (name, line_num, char_offset, has_funcs)
+            for (name, line_num, char_offset), has_funcs in zip(
+                clses,
+                has_funcs_by_cls,
+                strict=True,
+            )
+        ],
+        imported_objs,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _get_skip_re(indent: str) -> re.Pattern[str]:
+    """Get a pattern for the lines of a block with the given indentation."""
+    return re.compile(rf"(?:{re.escape(indent)}{_LINE_CONTENT}\n|{_BLANK_LINE})*")
+
+
+def _find_line_end(  # noqa: C901, PLR0912
+    source: str,
+    pos: int,
+) -> tuple[int, int, list[int], list[int]]:
+    """Find the end of the logical line starting at a position.
+
+    Gives the index of the newline which ends the line (or the length of the source),
+    the number of newlines up to and including it, and the indices of any colons and
+    semicolons which aren't nested in brackets.
+    """
+    depth = 0
+    n_newlines = 0
+    n_lambdas = 0
+    colon_idxs: list[int] = []
+    semicolon_idxs: list[int] = []
+    search = _TOKEN_RE.search
+    while True:
+        match = search(source, pos)
+        if match is None:
+            if depth:
+                raise AmbiguousSourceError
+            return len(source), n_newlines, colon_idxs, semicolon_idxs
+
+        token_kind = match.lastindex
+        pos = match.end()
+        if token_kind == _NEWLINE:
+            n_newlines += 1
+            if not depth:
+                return pos - 1, n_newlines, colon_idxs, semicolon_idxs
+        elif token_kind == _QUOTE:
+            end_match = _STRING_END_RE_BY_QUOTE[match.group(_QUOTE)].match(source, pos)
+            if end_match is None:
+                raise AmbiguousSourceError
+            end = end_match.end()
+            if match.group(_PREFIX).lower() in _FORMATTED_PREFIXES:
+                _check_replacement_fields(source, pos, end)
+            n_newlines += source.count("\n", pos, end)
+            pos = end
+        elif token_kind == _OPEN:
+            depth += 1
+        elif token_kind == _CLOSE:
+            depth -= 1
+            if depth < 0:
+                raise AmbiguousSourceError
+        elif token_kind == _COLON:
+            if depth:
+                pass
+            elif n_lambdas:
+                # The colon belongs to a lambda, rather than to the statement.
+                n_lambdas -= 1
+            else:
+                colon_idxs.append(pos - 1)
+        elif token_kind == _SEMICOLON:
+            if not depth:
+                semicolon_idxs.append(pos - 1)
+        elif token_kind == _CONTINUATION:
+            n_newlines += 1
+        elif token_kind == _LAMBDA and not depth:
+            n_lambdas += 1
+
+
+def _check_replacement_fields(source: str, pos: int, end: int) -> None:
+    """Check that the braces of a formatted string are balanced.
+
+    Since Python 3.12, the replacement fields of a formatted string can contain
+    strings with the same quotes, which would end the string early when scanning.
+    """
+    depth = 0
+    search = _BRACE_RE.search
+    while True:
+        match = search(source, pos, end)
+        if match is None:
+            break
+        brace = match.group()
+        pos = match.end()
+        if depth:
+            depth += 1 if brace == "{" else -1
+        elif source.startswith(brace, pos):
+            # An escaped brace.
+            pos += 1
+        elif brace == "{":
+            depth = 1
+        else:
+            raise AmbiguousSourceError
+    if depth:
+        raise AmbiguousSourceError
+
+
+def _add_imported_objs(
+    imported_objs: list[str],
+    *,
+    source: str,
+    start: int,
+    end: int,
+    semicolon_idxs: list[int],
+) -> None:
+    """Add the objects imported by the simple statements between two indices."""
+    stmt_starts = [start] + [idx + 1 for idx in semicolon_idxs if start < idx < end]
+    stmt_ends = [idx for idx in semicolon_idxs if start < idx < end] + [end]
+    for stmt_start, stmt_end in zip(stmt_starts, stmt_ends, strict=True):
+        stmt = source[stmt_start:stmt_end].lstrip()
+        if stmt.startswith(("import", "from")):
+            imported_objs.extend(_get_imported_objs(stmt))
+
+
+def _get_imported_objs(stmt: str) -> list[str]:
+    """Get the objects imported by a statement, which might not be an import."""
+    stmt = _COMMENT_RE.sub("", stmt).replace("\\\n", " ")
+
+    import_match = _IMPORT_RE.fullmatch(stmt)
+    if import_match is not None:
+        return _get_alias_names(import_match.group(1), is_dotted=True)
+
+    from_import_match = _FROM_IMPORT_RE.fullmatch(stmt)
+    if from_import_match is not None:
+        module_name, names = from_import_match.groups()
+        module_name = "None" if module_name is None else _normalize_name(module_name)
+        names = names.strip()
+        if names.startswith("(") and names.endswith(")"):
+            names = names[1:-1].strip().removesuffix(",")
+        return [
+            f"{module_name}.{name}" for name in _get_alias_names(names, is_dotted=False)
+        ]
+
+    if re.match(r"(?:import|from)\b", stmt):
+        raise AmbiguousSourceError
+    # e.g. an assignment to a variable named "imports".
+    return []
+
+
+def _get_alias_names(names: str, *, is_dotted: bool) -> list[str]:
+    alias_re = _ALIAS_RE_BY_DOTTED[is_dotted]
+    alias_names: list[str] = []
+    for name in names.split(","):
+        alias_match = alias_re.fullmatch(name)
+        if alias_match is None:
+            raise AmbiguousSourceError
+        alias_names.append(_normalize_name(alias_match.group(1)))
+    return alias_names
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize a (dotted) name as the Python parser does."""
+    name = "".join(name.split())
+    if not name.isascii():
+        name = unicodedata.normalize("NFKC", name)
+    return name
@@ -0,0 +1,65 @@
+"""Utilities for looking up the filesystem at most once per directory during a run.
+
+Checking whether many paths exist costs a system call each, which is slow on network
+and overlay filesystems. Instead, each directory is listed the first time anything in
+it is needed, and the listing answers every later question about it. A snapshot should
+only be kept for a single run, since it doesn't see any later changes.
+"""
+
+import os
+from pathlib import Path
+
+
+class FsSnapshot:
+    """The entries of the directories looked up during a run, each listed once."""
+
+    def __init__(self) -> None:
+        """Start with nothing listed."""
+        # Directories which couldn't be listed are stored as None.
+        self._entries_by_dir_str: dict[str, list[os.DirEntry[str]] | None] = {}
+        self._names_by_dir_str: dict[str, frozenset[str]] = {}
+
+    def scandir(self, dir_path: str | Path) -> list[os.DirEntry[str]]:
+        """Get the entries of a directory, like os.scandir.
+
+        The entries keep any information they've cached, such as whether they're
+        directories, so they can be shared between everything which needs them.
+        """
+        dir_str = os.fspath(dir_path)
+        try:
+            entries = self._entries_by_dir_str[dir_str]
+        except KeyError:
+            try:
+                with os.scandir(dir_str) as entries_iter:
+                    entries = list(entries_iter)
+            except OSError:
+                entries = None
+            self._entries_by_dir_str[dir_str] = entries
+
+        if entries is None:
+            msg = f"Could not list {dir_str}"
+            raise FileNotFoundError(msg)
+        return entries
+
+    def exists(self, path: str | Path) -> bool:
+        """Check whether a path exists, by listing its parent directory.
+
+        Unlike os.path.exists, a broken symlink is taken to exist, since it has an entry
+        in its directory.
+        """
+        path_str = os.path.normpath(path)
+        dir_str, name = os.path.split(path_str)
+        if name in ("", os.curdir, os.pardir):
+            # e.g. the root directory, which has no parent to list.
+            return os.path.exists(path_str)  # noqa: PTH110
+
+        dir_str = dir_str or os.curdir
+        names = self._names_by_dir_str.get(dir_str)
+        if names is None:
+            try:
+                entries = self.scandir(dir_str)
+            except FileNotFoundError:
+                entries = []
+            names = frozenset(os.path.normcase(entry.name) for entry in entries)
+            self._names_by_dir_str[dir_str] = names
+        return os.path.normcase(name) in names
@@ -0,0 +1,50 @@
+"""Utilities for measuring how long suiteas takes to start."""
+import os
+import subprocess
+import sys
+
+# suiteas runs as a pre-commit hook on every commit, so it must start quickly.
+IMPORT_TIME_BUDGET_US = 50_000
+
+# Modules which are slow to import, and aren't needed until files are read.
+HEAVY_MODULES = (
+    "pydantic",
+    "tomli",
+    "sqlite3",
+    "concurrent.futures",
+    "suiteas.read.scan",
+)
+
+
+def get_import_times(module: str) -> tuple[int, dict[str, int]]:
+    """Get the time in microseconds to import a module in a fresh process.
+
+    Along with the total time, gives the cumulative time of each module imported along
+    the way. Modules imported when the interpreter starts up are excluded.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],  # noqa: S603
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+
+    # Imports are listed after the imports they cause, with nested imports indented.
+    # Importing the module imports its parent packages first, which might import the
+    # module themselves, so the unindented imports at the end are all attributable to
+    # the module.
+    total_import_time = 0
+    import_time_by_module: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not cumulative.strip().isdigit():
+            continue  # The header.
+        import_time_by_module[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            if f"{module}.".startswith(f"{name.strip()}."):
+                total_import_time += int(cumulative)
+            else:
+                total_import_time = 0
+                import_time_by_module.clear()
+    return total_import_time, import_time_by_module
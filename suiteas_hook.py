@@ -1,6 +1,9 @@
 """A stub script to handle relative paths in pre-commit."""
+import runpy
 import sys
 
-sys.path.append("src")
-
-from suiteas import __main__  # noqa: F401
+# Worker processes which aren't forked import this script afresh, so it only runs
+# suiteas when it is the script being run.
+if __name__ == "__main__":
+    sys.path.append("src")
+    runpy.run_module("suiteas", run_name="__main__")
@@ -1,4 +1,4 @@
 """Pytest fixture definitions."""
 
 collect_ignore_glob = ["assets/**"]
-pytest_plugins = ["tests.fixtures.paths"]
+pytest_plugins = ["tests.fixtures.paths", "tests.fixtures.syscalls"]
@@ -0,0 +1,26 @@
+"""Fixtures for counting the system calls made through the os module."""
+import os
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+COUNTED_OS_FUNC_NAMES = ["open", "read", "fstat", "stat", "lstat", "scandir", "listdir"]
+
+
+@pytest.fixture()
+def os_calls(monkeypatch: pytest.MonkeyPatch) -> Counter[str]:
+    """Fixture counting the calls to file-related os functions, by name."""
+    counter: Counter[str] = Counter()
+
+    def _counted(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def _func(*args: Any, **kwargs: Any) -> Any:
+            counter[name] += 1
+            return func(*args, **kwargs)
+
+        return _func
+
+    for name in COUNTED_OS_FUNC_NAMES:
+        monkeypatch.setattr(os, name, _counted(name, getattr(os, name)))
+    return counter
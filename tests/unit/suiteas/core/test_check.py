@@ -1,6 +1,108 @@
+from pathlib import Path
+
+from suiteas.config import ProjConfig
 from suiteas.core.check import get_violations
+from suiteas.domain import (
+    Codebase,
+    CompactCodebase,
+    File,
+    Func,
+    Project,
+    PytestClass,
+    PytestFile,
+    PytestSuite,
+)
+from suiteas.read.project import get_project
+
+
+def _get_project(
+    *,
+    func_names: list[str],
+    pytest_class_names: list[str],
+    imported_objs: list[str],
+) -> Project:
+    proj_dir = Path("proj")
+    return Project(
+        codebase=Codebase(
+            files=[
+                File(
+                    path=proj_dir / "src" / "pkg" / "mod.py",
+                    funcs=[
+                        Func(
+                            name=name,
+                            full_name=f"pkg.mod.{name}",
+                            line_num=idx + 1,
+                            char_offset=0,
+                        )
+                        for idx, name in enumerate(func_names)
+                    ],
+                    clses=[],
+                    imported_objs=[],
+                ),
+            ],
+        ),
+        pytest_suite=PytestSuite(
+            pytest_files=[
+                PytestFile(
+                    path=proj_dir / "tests" / "unit" / "pkg" / "test_mod.py",
+                    pytest_classes=[
+                        PytestClass(name=name, has_funcs=True)
+                        for name in pytest_class_names
+                    ],
+                    imported_objs=imported_objs,
+                ),
+            ],
+        ),
+        config=ProjConfig(pkg_names=["pkg"]),
+        proj_dir=proj_dir,
+    )
 
 
 class TestGetViolations:
     def test_nothing(self) -> None:
         _ = get_violations
+
+    def test_matches_case_conventions(self) -> None:
+        project = _get_project(
+            func_names=["foo_bar", "get_url2", "untested"],
+            pytest_class_names=["TestFooBar", "TestGetURL2"],
+            imported_objs=["pkg.mod.foo_bar", "pkg.mod.get_url2", "pkg.mod.untested"],
+        )
+
+        violations = get_violations(project)
+
+        assert [(v.rule.rule_code, v.line_num) for v in violations] == [("SUI001", 3)]
+
+    def test_lazy(self) -> None:
+        project = _get_project(
+            func_names=["foo", "bar"],
+            pytest_class_names=[],
+            imported_objs=[],
+        )
+
+        violations = get_violations(project)
+
+        assert next(violations).line_num == 1
+
+    def test_unimported(self) -> None:
+        project = _get_project(
+            func_names=["foo", "bar"],
+            pytest_class_names=["TestFoo", "TestBar"],
+            imported_objs=["pkg.mod.foo", "pkg.other.bar"],
+        )
+
+        violations = get_violations(project)
+
+        assert [(v.rule.rule_code, v.line_num) for v in violations] == [("SUI003", 2)]
+
+    def test_compact(self, projs_parent_dir: Path) -> None:
+        for proj_name in ("two_files", "one_func_no_test"):
+            project = get_project(proj_dir=projs_parent_dir / proj_name)
+            compact_project = get_project(
+                proj_dir=projs_parent_dir / proj_name,
+                config=project.config.model_copy(update={"codebase_store": "compact"}),
+            )
+            assert isinstance(compact_project.codebase, CompactCodebase)
+            assert list(get_violations(compact_project)) == list(
+                get_violations(project),
+            )
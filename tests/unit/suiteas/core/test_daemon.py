@@ -0,0 +1,191 @@
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from suiteas.core.check import get_violations
+from suiteas.core.daemon import (
+    DaemonError,
+    get_socket_path,
+    request_check,
+    request_stop,
+    serve,
+)
+from suiteas.core.print import format_violation
+from suiteas.core.run import run_suiteas_main
+from suiteas.read.cache import FactCache
+from suiteas.read.project import get_project
+
+# Unix socket paths are limited to around 100 characters.
+_MAX_SOCKET_PATH_LEN = 100
+# Only the owner can access the directory holding the socket.
+_PRIVATE_DIR_MODE = 0o700
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"),
+    reason="Needs Unix sockets.",
+)
+
+
+@pytest.fixture()
+def proj_dir(projs_parent_dir: Path, tmp_path: Path) -> Path:
+    """Fixture for a copy of a project with violations."""
+    proj_dir = tmp_path / "two_files"
+    shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+    return proj_dir
+
+
+@pytest.fixture()
+def socket_path(proj_dir: Path) -> Iterator[Path]:
+    """Fixture for the socket of a daemon serving the project."""
+    socket_path = get_socket_path(proj_dir)
+    thread = threading.Thread(target=_serve, args=(proj_dir, socket_path))
+    thread.start()
+    while not socket_path.exists():
+        time.sleep(0.01)
+    yield socket_path
+    request_stop(socket_path)
+    thread.join()
+
+
+def _serve(proj_dir: Path, socket_path: Path) -> None:
+    # The cache must be created in the same thread as it is used in.
+    with FactCache(None) as cache:
+        serve(proj_dir, socket_path=socket_path, cache=cache)
+
+
+def _get_msgs(proj_dir: Path) -> list[str]:
+    project = get_project(proj_dir=proj_dir)
+    return [format_violation(violation) for violation in get_violations(project)]
+
+
+class TestGetSocketPath:
+    def test_distinct(self, tmp_path: Path) -> None:
+        assert get_socket_path(tmp_path / "a") != get_socket_path(tmp_path / "b")
+
+    def test_short(self, tmp_path: Path) -> None:
+        assert len(str(get_socket_path(tmp_path / ("a" * 200)))) < _MAX_SOCKET_PATH_LEN
+
+    def test_private_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setattr(tempfile, "tempdir", os.fspath(tmp_path))
+
+        socket_dir = get_socket_path(tmp_path / "proj").parent
+        assert socket_dir == tmp_path / f"suiteas-{os.getuid()}"
+        assert stat.S_IMODE(socket_dir.stat().st_mode) == _PRIVATE_DIR_MODE
+
+    def test_runtime_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        runtime_dir = tmp_path / "run"
+        runtime_dir.mkdir(mode=_PRIVATE_DIR_MODE)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", os.fspath(runtime_dir))
+
+        assert get_socket_path(tmp_path / "proj").parent == runtime_dir
+
+    def test_shared_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setattr(tempfile, "tempdir", os.fspath(tmp_path))
+        shared_dir = tmp_path / f"suiteas-{os.getuid()}"
+        shared_dir.mkdir()
+        shared_dir.chmod(0o777)
+
+        with pytest.raises(DaemonError):
+            get_socket_path(tmp_path / "proj")
+
+
+class TestServe:
+    def test_already_serving(self, proj_dir: Path, socket_path: Path) -> None:
+        with pytest.raises(DaemonError):
+            serve(proj_dir, socket_path=socket_path, cache=FactCache(None))
+
+        # The first daemon keeps serving.
+        assert request_check(socket_path, files=[]) == _get_msgs(proj_dir)
+
+    def test_already_serving_cli(
+        self,
+        proj_dir: Path,
+        socket_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.chdir(proj_dir)
+        with pytest.raises(SystemExit) as exc_info:
+            run_suiteas_main(["daemon", "--no-cache"])
+
+        assert exc_info.value.code != 0
+        assert capsys.readouterr().err == (
+            f"suiteas: error: Another suiteas daemon is already serving {proj_dir}\n"
+        )
+        assert request_check(socket_path, files=[]) is not None
+
+
+class TestRequestCheck:
+    def test_no_daemon(self, tmp_path: Path) -> None:
+        assert request_check(get_socket_path(tmp_path), files=[]) is None
+
+    def test_all_files(self, proj_dir: Path, socket_path: Path) -> None:
+        msgs = request_check(socket_path, files=[])
+        assert msgs == _get_msgs(proj_dir)
+        assert msgs
+
+    def test_some_files(self, proj_dir: Path, socket_path: Path) -> None:
+        hello_path = proj_dir / "src" / "ow9xem9x" / "hello.py"
+        msgs = request_check(socket_path, files=[hello_path])
+        assert msgs is not None
+        assert all("goodbye" not in msg for msg in msgs)
+        assert any("hello" in msg for msg in msgs)
+
+    def test_changed_file(self, proj_dir: Path, socket_path: Path) -> None:
+        request_check(socket_path, files=[])
+
+        (proj_dir / "src" / "ow9xem9x" / "hello.py").write_text("")
+        msgs = request_check(socket_path, files=[])
+        assert msgs == _get_msgs(proj_dir)
+        assert all("src/ow9xem9x/hello.py" not in msg for msg in msgs)
+
+    def test_changed_config(self, proj_dir: Path, socket_path: Path) -> None:
+        request_check(socket_path, files=[])
+
+        with (proj_dir / "pyproject.toml").open(mode="a") as f:
+            f.write('ignore = ["SUI001", "SUI002", "SUI003"]\n')
+        assert request_check(socket_path, files=[]) == []
+
+    def test_error(self, proj_dir: Path, socket_path: Path) -> None:
+        (proj_dir / "src" / "ow9xem9x" / "hello.py").write_text("def (:")
+        assert request_check(socket_path, files=[]) is None
+
+    def test_stuck_client(
+        self,
+        proj_dir: Path,
+        socket_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("suiteas.core.daemon._REQUEST_TIMEOUT_S", 0.1)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck_conn:
+            # Connects, but never sends a request.
+            stuck_conn.connect(os.fspath(socket_path))
+            assert request_check(socket_path, files=[]) == _get_msgs(proj_dir)
+
+    def test_other_user(
+        self,
+        socket_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        uid = os.getuid()
+        monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+        assert request_check(socket_path, files=[]) is None
+
+
+class TestRequestStop:
+    def test_no_daemon(self, tmp_path: Path) -> None:
+        assert not request_stop(get_socket_path(tmp_path))
+
+    def test_stop(self, socket_path: Path) -> None:
+        assert request_stop(socket_path)
+        assert request_check(socket_path, files=[]) is None
@@ -0,0 +1,97 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from suiteas.core.monorepo import (
+    find_proj_dirs,
+    get_monorepo_violations,
+    group_paths_by_proj_dir,
+)
+from suiteas.core.print import format_violation
+
+
+@pytest.fixture()
+def monorepo_dir(projs_parent_dir: Path, tmp_path: Path) -> Path:
+    """Fixture for a monorepo with two projects, and other pyproject.toml files."""
+    for rel_dir, proj_name in [
+        ("libs/two_files", "two_files"),
+        ("apps/one_func_no_test", "one_func_no_test"),
+    ]:
+        shutil.copytree(projs_parent_dir / proj_name, tmp_path / rel_dir)
+    (tmp_path / "pyproject.toml").write_text("[tool.ruff]\n")
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "pyproject.toml").write_text("[project]\nname = 'other'\n")
+    (tmp_path / "other" / "invalid").mkdir()
+    (tmp_path / "other" / "invalid" / "pyproject.toml").write_text("[tool.suiteas\n")
+    return tmp_path.resolve()
+
+
+class TestGetMonorepoViolations:
+    def test_all(self, monorepo_dir: Path) -> None:
+        msgs = [
+            format_violation(violation)
+            for violation in get_monorepo_violations(monorepo_dir)
+        ]
+        assert msgs[0] == (
+            "apps/one_func_no_test/src/pp8cadfs/__init__.py:1:0: SUI001 hello untested "
+            "in tests/unit/pp8cadfs/test___init__.py"
+        )
+        assert msgs[1].startswith("libs/two_files/src/ow9xem9x/goodbye.py:1:0: SUI003")
+        assert len(msgs) == 1 + 5
+
+    def test_stream(self, monorepo_dir: Path) -> None:
+        assert sorted(
+            format_violation(violation)
+            for violation in get_monorepo_violations(monorepo_dir, stream=True)
+        ) == sorted(
+            format_violation(violation)
+            for violation in get_monorepo_violations(monorepo_dir)
+        )
+
+    def test_included_files(self, monorepo_dir: Path) -> None:
+        violations = list(
+            get_monorepo_violations(
+                monorepo_dir,
+                included_files=[
+                    monorepo_dir / "libs/two_files/src/ow9xem9x/hello.py",
+                    monorepo_dir / "other" / "outside.py",
+                ],
+            ),
+        )
+        assert {violation.rel_path for violation in violations} == {
+            Path("libs/two_files/src/ow9xem9x/hello.py"),
+            Path("libs/two_files/tests/unit/ow9xem9x/test_hello.py"),
+        }
+
+
+class TestFindProjDirs:
+    def test_sections(self, monorepo_dir: Path) -> None:
+        assert find_proj_dirs(monorepo_dir) == [
+            monorepo_dir / "apps" / "one_func_no_test",
+            monorepo_dir / "libs" / "two_files",
+        ]
+
+    def test_exclude_dirs(self, monorepo_dir: Path) -> None:
+        assert find_proj_dirs(monorepo_dir, exclude_dirs=["apps"]) == [
+            monorepo_dir / "libs" / "two_files",
+        ]
+
+
+class TestGroupPathsByProjDir:
+    def test_innermost(self, tmp_path: Path) -> None:
+        tmp_path = tmp_path.resolve()
+        outer_dir = tmp_path / "outer"
+        inner_dir = tmp_path / "outer" / "inner"
+        assert group_paths_by_proj_dir(
+            [
+                inner_dir / "a.py",
+                outer_dir / "b.py",
+                tmp_path / "c.py",
+                outer_dir / "inner_sibling" / "d.py",
+            ],
+            proj_dirs=[inner_dir, outer_dir, tmp_path / "unused"],
+        ) == {
+            inner_dir: [inner_dir / "a.py"],
+            outer_dir: [outer_dir / "b.py", outer_dir / "inner_sibling" / "d.py"],
+        }
@@ -1,9 +1,12 @@
+import os
 from pathlib import Path
 
 import pytest
 
-from suiteas.core.path import path_to_pytest_path, pytest_path_to_path
-from suiteas.domain import ProjConfig
+from suiteas.config import ProjConfig
+from suiteas.core.path import PathIndex, path_to_pytest_path, pytest_path_to_path
+
+_PROJ_DIR = Path("/example/repo")
 
 
 class TestPytestPathToPath:
@@ -92,3 +95,86 @@ class TestPathToPytestPath:
                 ),
                 proj_dir=Path("example/subfolder/otherrepo"),
             )
+
+
+class TestPathIndex:
+    def test_classify(self) -> None:
+        path_index = PathIndex(
+            proj_config=ProjConfig(pkg_names=["pkg_a", "pkg_b"]),
+            proj_dir=_PROJ_DIR,
+        )
+        for rel_path, expected in [
+            ("src/pkg_a/mod.py", (True, False)),
+            ("src/pkg_b/sub/mod.py", (True, False)),
+            ("tests/unit/pkg_a/test_mod.py", (False, True)),
+            ("src/pkg_c/mod.py", (False, False)),
+            ("src/pkg_a", (False, False)),
+            ("tests/test_mod.py", (False, False)),
+            ("docs/conf.py", (False, False)),
+        ]:
+            path_str = os.fspath(_PROJ_DIR / rel_path)
+            assert path_index.classify(path_str) == expected
+
+    def test_consolidated_classify(self) -> None:
+        path_index = PathIndex(
+            proj_config=ProjConfig(
+                pkg_names=["pkg"],
+                src_rel_path=Path("."),
+                unittest_dir_name=Path("."),
+                use_consolidated_tests_dir=True,
+            ),
+            proj_dir=_PROJ_DIR,
+        )
+        assert path_index.classify(os.fspath(_PROJ_DIR / "pkg" / "mod.py")) == (
+            True,
+            False,
+        )
+        assert path_index.classify(os.fspath(_PROJ_DIR / "tests" / "test_mod.py")) == (
+            False,
+            True,
+        )
+
+    @pytest.mark.parametrize(
+        "proj_config",
+        [
+            ProjConfig(pkg_names=["pkg"]),
+            ProjConfig(
+                pkg_names=["pkg"],
+                src_rel_path=Path("mysrc"),
+                tests_rel_path=Path("mytests"),
+                unittest_dir_name=Path("myunit"),
+            ),
+            ProjConfig(
+                pkg_names=["pkg"],
+                unittest_dir_name=Path("."),
+                use_consolidated_tests_dir=True,
+            ),
+        ],
+    )
+    def test_same_as_path_funcs(self, proj_config: ProjConfig) -> None:
+        path_index = PathIndex(proj_config=proj_config, proj_dir=_PROJ_DIR)
+        for rel_path in ("pkg/mod.py", "pkg/sub/mod.py", "pkg/__init__.py"):
+            path = _PROJ_DIR / proj_config.src_rel_path / rel_path
+            pytest_path = path_to_pytest_path(
+                path,
+                proj_config=proj_config,
+                proj_dir=_PROJ_DIR,
+            )
+            assert path_index.to_pytest_path_str(os.fspath(path)) == os.fspath(
+                pytest_path,
+            )
+            assert path_index.to_path_str(os.fspath(pytest_path)) == os.fspath(
+                pytest_path_to_path(
+                    pytest_path,
+                    proj_config=proj_config,
+                    proj_dir=_PROJ_DIR,
+                ),
+            )
+
+    def test_err(self) -> None:
+        path_index = PathIndex(
+            proj_config=ProjConfig(pkg_names=["pkg"]),
+            proj_dir=_PROJ_DIR,
+        )
+        with pytest.raises(ValueError, match=".* is not in the subpath of .*"):
+            path_index.to_pytest_path_str(os.fspath(_PROJ_DIR / "srcs" / "mod.py"))
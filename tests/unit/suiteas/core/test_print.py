@@ -2,7 +2,7 @@ import io
 from contextlib import redirect_stderr
 from pathlib import Path
 
-from suiteas.core.print import print_violations
+from suiteas.core.print import format_violation, print_msgs, print_violations
 from suiteas.core.rules import (
     empty_pytest_class,
     missing_test_func,
@@ -92,3 +92,48 @@ class TestPrintViolations:
             "in tests/fakemcfake/test_example.py"
             "\n"
         )
+
+
+class TestPrintMsgs:
+    def test_count(self) -> None:
+        msgs = [f"msg {idx}" for idx in range(1000)]
+        f = io.StringIO()
+        with redirect_stderr(f):
+            n_printed = print_msgs(iter(msgs))
+        assert n_printed == len(msgs)
+        assert f.getvalue().splitlines() == msgs
+
+    def test_max_msgs(self) -> None:
+        msgs = iter(["a", "b", "c", "d"])
+        f = io.StringIO()
+        with redirect_stderr(f):
+            n_printed = print_msgs(msgs, max_msgs=2)
+        assert f.getvalue().splitlines() == [
+            "a",
+            "b",
+            "Stopped early; there are more than 2 violations.",
+        ]
+        assert n_printed == len(["a", "b"])
+        # No more messages are requested than needed to tell there are more.
+        assert list(msgs) == ["d"]
+
+    def test_max_msgs_exact(self) -> None:
+        f = io.StringIO()
+        with redirect_stderr(f):
+            n_printed = print_msgs(["a", "b"], max_msgs=2)
+        assert f.getvalue() == "a\nb\n"
+        assert n_printed == len(["a", "b"])
+
+
+class TestFormatViolation:
+    def test_sui002(self) -> None:
+        msg = format_violation(
+            Violation(
+                rule=empty_pytest_class,
+                rel_path=Path("tests/unit/fakemcfake/test_example.py"),
+                fmt_info=dict(pytest_class_name="TestExample"),
+            ),
+        )
+        assert msg.replace("\\", "/") == (
+            "tests/unit/fakemcfake/test_example.py:0:0: SUI002 TestExample has no tests"
+        )
@@ -0,0 +1,112 @@
+import json
+import time
+from pathlib import Path
+
+from suiteas.core.profile import FileSpan, Profiler, profile_phase
+
+_SLEEP_NS = 10_000_000
+
+
+def _get_span(path: Path, *, duration_ns: int) -> FileSpan:
+    start_ns = time.perf_counter_ns()
+    return FileSpan(
+        path=path,
+        n_bytes=100,
+        start_ns=start_ns,
+        end_ns=start_ns + duration_ns,
+        pid=1,
+    )
+
+
+class TestProfiler:
+    def test_phase(self) -> None:
+        profiler = Profiler()
+        with profiler.phase("parsing"):
+            time.sleep(_SLEEP_NS / 1e9)
+        assert profiler.wall_ns_by_phase["parsing"] >= _SLEEP_NS
+
+    def test_nested_phases(self) -> None:
+        profiler = Profiler()
+        with profiler.phase("output"):
+            with profiler.phase("checking"):
+                time.sleep(2 * _SLEEP_NS / 1e9)
+            time.sleep(_SLEEP_NS / 1e9)
+        assert profiler.wall_ns_by_phase["checking"] >= 2 * _SLEEP_NS
+        assert _SLEEP_NS <= profiler.wall_ns_by_phase["output"] < 2 * _SLEEP_NS
+
+    def test_iter_phase(self) -> None:
+        def slow_range() -> object:
+            for idx in range(2):
+                time.sleep(_SLEEP_NS / 1e9)
+                yield idx
+
+        profiler = Profiler()
+        with profiler.phase("output"):
+            assert list(profiler.iter_phase("checking", slow_range())) == [0, 1]
+        assert profiler.wall_ns_by_phase["checking"] >= 2 * _SLEEP_NS
+        assert profiler.wall_ns_by_phase["output"] < 2 * _SLEEP_NS
+
+    def test_format_report(self, tmp_path: Path) -> None:
+        profiler = Profiler()
+        profiler.add_file_span(_get_span(tmp_path / "fast.py", duration_ns=1))
+        profiler.add_file_span(_get_span(tmp_path / "slow.py", duration_ns=10**9))
+        profiler.n_cached_files = 3
+        report = profiler.format_report(proj_dir=tmp_path, n_slowest=1)
+        lines = report.splitlines()
+        assert lines[0].split() == ["Phase", "Wall", "(ms)", "CPU", "(ms)"]
+        assert [line.split()[0] for line in lines[1:9]] == [
+            "imports",
+            "config",
+            "discovery",
+            "parsing",
+            "checking",
+            "output",
+            "other",
+            "total",
+        ]
+        assert "Read 2 files (0.0 MiB); 3 more were unchanged in the cache." in lines
+        assert lines[-2:] == ["Slowest files to read:", "    1000.0 ms  slow.py"]
+
+    def test_write_trace(self, tmp_path: Path) -> None:
+        profiler = Profiler()
+        with profiler.phase("parsing"):
+            profiler.add_file_span(_get_span(tmp_path / "a.py", duration_ns=_SLEEP_NS))
+        profiler.write_trace(tmp_path / "trace.json", proj_dir=tmp_path)
+
+        with (tmp_path / "trace.json").open() as _f:
+            events = json.load(_f)["traceEvents"]
+        spans = [event for event in events if event["ph"] == "X"]
+        assert [(span["cat"], span["name"]) for span in spans] == [
+            ("phase", "parsing"),
+            ("file", "a.py"),
+        ]
+        assert spans[1]["dur"] == _SLEEP_NS / 1000
+        assert spans[1]["args"] == {"bytes": 100}
+
+    def test_write_trace_iter_phase(self, tmp_path: Path) -> None:
+        profiler = Profiler()
+        with profiler.phase("output"):
+            assert list(profiler.iter_phase("checking", range(2))) == [0, 1]
+        profiler.write_trace(tmp_path / "trace.json", proj_dir=tmp_path)
+
+        with (tmp_path / "trace.json").open() as _f:
+            events = json.load(_f)["traceEvents"]
+        # Getting each item, and finding there are no more, is a span of the phase.
+        assert [event["name"] for event in events if event["ph"] == "X"] == [
+            "checking",
+            "checking",
+            "checking",
+            "output",
+        ]
+
+
+class TestProfilePhase:
+    def test_no_profiler(self) -> None:
+        with profile_phase(None, "parsing"):
+            pass
+
+    def test_profiler(self) -> None:
+        profiler = Profiler()
+        with profile_phase(profiler, "parsing"):
+            pass
+        assert "parsing" in profiler.wall_ns_by_phase
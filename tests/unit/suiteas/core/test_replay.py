@@ -0,0 +1,81 @@
+import os
+import shutil
+from collections import Counter
+from pathlib import Path
+
+from suiteas.core.check import get_violations
+from suiteas.core.replay import get_replayed_violations
+from suiteas.read.cache import FactCache
+from suiteas.read.project import get_project
+
+# A modification time long enough ago to be trusted, in nanoseconds.
+_OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+
+def _copy_project(projs_parent_dir: Path, tmp_path: Path) -> Path:
+    """Copy a project, with modification times old enough to be fingerprinted."""
+    proj_dir = tmp_path / "two_files"
+    shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+    for path in proj_dir.rglob("*"):
+        os.utime(path, ns=(_OLD_MTIME_NS, _OLD_MTIME_NS))
+    return proj_dir
+
+
+class TestGetReplayedViolations:
+    def test_replayed(
+        self,
+        projs_parent_dir: Path,
+        tmp_path: Path,
+        os_calls: Counter[str],
+    ) -> None:
+        proj_dir = _copy_project(projs_parent_dir, tmp_path)
+        msgs: list[str] = []
+
+        with FactCache(None) as cache:
+            violations = list(get_replayed_violations(proj_dir, cache=cache))
+            os_calls.clear()
+            replayed_violations = list(
+                get_replayed_violations(proj_dir, cache=cache, log=msgs.append),
+            )
+            n_opens = os_calls["open"]
+
+        assert violations == list(get_violations(get_project(proj_dir=proj_dir)))
+        assert replayed_violations == violations
+        assert msgs == [f"Replaying {len(violations)} violations of an identical run"]
+        # No file was read.
+        assert n_opens == 0
+
+    def test_changed(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = _copy_project(projs_parent_dir, tmp_path)
+        msgs: list[str] = []
+
+        with FactCache(None) as cache:
+            list(get_replayed_violations(proj_dir, cache=cache))
+            path = proj_dir / "src" / "ow9xem9x" / "hello.py"
+            path.write_text("")
+            os.utime(path, ns=(_OLD_MTIME_NS, _OLD_MTIME_NS))
+            violations = list(
+                get_replayed_violations(proj_dir, cache=cache, log=msgs.append),
+            )
+
+        assert violations == list(get_violations(get_project(proj_dir=proj_dir)))
+        assert msgs == ["Checking again, since files changed in src/ow9xem9x"]
+
+    def test_stopped_early(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = _copy_project(projs_parent_dir, tmp_path)
+
+        with FactCache(None) as cache:
+            violations = get_replayed_violations(proj_dir, cache=cache)
+            next(violations)
+            violations.close()
+
+            assert cache.get_run(proj_dir) is None
+
+    def test_recently_modified(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = _copy_project(projs_parent_dir, tmp_path)
+        (proj_dir / "src" / "ow9xem9x" / "hello.py").touch()
+
+        with FactCache(None) as cache:
+            list(get_replayed_violations(proj_dir, cache=cache))
+
+            assert cache.get_run(proj_dir) is None
@@ -0,0 +1,17 @@
+from suiteas.core.rules import RULE_CODES, get_needed_facts
+
+
+class TestGetNeededFacts:
+    def test_all(self) -> None:
+        assert get_needed_facts(RULE_CODES) == {
+            "src_funcs",
+            "pytest_classes",
+            "partner_pytest_classes",
+            "partner_pytest_imports",
+        }
+
+    def test_sui002(self) -> None:
+        assert get_needed_facts(["SUI002"]) == {"pytest_classes"}
+
+    def test_none(self) -> None:
+        assert get_needed_facts([]) == frozenset()
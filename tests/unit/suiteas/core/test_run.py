@@ -1,20 +1,315 @@
+import io
+import json
 import os
+import shutil
+import subprocess
+import sys
+from contextlib import redirect_stderr
 from pathlib import Path
 
 import pytest
 
 from suiteas.core.run import run_suiteas, run_suiteas_main
+from suiteas_test.importtime import (
+    HEAVY_MODULES,
+    IMPORT_TIME_BUDGET_US,
+    get_import_times,
+)
 
 
 class TestRunSuiteAsMain:
     def test_no_tests_dir(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "no_tests_dir"
         old_cwd = Path.cwd()
-        os.chdir(projs_parent_dir / "no_tests_dir")
+        os.chdir(proj_dir)
         with pytest.raises(FileNotFoundError):
-            run_suiteas_main([])
+            run_suiteas_main(["--no-cache"])
         os.chdir(old_cwd)
+        # The test assets are left as they are.
+        assert not (proj_dir / ".suiteas_cache").exists()
+
+    def test_cache(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        for _ in range(2):
+            with pytest.raises(SystemExit):
+                run_suiteas_main([])
+        os.chdir(old_cwd)
+        assert (proj_dir / ".suiteas_cache").is_dir()
+
+    def test_no_cache(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        with pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache"])
+        os.chdir(old_cwd)
+        assert not (proj_dir / ".suiteas_cache").exists()
+
+    def test_jobs(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        outputs = []
+        for argv in (
+            ["--no-cache", "--jobs", "1"],
+            ["--no-cache", "--jobs", "2"],
+            ["--no-cache", "--jobs", "auto"],
+        ):
+            f = io.StringIO()
+            with redirect_stderr(f), pytest.raises(SystemExit):
+                run_suiteas_main(argv)
+            outputs.append(f.getvalue())
+        os.chdir(old_cwd)
+        serial_output, parallel_output, auto_output = outputs
+        assert parallel_output == serial_output
+        assert auto_output == serial_output
+        assert serial_output
+
+    def test_verbose(self, projs_parent_dir: Path) -> None:
+        old_cwd = Path.cwd()
+        os.chdir(projs_parent_dir / "two_files")
+        f = io.StringIO()
+        with redirect_stderr(f), pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache", "--verbose"])
+        os.chdir(old_cwd)
+        assert "suiteas: Reading 3 files" in f.getvalue()
+
+    def test_replay(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        # Old enough for the files' modification times to be trusted.
+        for path in proj_dir.rglob("*"):
+            os.utime(path, (0, 0))
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        outputs = []
+        for _ in range(2):
+            f = io.StringIO()
+            with redirect_stderr(f), pytest.raises(SystemExit):
+                run_suiteas_main(["--verbose"])
+            outputs.append(f.getvalue())
+        os.chdir(old_cwd)
+        output, replayed_output = outputs
+        assert "suiteas: Replaying 5 violations" not in output
+        assert "suiteas: Replaying 5 violations" in replayed_output
+        assert [line for line in replayed_output.splitlines() if "SUI" in line] == [
+            line for line in output.splitlines() if "SUI" in line
+        ]
+
+    def test_invalid_jobs(self) -> None:
+        with redirect_stderr(io.StringIO()), pytest.raises(SystemExit):
+            run_suiteas_main(["--jobs", "some"])
+
+    def test_engine(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        outputs = []
+        for argv in (["--no-cache"], ["--no-cache", "--engine", "scan"]):
+            f = io.StringIO()
+            with redirect_stderr(f), pytest.raises(SystemExit):
+                run_suiteas_main(argv)
+            outputs.append(f.getvalue())
+        os.chdir(old_cwd)
+        ast_output, scan_output = outputs
+        assert scan_output == ast_output
+        assert ast_output
+
+    def test_max_violations(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        f = io.StringIO()
+        with redirect_stderr(f), pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache", "--max-violations", "1"])
+        os.chdir(old_cwd)
+        assert f.getvalue().splitlines()[1:] == [
+            "Stopped early; there are more than 1 violations.",
+        ]
+
+    def test_profile(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        f = io.StringIO()
+        with redirect_stderr(f), pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache", "--profile", "--profile-top", "1"])
+        os.chdir(old_cwd)
+        output = f.getvalue()
+        assert "SUI003" in output
+        assert "Read 6 files" in output
+        assert output.splitlines()[-2] == "Slowest files to read:"
+
+    def test_trace(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+        with redirect_stderr(io.StringIO()), pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache", "--trace", "trace.json"])
+        os.chdir(old_cwd)
+        with (proj_dir / "trace.json").open() as _f:
+            events = json.load(_f)["traceEvents"]
+        assert {event["name"] for event in events if event.get("cat") == "phase"} == {
+            "imports",
+            "config",
+            "discovery",
+            "parsing",
+            "checking",
+            "output",
+        }
+
+    def test_profile_watch(self) -> None:
+        with redirect_stderr(io.StringIO()), pytest.raises(SystemExit):
+            run_suiteas_main(["--watch", "--profile"])
+
+    def test_hook_spawn(self, root_dir: Path) -> None:
+        # Worker processes started by spawn would run the hook script again, so threads
+        # are used instead.
+        code = (
+            "import multiprocessing, runpy; "
+            "multiprocessing.set_start_method('spawn'); "
+            "runpy.run_module('suiteas_hook', run_name='__main__', alter_sys=True)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, "--no-cache", "--jobs", "2", "--verbose"],  # noqa: S603
+            cwd=root_dir,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        assert " with 2 threads, " in result.stderr
+
+    def test_monorepo(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        (tmp_path / ".git").mkdir()
+        for proj_name in ("two_files", "one_func_no_test"):
+            shutil.copytree(projs_parent_dir / proj_name, tmp_path / proj_name)
+        old_cwd = Path.cwd()
+        os.chdir(tmp_path / "two_files")
+        f = io.StringIO()
+        with redirect_stderr(f), pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache", "--monorepo"])
+        os.chdir(old_cwd)
+        paths = {line.split(":")[0] for line in f.getvalue().splitlines()}
+        assert paths == {
+            "one_func_no_test/src/pp8cadfs/__init__.py",
+            "two_files/src/ow9xem9x/goodbye.py",
+            "two_files/src/ow9xem9x/hello.py",
+            "two_files/tests/unit/ow9xem9x/test_goodbye.py",
+            "two_files/tests/unit/ow9xem9x/test_hello.py",
+        }
+
+    def test_stream(self, projs_parent_dir: Path) -> None:
+        old_cwd = Path.cwd()
+        os.chdir(projs_parent_dir / "two_files")
+        f = io.StringIO()
+        with redirect_stderr(f), pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache", "--stream"])
+        os.chdir(old_cwd)
+        assert len(f.getvalue().splitlines()) == 1 + 4
+
+    def test_stream_watch(self) -> None:
+        with redirect_stderr(io.StringIO()), pytest.raises(SystemExit):
+            run_suiteas_main(["--stream", "--watch"])
+
+    def test_files_watch(self) -> None:
+        with redirect_stderr(io.StringIO()), pytest.raises(SystemExit):
+            run_suiteas_main(["--watch", "src/pkg/mod.py"])
+
+    def test_since_watch(self) -> None:
+        with redirect_stderr(io.StringIO()), pytest.raises(SystemExit):
+            run_suiteas_main(["--watch", "--since", "HEAD"])
+
+    def test_monorepo_daemon(self) -> None:
+        with redirect_stderr(io.StringIO()), pytest.raises(SystemExit):
+            run_suiteas_main(["--monorepo", "--use-daemon"])
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="Needs git.")
+    def test_since(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        _git("init", cwd=proj_dir)
+        _git("commit", "--allow-empty", "-m", "Initial commit", cwd=proj_dir)
+        old_cwd = Path.cwd()
+        os.chdir(proj_dir)
+
+        # Every file is untracked, so every file is checked.
+        with pytest.raises(SystemExit):
+            run_suiteas_main(["--no-cache", "--since", "HEAD"])
+
+        # Nothing has changed since HEAD, so nothing is checked.
+        _git("add", ".", cwd=proj_dir)
+        _git("commit", "-m", "Add files", cwd=proj_dir)
+        run_suiteas_main(["--no-cache", "--since", "HEAD"])
+
+        os.chdir(old_cwd)
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="Needs git.")
+    def test_since_bad_ref(
+        self,
+        projs_parent_dir: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        _git("init", cwd=proj_dir)
+        _git("commit", "--allow-empty", "-m", "Initial commit", cwd=proj_dir)
+        monkeypatch.chdir(proj_dir)
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_suiteas_main(["--no-cache", "--since", "nonexistent"])
+
+        assert exc_info.value.code != 0
+        err = capsys.readouterr().err
+        assert err.startswith("suiteas: error: git merge-base nonexistent HEAD failed")
+        assert err.count("\n") == 1
 
 
 class TestRunSuiteAs:
     def test_nothing(self) -> None:
         _ = run_suiteas
+
+    def test_import_time(self) -> None:
+        # The best of a few attempts, to be robust to a busy machine.
+        import_time_us = min(get_import_times("suiteas.core.run")[0] for _ in range(3))
+        assert import_time_us < IMPORT_TIME_BUDGET_US
+
+    def test_lazy_imports(self) -> None:
+        _, imported = get_import_times("suiteas.core.run")
+        assert not [
+            module
+            for module in imported
+            if any(
+                module == heavy or module.startswith(f"{heavy}.")
+                for heavy in HEAVY_MODULES
+            )
+        ]
+
+
+def _git(*args: str, cwd: Path) -> None:
+    subprocess.run(
+        [  # noqa: S603, S607
+            "git",
+            "-c",
+            "user.name=suiteas",
+            "-c",
+            "user.email=suiteas@example.com",
+            "-c",
+            "commit.gpgsign=false",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
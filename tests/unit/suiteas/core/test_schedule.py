@@ -0,0 +1,171 @@
+import importlib.machinery
+import os
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from suiteas.core.schedule import (
+    Execution,
+    Schedule,
+    ScheduledExecutor,
+    choose_schedule,
+    format_schedule,
+)
+
+_N_WORKERS = 8
+
+
+@pytest.fixture(autouse=True)
+def _interactive_main(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fixture for a main module which workers don't run, however pytest was started."""
+    monkeypatch.setitem(sys.modules, "__main__", types.ModuleType("__main__"))
+
+
+def _set_spawned_main(
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    spec_name: str | None,
+    file: str | None,
+) -> None:
+    main_module = types.ModuleType("__main__")
+    if spec_name is not None:
+        main_module.__spec__ = importlib.machinery.ModuleSpec(spec_name, None)
+    if file is not None:
+        main_module.__file__ = file
+    monkeypatch.setitem(sys.modules, "__main__", main_module)
+    monkeypatch.setattr(
+        "multiprocessing.get_start_method",
+        lambda allow_none: "spawn",  # noqa: ARG005
+    )
+
+
+class TestChooseSchedule:
+    def test_few_files(self) -> None:
+        schedule = choose_schedule(n_files=3, n_bytes=3 * 2**10, max_workers=_N_WORKERS)
+        assert schedule.execution == "serial"
+
+    def test_many_files(self) -> None:
+        schedule = choose_schedule(
+            n_files=30_000,
+            n_bytes=30_000 * 10 * 2**10,
+            max_workers=_N_WORKERS,
+        )
+        assert schedule.execution == "process"
+        assert schedule.n_workers == _N_WORKERS
+
+    def test_one_worker(self) -> None:
+        schedule = choose_schedule(n_files=30_000, n_bytes=2**30, max_workers=1)
+        assert schedule.execution == "serial"
+
+    def test_free_threaded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("suiteas.core.schedule._is_gil_enabled", lambda: False)
+        schedule = choose_schedule(
+            n_files=100,
+            n_bytes=100 * 10 * 2**10,
+            max_workers=_N_WORKERS,
+        )
+        assert schedule.execution == "thread"
+
+    def test_execution(self) -> None:
+        schedule = choose_schedule(
+            n_files=3,
+            n_bytes=3 * 2**10,
+            max_workers=_N_WORKERS,
+            execution="process",
+        )
+        assert schedule.execution == "process"
+        assert schedule.n_workers == 3  # noqa: PLR2004
+
+    def test_no_files(self) -> None:
+        schedule = choose_schedule(
+            n_files=0,
+            n_bytes=0,
+            max_workers=_N_WORKERS,
+            execution="process",
+        )
+        assert schedule.n_workers == 1
+
+    @pytest.mark.parametrize(
+        ("spec_name", "file", "executions"),
+        [
+            # A script, e.g. a pre-commit hook, which workers would run again.
+            (None, "/repo/hook.py", ("serial", "thread")),
+            # A module run with -m, which workers would run again.
+            ("hook", "/repo/hook.py", ("serial", "thread")),
+            # A package's main module, which workers skip.
+            ("suiteas.__main__", "/repo/src/suiteas/__main__.py", ("process",) * 2),
+            # An interactive session, with nothing to run.
+            (None, None, ("process",) * 2),
+        ],
+    )
+    def test_spawn(
+        self,
+        spec_name: str | None,
+        file: str | None,
+        executions: tuple[Execution, Execution],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _set_spawned_main(monkeypatch, spec_name=spec_name, file=file)
+        forced_executions: list[Execution | None] = [None, "process"]
+        for forced_execution, execution in zip(
+            forced_executions,
+            executions,
+            strict=True,
+        ):
+            schedule = choose_schedule(
+                n_files=30_000,
+                n_bytes=30_000 * 10 * 2**10,
+                max_workers=_N_WORKERS,
+                execution=forced_execution,
+            )
+            assert schedule.execution == execution
+
+
+class TestFormatSchedule:
+    def test_processes(self) -> None:
+        schedule = Schedule(
+            execution="process",
+            n_workers=_N_WORKERS,
+            n_files=30_000,
+            n_bytes=3 * 2**20,
+            est_seconds=1.5,
+        )
+        assert format_schedule(schedule) == (
+            "Reading 30000 files (3072.0 KiB) with 8 processes, "
+            "estimated to take 1500 ms"
+        )
+
+
+class TestScheduledExecutor:
+    def test_schedule(self) -> None:
+        with ScheduledExecutor(max_workers=2) as executor:
+            assert executor.schedule(n_files=1, n_bytes=100) is None
+            pool_workers = executor.schedule(n_files=100_000, n_bytes=2**30)
+            assert pool_workers is not None
+            pool, n_workers = pool_workers
+            assert isinstance(pool, ProcessPoolExecutor)
+            assert n_workers == 2  # noqa: PLR2004
+            assert executor.schedule(n_files=100_000, n_bytes=2**30) == (pool, 2)
+
+    def test_execution(self) -> None:
+        with ScheduledExecutor(max_workers=2, execution="process") as executor:
+            pool_workers = executor.schedule(n_files=1, n_bytes=100)
+            assert pool_workers is not None
+            pool, n_workers = pool_workers
+            assert isinstance(pool, ProcessPoolExecutor)
+            assert n_workers == 1
+
+    def test_submit(self) -> None:
+        with ScheduledExecutor(max_workers=1) as executor:
+            assert executor.submit(abs, -1).result() == 1
+
+    def test_submit_spawn(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _set_spawned_main(monkeypatch, spec_name=None, file="/repo/hook.py")
+        with ScheduledExecutor(max_workers=1, execution="process") as executor:
+            # Run by a thread of this process instead.
+            assert executor.submit(os.getpid).result() == os.getpid()
+            pool_workers = executor.schedule(n_files=1, n_bytes=100)
+            assert pool_workers is not None
+            assert isinstance(pool_workers[0], ThreadPoolExecutor)
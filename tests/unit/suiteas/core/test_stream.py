@@ -0,0 +1,116 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from suiteas.core.check import get_violations
+from suiteas.core.print import format_violation
+from suiteas.core.profile import Profiler
+from suiteas.core.stream import get_streamed_violations
+from suiteas.read.cache import FactCache
+from suiteas.read.project import get_project
+
+
+class TestGetStreamedViolations:
+    @pytest.mark.parametrize(
+        "proj_name",
+        ["two_files", "one_func_no_test", "trivial_pass", "no_unit_dir"],
+    )
+    def test_same_as_whole(self, projs_parent_dir: Path, proj_name: str) -> None:
+        proj_dir = projs_parent_dir / proj_name
+
+        assert sorted(
+            format_violation(violation)
+            for violation in get_streamed_violations(proj_dir)
+        ) == sorted(
+            format_violation(violation)
+            for violation in get_violations(get_project(proj_dir=proj_dir))
+        )
+
+    def test_chunks(
+        self,
+        projs_parent_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("suiteas.core.stream._CHUNK_N_FILES", 1)
+        proj_dir = projs_parent_dir / "two_files"
+
+        rel_paths = [
+            violation.rel_path for violation in get_streamed_violations(proj_dir)
+        ]
+
+        # Each pytest file is checked along with its source file.
+        assert rel_paths == [
+            Path("src/ow9xem9x/goodbye.py"),
+            Path("tests/unit/ow9xem9x/test_goodbye.py"),
+            Path("tests/unit/ow9xem9x/test_goodbye.py"),
+            Path("src/ow9xem9x/hello.py"),
+            Path("tests/unit/ow9xem9x/test_hello.py"),
+        ]
+
+    def test_included_files(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+
+        violations = get_streamed_violations(
+            proj_dir,
+            included_files=[proj_dir / "tests" / "unit" / "ow9xem9x" / "test_hello.py"],
+        )
+
+        assert {violation.rel_path for violation in violations} == {
+            Path("src/ow9xem9x/hello.py"),
+            Path("tests/unit/ow9xem9x/test_hello.py"),
+        }
+
+    def test_no_tests_dir(self, projs_parent_dir: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            list(get_streamed_violations(projs_parent_dir / "no_tests_dir"))
+
+    def test_only_partner_pytest_files_needed(
+        self,
+        projs_parent_dir: Path,
+        tmp_path: Path,
+    ) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        with (proj_dir / "pyproject.toml").open("a") as _f:
+            _f.write('ignore = ["SUI002"]\n')
+        (proj_dir / "src" / "ow9xem9x" / "_private.py").write_text("def _f(): pass\n")
+        unit_dir = proj_dir / "tests" / "unit" / "ow9xem9x"
+        (unit_dir / "test__private.py").write_text("class TestF: pass\n")
+
+        profiler = Profiler()
+        list(get_streamed_violations(proj_dir, profiler=profiler))
+
+        # A source file without public functions needs no tests, so isn't partnered.
+        assert {
+            span.path for span in profiler.file_spans if span.path.parent == unit_dir
+        } == {
+            unit_dir / "test_goodbye.py",
+            unit_dir / "test_hello.py",
+        }
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="Needs git.")
+    def test_git_blob_ids(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        with (proj_dir / "pyproject.toml").open("a") as _f:
+            _f.write('file_source = "git"\n')
+        subprocess.run(["git", "init"], cwd=proj_dir, check=True)  # noqa: S603, S607
+        subprocess.run(
+            ["git", "add", "."],  # noqa: S603, S607
+            cwd=proj_dir,
+            check=True,
+        )
+
+        with FactCache(tmp_path / "cache") as cache:
+            list(get_streamed_violations(proj_dir, cache=cache))
+            for path in proj_dir.glob("**/*.py"):
+                os.utime(path, ns=(0, 0))
+            profiler = Profiler()
+            list(get_streamed_violations(proj_dir, cache=cache, profiler=profiler))
+
+        # Files with known blob IDs are recognized without being read.
+        assert not profiler.file_spans
+        assert profiler.n_cached_files
@@ -0,0 +1,161 @@
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from suiteas.core.watch import watch
+from suiteas.read.cache import FactCache
+
+_TIMEOUT_SECS = 10
+
+
+@pytest.fixture()
+def proj_dir(projs_parent_dir: Path, tmp_path: Path) -> Path:
+    """Fixture for a copy of a project with violations."""
+    proj_dir = tmp_path.resolve() / "two_files"
+    shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+    return proj_dir
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(
+            True,
+            id="inotify",
+            marks=pytest.mark.skipif(
+                sys.platform != "linux",
+                reason="Needs inotify.",
+            ),
+        ),
+        pytest.param(False, id="polling"),
+    ],
+)
+def watching(
+    proj_dir: Path,
+    request: pytest.FixtureRequest,
+    capsys: pytest.CaptureFixture[str],
+) -> Iterator[str]:
+    """Fixture which watches the project in the background, giving initial output."""
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=_watch,
+        args=(proj_dir,),
+        kwargs=dict(use_inotify=request.param, stop_event=stop_event),
+    )
+    thread.start()
+    yield _wait_for(capsys, lambda err: "Watching" in err)
+    stop_event.set()
+    thread.join()
+
+
+def _watch(proj_dir: Path, *, use_inotify: bool, stop_event: threading.Event) -> None:
+    # The cache must be created in the same thread as it is used in.
+    with FactCache(None) as cache:
+        watch(proj_dir, cache=cache, use_inotify=use_inotify, stop_event=stop_event)
+
+
+def _wait_for(capsys: pytest.CaptureFixture[str], cond: Callable[[str], bool]) -> str:
+    err = ""
+    start = time.monotonic()
+    while time.monotonic() - start < _TIMEOUT_SECS:
+        err += capsys.readouterr().err
+        if cond(err):
+            return err
+        time.sleep(0.01)
+    msg = f"Timed out waiting for output; got:\n{err}"
+    raise AssertionError(msg)
+
+
+class TestWatch:
+    def test_initial(self, watching: str) -> None:
+        err = watching
+        assert "SUI003 ow9xem9x.hello.hello is not imported" in err
+        assert "Found 5 violation(s)" in err
+
+    @pytest.mark.usefixtures("watching")
+    def test_fix(self, proj_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        (proj_dir / "tests" / "unit" / "ow9xem9x" / "test_hello.py").write_text(
+            "from ow9xem9x.hello import hello\n\n"
+            "class TestHello:\n"
+            "    def test_it(self):\n"
+            "        hello()\n",
+        )
+        err = _wait_for(capsys, lambda err: "Watching" in err)
+
+        assert "Fixed: src/ow9xem9x/hello.py:1:0: SUI003" in err
+        assert "Fixed: tests/unit/ow9xem9x/test_hello.py:0:0: SUI002" in err
+        assert "Found 3 violation(s)" in err
+
+    @pytest.mark.usefixtures("watching")
+    def test_new(self, proj_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        (proj_dir / "src" / "ow9xem9x" / "goodbye.py").write_text(
+            "def goodbye():\n    pass\n\ndef farewell():\n    pass\n",
+        )
+        err = _wait_for(capsys, lambda err: "Watching" in err)
+
+        assert "Fixed" not in err
+        assert "src/ow9xem9x/goodbye.py:4:0: SUI001 farewell untested" in err
+
+    @pytest.mark.usefixtures("watching")
+    def test_config(self, proj_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        with (proj_dir / "pyproject.toml").open(mode="a") as f:
+            f.write('ignore = ["SUI002"]\n')
+        err = _wait_for(capsys, lambda err: "Watching" in err)
+
+        assert "Fixed: tests/unit/ow9xem9x/test_goodbye.py:0:0: SUI002" in err
+        assert "Found 2 violation(s)" in err
+
+    @pytest.mark.usefixtures("watching")
+    def test_syntax_error(
+        self,
+        proj_dir: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        path = proj_dir / "src" / "ow9xem9x" / "goodbye.py"
+        path.write_text("def goodbye(:\n")
+        err = _wait_for(capsys, lambda err: "Watching" in err)
+        assert f"AnalyzedFileSyntaxError: Syntax error in {path}" in err
+
+        path.write_text("def goodbye():\n    pass\n\ndef farewell():\n    pass\n")
+        err = _wait_for(capsys, lambda err: "Watching" in err)
+        assert "src/ow9xem9x/goodbye.py:4:0: SUI001 farewell untested" in err
+
+    @pytest.mark.usefixtures("watching")
+    def test_config_error(
+        self,
+        proj_dir: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        toml_path = proj_dir / "pyproject.toml"
+        toml_text = toml_path.read_text()
+        toml_path.write_text(toml_text + 'src_rel_path = "missing"\n')
+        err = _wait_for(capsys, lambda err: "Watching" in err)
+        assert "FileNotFoundError" in err
+
+        toml_path.write_text(toml_text + 'ignore = ["SUI002"]\n')
+        err = _wait_for(capsys, lambda err: "Watching" in err)
+        assert "Found 2 violation(s)" in err
+
+    @pytest.mark.usefixtures("watching")
+    def test_exclude_dirs(
+        self,
+        proj_dir: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        skipped_dir = proj_dir / "src" / "ow9xem9x" / "skipped"
+        skipped_dir.mkdir()
+        with (proj_dir / "pyproject.toml").open(mode="a") as f:
+            f.write('exclude_dirs = ["skipped"]\nignore = ["SUI002"]\n')
+        _wait_for(capsys, lambda err: "Found 2 violation(s)" in err)
+
+        (skipped_dir / "mod.py").write_text("def skipped():\n    pass\n")
+        (proj_dir / "src" / "ow9xem9x" / "goodbye.py").write_text(
+            "def goodbye():\n    pass\n\ndef farewell():\n    pass\n",
+        )
+        err = _wait_for(capsys, lambda err: "farewell untested" in err)
+
+        assert "skipped" not in err
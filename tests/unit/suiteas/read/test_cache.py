@@ -0,0 +1,347 @@
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import suiteas.read.cache
+from suiteas.read.cache import (
+    CACHE_DB_NAME,
+    FactCache,
+    _get_cache_version,
+    get_config_fingerprint,
+    get_digest,
+)
+from suiteas.read.config import get_config
+from suiteas.read.file import AnalyzedFileSyntaxError, get_file_facts
+
+
+def _fail_to_parse(source: str, *, path: Path, parse_engine: str) -> None:
+    _ = source, parse_engine
+    msg = f"{path} should not have been parsed"
+    raise AssertionError(msg)
+
+
+def _fail_to_get_config(*, proj_dir: Path) -> None:
+    msg = f"The configuration of {proj_dir} should not have been resolved"
+    raise AssertionError(msg)
+
+
+def _backdate_tree(root_dir: Path) -> None:
+    for dir_path, _, file_names in os.walk(root_dir):
+        for name in [".", *file_names]:
+            os.utime(Path(dir_path) / name, ns=(1_000_000_000, 1_000_000_000))
+
+
+def _write_file(path: Path, source: str) -> None:
+    path.write_text(source, encoding="utf8")
+    # Backdate the file so its stat info is trusted by the cache.
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+
+class TestFactCache:
+    def test_creates_dir(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / ".suiteas_cache"
+        with FactCache(cache_dir):
+            pass
+        assert (cache_dir / CACHE_DB_NAME).is_file()
+        assert (cache_dir / ".gitignore").read_text().endswith("*\n")
+
+    def test_miss(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "import os\ndef hello():\n    pass\n")
+
+        with FactCache(tmp_path / "cache") as cache:
+            facts = cache.get_file_facts(file_path)
+
+        assert facts == get_file_facts(file_path)
+
+    def test_hit(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "class Banana:\n    def peel(self):\n        pass\n")
+
+        with FactCache(tmp_path / "cache") as cache:
+            facts = cache.get_file_facts(file_path)
+
+        monkeypatch.setattr(suiteas.read.cache, "get_source_facts", _fail_to_parse)
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_file_facts(file_path) == facts
+
+    def test_touched_but_unchanged(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def hello():\n    pass\n")
+
+        with FactCache(tmp_path / "cache") as cache:
+            facts = cache.get_file_facts(file_path)
+
+        os.utime(file_path, ns=(2_000_000_000, 2_000_000_000))
+        monkeypatch.setattr(suiteas.read.cache, "get_source_facts", _fail_to_parse)
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_file_facts(file_path) == facts
+
+    def test_changed(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def hello():\n    pass\n")
+        with FactCache(tmp_path / "cache") as cache:
+            cache.get_file_facts(file_path)
+
+        _write_file(file_path, "def goodbye():\n    pass\n")
+        with FactCache(tmp_path / "cache") as cache:
+            facts = cache.get_file_facts(file_path)
+
+        assert facts == ((("goodbye", 1, 0),), (), ())
+
+    def test_version_change(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def hello():\n    pass\n")
+        with FactCache(tmp_path / "cache") as cache:
+            cache.get_file_facts(file_path)
+
+        monkeypatch.setattr(suiteas.read.cache, "_get_cache_version", lambda: "new")
+        monkeypatch.setattr(suiteas.read.cache, "get_source_facts", _fail_to_parse)
+        with (
+            FactCache(tmp_path / "cache") as cache,
+            pytest.raises(AssertionError, match="should not have been parsed"),
+        ):
+            cache.get_file_facts(file_path)
+
+    def test_run(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_run(tmp_path) is None
+            cache.put_run(
+                tmp_path,
+                fingerprint="abc",
+                file_tree_json="{}",
+                violations_json="[]",
+            )
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_run(tmp_path) == ("abc", "{}", "[]")
+
+        monkeypatch.setattr(suiteas.read.cache, "_get_cache_version", lambda: "new")
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_run(tmp_path) is None
+
+    def test_version_modules(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        read_names: list[str] = []
+        read_bytes = Path.read_bytes
+
+        def _read_bytes(path: Path) -> bytes:
+            read_names.append(path.name)
+            return read_bytes(path)
+
+        monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+        _get_cache_version.cache_clear()
+        _get_cache_version()
+
+        # Editing the modules which build a project from the facts invalidates runs.
+        assert {"codebase.py", "pytest_file.py", "project.py"} <= set(read_names)
+
+    def test_version_once(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        n_reads = 0
+        read_bytes = Path.read_bytes
+
+        def _read_bytes(path: Path) -> bytes:
+            nonlocal n_reads
+            n_reads += 1
+            return read_bytes(path)
+
+        _get_cache_version.cache_clear()
+        with FactCache(tmp_path / "cache"):
+            pass
+        monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+        with FactCache(tmp_path / "cache"):
+            pass
+
+        # The modules are only hashed when the first cache is opened.
+        assert not n_reads
+
+    def test_in_memory(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        file_path = tmp_path / "example.py"
+        file_path.write_text("def hello():\n    pass\n")
+
+        with FactCache(None) as cache:
+            facts = cache.get_file_facts(file_path)
+            monkeypatch.setattr(
+                suiteas.read.cache,
+                "get_source_facts",
+                _fail_to_parse,
+            )
+            assert cache.get_file_facts(file_path) == facts
+
+        assert list(tmp_path.iterdir()) == [file_path]
+
+    def test_blob_id(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def hello():\n    pass\n")
+        with FactCache(tmp_path / "cache") as cache:
+            facts = cache.get_file_facts(file_path, blob_id="abc123")
+
+        # A file with a known blob ID isn't read at all, wherever it is.
+        monkeypatch.setattr(suiteas.read.cache, "get_source_facts", _fail_to_parse)
+        with FactCache(tmp_path / "cache") as cache:
+            other_path = tmp_path / "nonexistent.py"
+            assert cache.get_file_facts(other_path, blob_id="abc123") == facts
+            assert cache.get_cached_file_facts(other_path, blob_id="abc123") == facts
+
+    def test_new_blob_id(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def hello():\n    pass\n")
+        with FactCache(tmp_path / "cache") as cache:
+            cache.get_file_facts(file_path, blob_id="abc123")
+
+        _write_file(file_path, "def goodbye():\n    pass\n")
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_cached_file_facts(file_path, blob_id="def456") is None
+            facts = cache.get_file_facts(file_path, blob_id="def456")
+
+        assert facts == ((("goodbye", 1, 0),), (), ())
+
+    def test_lookup(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def hello():\n    pass\n")
+        with FactCache(tmp_path / "cache") as cache:
+            # A file without an entry isn't stat'ed.
+            assert cache.lookup_file_facts(file_path) == (None, None)
+            facts = cache.get_file_facts(file_path)
+            assert cache.lookup_file_facts(file_path) == (facts, file_path.stat())
+
+            _write_file(file_path, "def goodbye():\n    pass\n")
+            assert cache.lookup_file_facts(file_path) == (None, file_path.stat())
+
+    def test_nonexistent(self, tmp_path: Path) -> None:
+        with FactCache(tmp_path / "cache") as cache, pytest.raises(FileNotFoundError):
+            cache.get_file_facts(tmp_path / "face.py")
+
+    def test_invalid_syntax(self, files_parent_dir: Path, tmp_path: Path) -> None:
+        with (
+            FactCache(tmp_path / "cache") as cache,
+            pytest.raises(AnalyzedFileSyntaxError),
+        ):
+            cache.get_file_facts(files_parent_dir / "invalid_syntax.py")
+
+    @pytest.mark.parametrize("blob_id", [None, "abc123"])
+    def test_scan_accepts_invalid(self, tmp_path: Path, blob_id: str | None) -> None:
+        # The scan engine doesn't notice this syntax error, but the ast engine does,
+        # so facts cached by the former mustn't be served to the latter.
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def g():\n    return 1 +\n")
+        with FactCache(tmp_path / "cache") as cache:
+            cache.get_file_facts(file_path, parse_engine="scan", blob_id=blob_id)
+
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_cached_file_facts(file_path, blob_id=blob_id) is None
+            with pytest.raises(AnalyzedFileSyntaxError):
+                cache.get_file_facts(file_path, blob_id=blob_id)
+
+    def test_corrupt(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / CACHE_DB_NAME).write_bytes(b"not a database")
+
+        file_path = tmp_path / "example.py"
+        _write_file(file_path, "def hello():\n    pass\n")
+        with FactCache(cache_dir) as cache:
+            assert cache.get_file_facts(file_path) == get_file_facts(file_path)
+
+    def test_locked(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache_dir = tmp_path / "cache"
+        with FactCache(cache_dir):
+            pass
+        monkeypatch.setattr(suiteas.read.cache, "_BUSY_TIMEOUT_S", 0.01)
+        other_conn = sqlite3.connect(cache_dir / CACHE_DB_NAME)
+        other_conn.execute("BEGIN EXCLUSIVE")
+
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                FactCache(cache_dir)
+        finally:
+            other_conn.close()
+
+        # Another run's healthy cache is kept.
+        assert (cache_dir / CACHE_DB_NAME).stat().st_size > 0
+
+
+class TestGetConfig:
+    def test_hit(
+        self,
+        projs_parent_dir: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        _backdate_tree(proj_dir)
+        with FactCache(tmp_path / "cache") as cache:
+            config = cache.get_config(proj_dir)
+
+        monkeypatch.setattr(suiteas.read.cache, "get_config", _fail_to_get_config)
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_config(proj_dir) == config
+
+    def test_changed_dir(self, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "proj"
+        (proj_dir / "src" / "pkg_a").mkdir(parents=True)
+        (proj_dir / "tests" / "unit" / "pkg_a").mkdir(parents=True)
+        (proj_dir / "pyproject.toml").write_text("[tool.suiteas]\nignore = []\n")
+        _backdate_tree(proj_dir)
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_config(proj_dir).pkg_names == ["pkg_a"]
+
+        # The package names are found by listing the source directory.
+        (proj_dir / "src" / "pkg_b").mkdir()
+        (proj_dir / "tests" / "unit" / "pkg_b").mkdir()
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_config(proj_dir).pkg_names == ["pkg_a", "pkg_b"]
+
+    def test_changed_toml(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        _backdate_tree(proj_dir)
+        with FactCache(tmp_path / "cache") as cache:
+            cache.get_config(proj_dir)
+
+        with (proj_dir / "pyproject.toml").open(mode="a") as _f:
+            _f.write('parse_engine = "scan"\n')
+        with FactCache(tmp_path / "cache") as cache:
+            assert cache.get_config(proj_dir).parse_engine == "scan"
+
+
+class TestGetConfigFingerprint:
+    def test_changed_toml(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        _backdate_tree(proj_dir)
+        config = get_config(proj_dir=proj_dir)
+        fingerprint = get_config_fingerprint(proj_dir, config=config)
+        assert fingerprint is not None
+        assert get_config_fingerprint(proj_dir, config=config) == fingerprint
+
+        _write_file(proj_dir / "pyproject.toml", "[tool.suiteas]\nignore = []\n")
+        assert get_config_fingerprint(proj_dir, config=config) != fingerprint
+
+    def test_racy(self, projs_parent_dir: Path, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        config = get_config(proj_dir=proj_dir)
+        # Just modified, so its modification time can't be trusted.
+        (proj_dir / "pyproject.toml").touch()
+        assert get_config_fingerprint(proj_dir, config=config) is None
+
+
+class TestGetDigest:
+    def test_contents(self) -> None:
+        assert get_digest(b"x = 1\n") == get_digest(b"x = 1\n")
+        assert get_digest(b"x = 1\n") != get_digest(b"x = 2\n")
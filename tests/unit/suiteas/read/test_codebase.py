@@ -1,7 +1,12 @@
 from pathlib import Path
 
-from suiteas.domain import Class, Codebase, File, Func, ProjConfig
-from suiteas.read.codebase import get_codebase
+from suiteas.config import ProjConfig
+from suiteas.domain import Class, Codebase, CompactCodebase, File, Func
+from suiteas.read.codebase import (
+    compact_codebase_from_facts,
+    get_codebase,
+    get_module_name,
+)
 
 
 class TestGetCodebase:
@@ -99,3 +104,64 @@ class TestGetCodebase:
                 ),
             ],
         )
+
+    def test_compact(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+        config = ProjConfig(pkg_names=["ow9xem9x"])
+
+        codebase = get_codebase(
+            proj_dir=proj_dir,
+            config=config.model_copy(update={"codebase_store": "compact"}),
+        )
+
+        assert isinstance(codebase, CompactCodebase)
+        assert codebase.files == get_codebase(proj_dir=proj_dir, config=config).files
+
+
+class TestCompactCodebaseFromFacts:
+    def test_same_files(self) -> None:
+        root_dir = Path("/proj/src")
+        paths = [root_dir / "pkg" / "__init__.py", root_dir / "pkg" / "mod.py"]
+        facts_list = [
+            ((), (), ("pkg.mod.hello",)),
+            ((("hello", 1, 0),), (("Hello", 4, 0, True),), ()),
+        ]
+
+        codebase = compact_codebase_from_facts(paths, facts_list, root_dir=root_dir)
+
+        assert codebase.files == [
+            File(path=paths[0], funcs=[], clses=[], imported_objs=["pkg.mod.hello"]),
+            File(
+                path=paths[1],
+                funcs=[
+                    Func(
+                        name="hello",
+                        full_name="pkg.mod.hello",
+                        line_num=1,
+                        char_offset=0,
+                    ),
+                ],
+                clses=[
+                    Class(
+                        name="Hello",
+                        full_name="pkg.mod.Hello",
+                        line_num=4,
+                        char_offset=0,
+                        has_funcs=True,
+                    ),
+                ],
+                imported_objs=[],
+            ),
+        ]
+
+
+class TestGetModuleName:
+    def test_module(self) -> None:
+        root_dir = Path("/proj/src")
+        path = root_dir / "pkg" / "sub" / "mod.py"
+        assert get_module_name(path=path, root_dir=root_dir) == "pkg.sub.mod"
+
+    def test_package(self) -> None:
+        root_dir = Path("/proj/src")
+        path = root_dir / "pkg" / "sub" / "__init__.py"
+        assert get_module_name(path=path, root_dir=root_dir) == "pkg.sub"
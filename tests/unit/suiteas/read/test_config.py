@@ -3,12 +3,14 @@ from pathlib import Path
 import pytest
 import tomli
 
-from suiteas.domain import ProjConfig
+from suiteas.config import ProjConfig
 from suiteas.read.config import (
     ConfigFileError,
     EmptyConfigFileError,
     TOMLProjConfig,
     get_config,
+    get_config_dirs,
+    get_file_filter,
     get_toml_config,
 )
 
@@ -98,6 +100,85 @@ class TestGetConfig:
             use_consolidated_tests_dir=True,
         )
 
+    def test_parse_engine(self, tmp_path: Path) -> None:
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "tests" / "unit" / "pkg").mkdir(parents=True)
+        (tmp_path / "pyproject.toml").write_text(
+            '[tool.suiteas]\npkg_names = ["pkg"]\nparse_engine = "scan"\n',
+        )
+
+        assert get_config(proj_dir=tmp_path).parse_engine == "scan"
+
+    def test_exclude(self, tmp_path: Path) -> None:
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "tests" / "unit" / "pkg").mkdir(parents=True)
+        (tmp_path / "pyproject.toml").write_text(
+            "[tool.suiteas]\n"
+            'pkg_names = ["pkg"]\n'
+            'exclude = ["*_pb2.py"]\n'
+            "exclude_generated = true\n"
+            "max_file_bytes = 100000\n",
+        )
+
+        config = get_config(proj_dir=tmp_path)
+
+        assert (config.exclude, config.exclude_generated, config.max_file_bytes) == (
+            ["*_pb2.py"],
+            True,
+            100_000,
+        )
+
+    def test_bad_max_file_bytes(self, tmp_path: Path) -> None:
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "tests" / "unit" / "pkg").mkdir(parents=True)
+        (tmp_path / "pyproject.toml").write_text(
+            '[tool.suiteas]\npkg_names = ["pkg"]\nmax_file_bytes = 0\n',
+        )
+
+        with pytest.raises(ConfigFileError, match=r"max_file_bytes\n.* greater than 0"):
+            get_config(proj_dir=tmp_path)
+
+
+class TestGetFileFilter:
+    def test_default(self, tmp_path: Path) -> None:
+        config = ProjConfig(pkg_names=["pkg"])
+
+        assert get_file_filter(config, proj_dir=tmp_path) is None
+
+    def test_exclude(self, tmp_path: Path) -> None:
+        config = ProjConfig(pkg_names=["pkg"], exclude=["src/pkg/gen"])
+
+        file_filter = get_file_filter(config, proj_dir=tmp_path)
+
+        assert file_filter is not None
+        assert file_filter.is_excluded_path(str(tmp_path / "src" / "pkg" / "gen"))
+        assert not file_filter.is_excluded_path(str(tmp_path / "src" / "pkg"))
+
+
+class TestGetConfigDirs:
+    def test_default(self, tmp_path: Path) -> None:
+        assert get_config_dirs(
+            proj_dir=tmp_path,
+            config=ProjConfig(pkg_names=["pkg"]),
+        ) == [
+            tmp_path,
+            tmp_path / "src",
+            tmp_path / "tests",
+            tmp_path / "tests" / "unit",
+        ]
+
+    def test_consolidated(self, tmp_path: Path) -> None:
+        assert get_config_dirs(
+            proj_dir=tmp_path,
+            config=ProjConfig(
+                pkg_names=["pkg"],
+                src_rel_path=Path("."),
+                tests_rel_path=Path("lib/tests"),
+                unittest_dir_name=Path("."),
+                use_consolidated_tests_dir=True,
+            ),
+        ) == [tmp_path, tmp_path / "lib", tmp_path / "lib" / "tests"]
+
 
 class TestGetTOMLConfig:
     def test_nonexistent(self) -> None:
@@ -122,6 +203,10 @@ class TestGetTOMLConfig:
             setuptools_pkg_names=["foo_other", "bar_other"],
             project_name="example",
             ignore=["SUI002"],
+            parse_engine="scan",
+            exclude_dirs=["vendor"],
+            file_source="git",
+            codebase_store="compact",
         )
 
     def test_syntax_error(self, config_files_parent_dir: Path) -> None:
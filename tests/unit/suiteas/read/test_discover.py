@@ -0,0 +1,320 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from suiteas.read.discover import (
+    FileFilter,
+    discover_py_files,
+    filter_existing_path_strs,
+    find_files,
+    find_py_files,
+    get_dir_name_matcher,
+    get_path_matcher,
+    sort_paths,
+)
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+class TestDiscoverPyFiles:
+    def test_walk(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "pkg" / "mod.py")
+        assert discover_py_files(tmp_path) == ([tmp_path / "pkg" / "mod.py"], [None])
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="Needs git.")
+    def test_git(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "pkg" / "mod.py")
+        _touch(tmp_path / "pkg" / "vendor" / "mod.py")
+        subprocess.run(["git", "init"], cwd=tmp_path, check=True)  # noqa: S603, S607
+        subprocess.run(
+            ["git", "add", "."],  # noqa: S603, S607
+            cwd=tmp_path,
+            check=True,
+        )
+        _touch(tmp_path / "pkg" / "untracked.py")
+        _touch(tmp_path / "pkg" / "ignored.py")
+        (tmp_path / ".gitignore").write_text("ignored.py\n")
+
+        paths, blob_ids = discover_py_files(
+            tmp_path,
+            exclude_dirs=["vendor"],
+            file_source="git",
+        )
+
+        # The SHA-1 of an empty blob.
+        assert paths == [tmp_path / "pkg" / "mod.py", tmp_path / "pkg" / "untracked.py"]
+        assert blob_ids == ["e69de29bb2d1d6434b8b29ae775ad8c2e48c5391", None]
+
+    def test_git_not_a_repo(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "pkg" / "mod.py")
+        assert discover_py_files(tmp_path, file_source="git") == (
+            [tmp_path / "pkg" / "mod.py"],
+            [None],
+        )
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="Needs git.")
+    def test_git_file_filter(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "pkg" / "mod.py")
+        _touch(tmp_path / "pkg" / "mod_pb2.py")
+        subprocess.run(["git", "init"], cwd=tmp_path, check=True)  # noqa: S603, S607
+        subprocess.run(
+            ["git", "add", "."],  # noqa: S603, S607
+            cwd=tmp_path,
+            check=True,
+        )
+
+        paths, blob_ids = discover_py_files(
+            tmp_path,
+            file_filter=FileFilter(base_dir=tmp_path, exclude=["*_pb2.py"]),
+            file_source="git",
+        )
+
+        assert paths == [tmp_path / "pkg" / "mod.py"]
+        assert blob_ids == ["e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"]
+
+
+class TestFindPyFiles:
+    def test_same_as_glob(self, test_assets_dir: Path) -> None:
+        assert find_py_files(test_assets_dir) == sorted(
+            path
+            for path in test_assets_dir.glob("**/*.py")
+            if not any(part.startswith(".") for part in path.parts)
+        )
+
+    def test_excluded_dirs(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "pkg" / "mod.py")
+        _touch(tmp_path / "pkg" / "__pycache__" / "mod.py")
+        _touch(tmp_path / "pkg" / ".hidden" / "mod.py")
+        _touch(tmp_path / "pkg" / "pkg.egg-info" / "mod.py")
+        _touch(tmp_path / "pkg" / "venv" / "pyvenv.cfg")
+        _touch(tmp_path / "pkg" / "venv" / "lib" / "mod.py")
+        _touch(tmp_path / "pkg" / "vendor" / "mod.py")
+        assert find_py_files(tmp_path, exclude_dirs=["vend*"]) == [
+            tmp_path / "pkg" / "mod.py",
+        ]
+
+    def test_file_filter(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _touch(tmp_path / "pkg" / "mod.py")
+        _touch(tmp_path / "pkg" / "mod_pb2.py")
+        _touch(tmp_path / "pkg" / "models" / "mod.py")
+        _touch(tmp_path / "other" / "models" / "mod.py")
+        listed_dir_strs: list[str] = []
+        scandir = os.scandir
+
+        def _scandir(path: str) -> "os._ScandirIterator[str]":
+            listed_dir_strs.append(path)
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", _scandir)
+        file_filter = FileFilter(
+            base_dir=tmp_path,
+            exclude=["*_pb2.py", "pkg/models"],
+        )
+
+        assert find_py_files(tmp_path, file_filter=file_filter) == [
+            tmp_path / "other" / "models" / "mod.py",
+            tmp_path / "pkg" / "mod.py",
+        ]
+        # Excluded directories aren't listed.
+        assert os.fspath(tmp_path / "pkg" / "models") not in listed_dir_strs
+
+    def test_non_py_files(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "mod.pyc")
+        _touch(tmp_path / "mod.txt")
+        (tmp_path / "dir.py").mkdir()
+        assert find_py_files(tmp_path) == []
+
+    @pytest.mark.skipif(os.name == "nt", reason="Symlinks need privileges on Windows.")
+    def test_symlink_loop(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "pkg" / "mod.py")
+        (tmp_path / "pkg" / "loop").symlink_to(tmp_path / "pkg")
+        assert find_py_files(tmp_path) == [tmp_path / "pkg" / "mod.py"]
+
+    @pytest.mark.skipif(os.name == "nt", reason="Symlinks need privileges on Windows.")
+    def test_symlinked_dir(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "other" / "mod.py")
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "link").symlink_to(tmp_path / "other")
+        assert find_py_files(tmp_path / "pkg") == [tmp_path / "pkg" / "link" / "mod.py"]
+
+    def test_nonexistent(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            find_py_files(tmp_path / "nonexistent")
+
+
+class TestFindFiles:
+    def test_names(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "pyproject.toml")
+        _touch(tmp_path / "sub" / "pyproject.toml")
+        _touch(tmp_path / "sub" / "other.toml")
+        _touch(tmp_path / ".venv" / "pyproject.toml")
+        assert find_files(tmp_path, is_file_name="pyproject.toml".__eq__) == [
+            tmp_path / "pyproject.toml",
+            tmp_path / "sub" / "pyproject.toml",
+        ]
+
+
+class TestFilterExistingPathStrs:
+    def test_existing(self, tmp_path: Path) -> None:
+        for rel_path in ("a/one.py", "a/two.py", "b/three.py", "c/four.py"):
+            _touch(tmp_path / rel_path)
+        path_strs = [
+            os.fspath(tmp_path / rel_path)
+            for rel_path in (
+                "a/one.py",
+                "a/missing.py",
+                "a/two.py",
+                "b/three.py",
+                "c/missing.py",
+                "missing/one.py",
+                "missing/two.py",
+            )
+        ]
+        assert filter_existing_path_strs(path_strs) == [
+            os.fspath(tmp_path / rel_path)
+            for rel_path in ("a/one.py", "a/two.py", "b/three.py")
+        ]
+
+
+class TestFileFilter:
+    def test_exclude(self, tmp_path: Path) -> None:
+        file_filter = FileFilter(base_dir=tmp_path, exclude=["gen/*.py"])
+        path_strs = [os.fspath(tmp_path / "gen" / "a.py"), os.fspath(tmp_path / "b.py")]
+
+        assert file_filter.is_excluded_path(path_strs[0])
+        assert not file_filter.is_excluded_path(path_strs[1])
+        assert file_filter.filter_path_strs(path_strs) == path_strs[1:]
+
+    def test_exclude_generated(self, tmp_path: Path) -> None:
+        paths = [tmp_path / "a.py", tmp_path / "b.py", tmp_path / "c.py"]
+        paths[0].write_text('"""Get things."""\n')
+        paths[1].write_text("# @" + "generated by a tool\n")
+        paths[2].write_text("# Generated by protoc.  DO NOT " + "EDIT!\n")
+        file_filter = FileFilter(base_dir=tmp_path, exclude_generated=True)
+
+        assert file_filter.filter_path_strs(map(os.fspath, paths)) == [
+            os.fspath(paths[0]),
+        ]
+
+    def test_max_file_bytes(self, tmp_path: Path) -> None:
+        paths = [tmp_path / "small.py", tmp_path / "large.py"]
+        paths[0].write_text("x = 1\n")
+        paths[1].write_text("x = 1\n" * 100)
+
+        for exclude_generated in [False, True]:
+            file_filter = FileFilter(
+                base_dir=tmp_path,
+                exclude_generated=exclude_generated,
+                max_file_bytes=100,
+            )
+            assert file_filter.filter_path_strs(map(os.fspath, paths)) == [
+                os.fspath(paths[0]),
+            ]
+
+    def test_nonexistent(self, tmp_path: Path) -> None:
+        path_str = os.fspath(tmp_path / "nope.py")
+        file_filter = FileFilter(base_dir=tmp_path, exclude_generated=True)
+
+        assert file_filter.filter_path_strs([path_str]) == [path_str]
+
+
+class TestSortPaths:
+    def test_same_as_sorted(self) -> None:
+        paths = [
+            Path("pkg/a_b.py"),
+            Path("pkg/a/b.py"),
+            Path("pkg/a.py"),
+            Path("pkg/A.py"),
+            Path("pkg-2/a.py"),
+            Path("pkg/a/__init__.py"),
+        ]
+        assert sort_paths(paths) == sorted(paths)
+
+
+class TestGetDirNameMatcher:
+    def test_literal(self) -> None:
+        is_match = get_dir_name_matcher(["vendor"])
+        assert is_match("vendor")
+        assert not is_match("vendored")
+
+    def test_glob(self) -> None:
+        is_match = get_dir_name_matcher(["vendor", "*_pb2", "build?"])
+        assert is_match("vendor")
+        assert is_match("api_pb2")
+        assert is_match("build2")
+        assert not is_match("build")
+        assert not is_match("api_pb2_grpc")
+
+
+class TestGetPathMatcher:
+    def test_name(self, tmp_path: Path) -> None:
+        matches = get_path_matcher(["*_pb2.py", "models"], base_dir=tmp_path)
+
+        assert matches(os.fspath(tmp_path / "src" / "pkg" / "api_pb2.py"))
+        assert matches(os.fspath(tmp_path / "models" / "user.py"))
+        assert matches(os.fspath(tmp_path / "src" / "models"))
+        assert not matches(os.fspath(tmp_path / "src" / "pkg" / "api.py"))
+        assert not matches(os.fspath(tmp_path / "src" / "my_models" / "user.py"))
+
+    def test_relative_path(self, tmp_path: Path) -> None:
+        matches = get_path_matcher(["src/pkg/gen", "/src/*/orm.py"], base_dir=tmp_path)
+
+        assert matches(os.fspath(tmp_path / "src" / "pkg" / "gen"))
+        assert matches(os.fspath(tmp_path / "src" / "pkg" / "gen" / "a.py"))
+        assert matches(os.fspath(tmp_path / "src" / "pkg" / "orm.py"))
+        assert not matches(os.fspath(tmp_path / "src" / "pkg" / "general.py"))
+        assert not matches(os.fspath(tmp_path / "lib" / "src" / "pkg" / "gen"))
+
+    def test_wildcards_within_component(self, tmp_path: Path) -> None:
+        matches = get_path_matcher(["t*.py", "src/?/orm.py"], base_dir=tmp_path)
+
+        assert matches(os.fspath(tmp_path / "src" / "pkg" / "tools.py"))
+        assert matches(os.fspath(tmp_path / "src" / "a" / "orm.py"))
+        # Wildcards don't match across directories, e.g. "tools/foo".
+        assert not matches(os.fspath(tmp_path / "src" / "pkg" / "tools" / "foo.py"))
+        assert not matches(os.fspath(tmp_path / "src" / "a" / "b" / "orm.py"))
+
+    def test_any_depth(self, tmp_path: Path) -> None:
+        matches = get_path_matcher(["src/**/models"], base_dir=tmp_path)
+
+        assert matches(os.fspath(tmp_path / "src" / "models" / "user.py"))
+        assert matches(os.fspath(tmp_path / "src" / "a" / "b" / "models"))
+        assert not matches(os.fspath(tmp_path / "lib" / "models"))
+
+    def test_char_sets(self, tmp_path: Path) -> None:
+        matches = get_path_matcher(["[!_]x.py", "a[b.py"], base_dir=tmp_path)
+
+        assert matches(os.fspath(tmp_path / "ax.py"))
+        assert matches(os.fspath(tmp_path / "a[b.py"))
+        assert not matches(os.fspath(tmp_path / "_x.py"))
+        assert not matches(os.fspath(tmp_path / "a" / "x.py"))
+
+    def test_relative_base_dir(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        matches = get_path_matcher(["src/pkg/gen"], base_dir=Path())
+
+        assert matches(os.fspath(tmp_path / "src" / "pkg" / "gen" / "a.py"))
+        assert matches(os.fspath(Path("src", "pkg", "gen", "a.py")))
+        assert not matches(os.fspath(tmp_path / "src" / "pkg" / "a.py"))
+
+    def test_outside_base_dir(self, tmp_path: Path) -> None:
+        matches = get_path_matcher(["*.py"], base_dir=tmp_path / "proj")
+
+        assert not matches(os.fspath(tmp_path / "a.py"))
+
+    def test_no_patterns(self, tmp_path: Path) -> None:
+        assert not get_path_matcher([], base_dir=tmp_path)(os.fspath(tmp_path))
@@ -1,3 +1,5 @@
+import mmap
+from collections import Counter
 from pathlib import Path
 
 import pytest
@@ -8,7 +10,13 @@ from suiteas.read.file import (
     _FLOW_CTRL,
     AnalyzedFileSyntaxError,
     FlowCtrlTree,
+    ParseEngine,
+    decode_source,
+    file_from_facts,
     get_file,
+    get_file_facts,
+    get_source_facts,
+    open_source,
 )
 from suiteas_test.config import FAST_TESTS
 
@@ -25,7 +33,7 @@ class TestGetFile:
         expected_file = File(path=file_path, funcs=[], clses=[], imported_objs=[])
 
         assert type(file) == File
-        assert file.model_dump() == expected_file.model_dump()
+        assert file == expected_file
 
     def test_one_func(self, files_parent_dir: Path) -> None:
         file_path = files_parent_dir / "one_func.py"
@@ -46,7 +54,7 @@ class TestGetFile:
         )
 
         assert type(file) == File
-        assert file.model_dump() == expected_file.model_dump()
+        assert file == expected_file
 
     def test_hidden_func(self, files_parent_dir: Path) -> None:
         """A case where the function is hidden in an if-statement."""
@@ -68,7 +76,7 @@ class TestGetFile:
         )
 
         assert type(file) == File
-        assert file.model_dump() == expected_file.model_dump()
+        assert file == expected_file
 
     def test_branch_logic_func(self, files_parent_dir: Path) -> None:
         """A case where the function is defined piecewise between if/for-statements."""
@@ -96,7 +104,7 @@ class TestGetFile:
         )
 
         assert type(file) == File
-        assert file.model_dump() == expected_file.model_dump()
+        assert file == expected_file
 
     def test_invalid_syntax(self, files_parent_dir: Path) -> None:
         """A case where the file has invalid syntax."""
@@ -125,7 +133,7 @@ class TestGetFile:
         )
 
         assert type(file) == File
-        assert file.model_dump() == expected_file.model_dump()
+        assert file == expected_file
 
     def test_lambda_func(self, files_parent_dir: Path) -> None:
         file_path = files_parent_dir / "lambda_func.py"
@@ -139,7 +147,7 @@ class TestGetFile:
         )
 
         assert type(file) == File
-        assert file.model_dump() == expected_file.model_dump()
+        assert file == expected_file
 
     def test_multi(self, files_parent_dir: Path) -> None:
         file_path = files_parent_dir / "multi.py"
@@ -174,7 +182,7 @@ class TestGetFile:
         )
 
         assert type(file) == File
-        assert file.model_dump() == expected_file.model_dump()
+        assert file == expected_file
 
     @pytest.mark.skipif(FAST_TESTS, reason="Test is slow.")
     @pytest.mark.parametrize("seed", range(10))
@@ -194,6 +202,150 @@ class TestGetFile:
 
         get_file(file_path, module_name="fakey.mcfake.unicode_backquotes")
 
+
+class TestGetFileFacts:
+    def test_nonexistent(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            get_file_facts(tmp_path / "face.py")
+
+    def test_multi(self, files_parent_dir: Path) -> None:
+        facts = get_file_facts(files_parent_dir / "multi.py")
+
+        assert facts == (
+            (("hello", 1, 0), ("goodbye", 4, 0)),
+            (("Banana", 7, 0, False),),
+            (),
+        )
+
+    def test_syscalls(self, files_parent_dir: Path, os_calls: Counter[str]) -> None:
+        get_file_facts(files_parent_dir / "multi.py")
+
+        # Opened without checking it exists first, and read in one go.
+        assert os_calls == {"open": 1, "fstat": 1, "read": 1}
+
+
+class TestGetSourceFacts:
+    def test_imports(self) -> None:
+        source = "import os.path\nfrom fakey.mcfake import face, place\n"
+        facts = get_source_facts(source, path=Path("example.py"))
+
+        assert facts == ((), (), ("os.path", "fakey.mcfake.face", "fakey.mcfake.place"))
+
+    def test_invalid_syntax(self) -> None:
+        with pytest.raises(AnalyzedFileSyntaxError):
+            get_source_facts("def (:", path=Path("example.py"))
+
+    def test_scan_engine(self, files_parent_dir: Path) -> None:
+        source = (files_parent_dir / "multi.py").read_text(encoding="utf8")
+
+        assert get_source_facts(
+            source,
+            path=Path("multi.py"),
+            parse_engine="scan",
+        ) == get_source_facts(source, path=Path("multi.py"))
+
+    def test_scan_engine_fallback(self) -> None:
+        # A form feed in the indentation is valid, but too unusual to scan.
+        facts = get_source_facts(
+            "\fimport os\n",
+            path=Path("example.py"),
+            parse_engine="scan",
+        )
+
+        assert facts == ((), (), ("os",))
+
+    @pytest.mark.parametrize("parse_engine", ["ast", "scan"])
+    def test_encoding_cookie(self, parse_engine: ParseEngine) -> None:
+        source = "# -*- coding: latin-1 -*-\ndef caf\xe9():\n    pass\n"
+        facts = get_source_facts(
+            source.encode("latin-1"),
+            path=Path("example.py"),
+            parse_engine=parse_engine,
+        )
+
+        assert facts == ((("caf\xe9", 2, 0),), (), ())
+
+    @pytest.mark.parametrize("parse_engine", ["ast", "scan"])
+    def test_invalid_encoding(self, parse_engine: ParseEngine) -> None:
+        with pytest.raises(AnalyzedFileSyntaxError):
+            get_source_facts(
+                b"def caf\xe9():\n    pass\n",
+                path=Path("example.py"),
+                parse_engine=parse_engine,
+            )
+
+
+class TestOpenSource:
+    def test_small(self, files_parent_dir: Path) -> None:
+        path = files_parent_dir / "multi.py"
+        with open_source(path) as (contents, stat):
+            assert contents == path.read_bytes()
+            assert stat.st_size == len(contents)
+
+    def test_large(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("suiteas.read.file._MMAP_MIN_N_BYTES", 1)
+        path = tmp_path / "large.py"
+        path.write_text("def hello():\n    pass\n")
+
+        with open_source(path) as (contents, _):
+            assert isinstance(contents, mmap.mmap)
+            assert get_source_facts(contents, path=path) == ((("hello", 1, 0),), (), ())
+        assert contents.closed
+
+    def test_nonexistent(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError), open_source(tmp_path / "face.py"):
+            pass
+
+
+class TestDecodeSource:
+    def test_utf8_default(self) -> None:
+        assert decode_source("caf\xe9 = 1\n".encode()) == "caf\xe9 = 1\n"
+
+    def test_bom(self) -> None:
+        assert decode_source(b"\xef\xbb\xbfx = 1\n") == "x = 1\n"
+
+    def test_mmap(self, tmp_path: Path) -> None:
+        path = tmp_path / "example.py"
+        path.write_bytes(b"# coding: latin-1\nx = '\xe9'\n")
+
+        with path.open(mode="rb") as _f, mmap.mmap(
+            _f.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        ) as contents:
+            assert decode_source(contents) == "# coding: latin-1\nx = '\xe9'\n"
+
+
 class TestFlowCtrlTree:
     def test_correspondence(self) -> None:
         assert tuple(FlowCtrlTree.__args__) == _FLOW_CTRL
+
+
+class TestFileFromFacts:
+    def test_full_names(self) -> None:
+        path = Path("/proj/src/pkg/mod.py")
+        facts = ((("hello", 1, 0),), (("Hello", 4, 0, False),), ("os.path",))
+
+        file = file_from_facts(path, facts, module_name="pkg.mod")
+
+        assert file == File(
+            path=path,
+            funcs=[
+                Func(
+                    name="hello",
+                    full_name="pkg.mod.hello",
+                    line_num=1,
+                    char_offset=0,
+                ),
+            ],
+            clses=[
+                Class(
+                    name="Hello",
+                    full_name="pkg.mod.Hello",
+                    line_num=4,
+                    char_offset=0,
+                    has_funcs=False,
+                ),
+            ],
+            imported_objs=["os.path"],
+        )
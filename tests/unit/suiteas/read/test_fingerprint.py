@@ -0,0 +1,114 @@
+import os
+from pathlib import Path
+
+from suiteas.read.fingerprint import FileTree, get_changed_dirs, get_file_tree
+
+# A modification time long enough ago to be trusted, in nanoseconds.
+_OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+
+def _write(path: Path, contents: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    os.utime(path, ns=(_OLD_MTIME_NS, _OLD_MTIME_NS))
+    return path
+
+
+def _get_tree(paths: list[Path], *, root_dir: Path) -> FileTree:
+    file_tree = get_file_tree(paths, root_dir=root_dir)
+    assert file_tree is not None
+    return file_tree
+
+
+class TestFileTree:
+    def test_json(self, tmp_path: Path) -> None:
+        file_tree = _get_tree([_write(tmp_path / "a" / "b.py")], root_dir=tmp_path)
+
+        assert FileTree.from_json(file_tree.to_json()) == file_tree
+
+    def test_empty(self) -> None:
+        assert FileTree(hashes_by_rel_dir={}).root_hash
+
+
+class TestGetFileTree:
+    def test_dirs(self, tmp_path: Path) -> None:
+        paths = [_write(tmp_path / "src" / "pkg" / "sub" / "mod.py")]
+
+        file_tree = _get_tree(paths, root_dir=tmp_path)
+
+        assert sorted(file_tree.hashes_by_rel_dir) == [
+            "",
+            "src",
+            "src/pkg",
+            "src/pkg/sub",
+        ]
+
+    def test_same(self, tmp_path: Path) -> None:
+        paths = [_write(tmp_path / "a.py"), _write(tmp_path / "b" / "c.py")]
+
+        assert _get_tree(paths, root_dir=tmp_path) == _get_tree(
+            paths[::-1],
+            root_dir=tmp_path,
+        )
+
+    def test_changed(self, tmp_path: Path) -> None:
+        paths = [_write(tmp_path / "a.py"), _write(tmp_path / "b" / "c.py")]
+        old_tree = _get_tree(paths, root_dir=tmp_path)
+
+        _write(paths[1], "x = 1\n")
+        new_tree = _get_tree(paths, root_dir=tmp_path)
+
+        assert new_tree.root_hash != old_tree.root_hash
+        assert new_tree.hashes_by_rel_dir[""][1] == old_tree.hashes_by_rel_dir[""][1]
+
+    def test_blob_ids(self, tmp_path: Path) -> None:
+        # Files identified by their blob IDs aren't even stat'ed.
+        paths = [tmp_path / "a.py", tmp_path / "b.py"]
+
+        old_tree = get_file_tree(paths, root_dir=tmp_path, blob_ids=["1", "2"])
+        new_tree = get_file_tree(paths, root_dir=tmp_path, blob_ids=["1", "3"])
+
+        assert old_tree is not None
+        assert new_tree is not None
+        assert old_tree.root_hash != new_tree.root_hash
+
+    def test_recently_modified(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.py"
+        path.touch()
+
+        assert get_file_tree([path], root_dir=tmp_path) is None
+
+    def test_nonexistent(self, tmp_path: Path) -> None:
+        assert get_file_tree([tmp_path / "a.py"], root_dir=tmp_path) is None
+
+
+class TestGetChangedDirs:
+    def test_unchanged(self, tmp_path: Path) -> None:
+        file_tree = _get_tree([_write(tmp_path / "a" / "b.py")], root_dir=tmp_path)
+
+        assert get_changed_dirs(file_tree, file_tree) == []
+
+    def test_changed(self, tmp_path: Path) -> None:
+        paths = [
+            _write(tmp_path / "a.py"),
+            _write(tmp_path / "b" / "c" / "d.py"),
+            _write(tmp_path / "e" / "f.py"),
+        ]
+        old_tree = _get_tree(paths, root_dir=tmp_path)
+
+        _write(paths[1], "x = 1\n")
+        new_tree = _get_tree(paths, root_dir=tmp_path)
+
+        assert get_changed_dirs(old_tree, new_tree) == ["b/c"]
+
+    def test_added_and_removed(self, tmp_path: Path) -> None:
+        old_tree = _get_tree(
+            [_write(tmp_path / "a.py"), _write(tmp_path / "b" / "c.py")],
+            root_dir=tmp_path,
+        )
+        new_tree = _get_tree(
+            [_write(tmp_path / "a.py"), _write(tmp_path / "d" / "e" / "f.py")],
+            root_dir=tmp_path,
+        )
+
+        assert get_changed_dirs(old_tree, new_tree) == ["b", "d", "d/e"]
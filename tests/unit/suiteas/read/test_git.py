@@ -0,0 +1,126 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from suiteas.read.git import GitError, get_changed_paths, get_tracked_paths
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="Needs git.")
+
+
+def _git(*args: str, cwd: Path) -> None:
+    subprocess.run(
+        [  # noqa: S603, S607
+            "git",
+            "-c",
+            "user.name=suiteas",
+            "-c",
+            "user.email=suiteas@example.com",
+            "-c",
+            "commit.gpgsign=false",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture()
+def repo_dir(tmp_path: Path) -> Path:
+    """Fixture for a git repository with a feature branch checked-out."""
+    repo_dir = tmp_path / "repo"
+    (repo_dir / "src" / "pkg").mkdir(parents=True)
+    (repo_dir / "src" / "pkg" / "unchanged.py").write_text("")
+    (repo_dir / "src" / "pkg" / "modified.py").write_text("")
+    (repo_dir / "src" / "pkg" / "deleted.py").write_text("")
+    (repo_dir / "src" / "pkg" / "old_name.py").write_text("x = 1\n")
+    _git("init", "-b", "main", cwd=repo_dir)
+    _git("add", ".", cwd=repo_dir)
+    _git("commit", "-m", "Initial commit", cwd=repo_dir)
+    _git("checkout", "-b", "feature", cwd=repo_dir)
+    return repo_dir
+
+
+class TestGetChangedPaths:
+    def test_no_changes(self, repo_dir: Path) -> None:
+        assert get_changed_paths(repo_dir, since="main") == []
+
+    def test_changes(self, repo_dir: Path) -> None:
+        pkg_dir = repo_dir / "src" / "pkg"
+        (pkg_dir / "modified.py").write_text("def hello():\n    pass\n")
+        (pkg_dir / "deleted.py").unlink()
+        _git("mv", "src/pkg/old_name.py", "src/pkg/new_name.py", cwd=repo_dir)
+        _git("commit", "-am", "Change things", cwd=repo_dir)
+        (pkg_dir / "added.py").write_text("")
+        (pkg_dir / "notes.txt").write_text("")
+
+        assert get_changed_paths(repo_dir, since="main") == [
+            repo_dir.resolve() / "src" / "pkg" / "added.py",
+            repo_dir.resolve() / "src" / "pkg" / "deleted.py",
+            repo_dir.resolve() / "src" / "pkg" / "modified.py",
+            repo_dir.resolve() / "src" / "pkg" / "new_name.py",
+            repo_dir.resolve() / "src" / "pkg" / "old_name.py",
+        ]
+
+    def test_since_merge_base(self, repo_dir: Path) -> None:
+        """Changes made on the base branch after branching are not included."""
+        _git("checkout", "main", cwd=repo_dir)
+        (repo_dir / "src" / "pkg" / "unchanged.py").write_text("x = 2\n")
+        _git("commit", "-am", "Change on main", cwd=repo_dir)
+        _git("checkout", "feature", cwd=repo_dir)
+
+        assert get_changed_paths(repo_dir, since="main") == []
+
+    def test_bad_ref(self, repo_dir: Path) -> None:
+        with pytest.raises(GitError):
+            get_changed_paths(repo_dir, since="nonexistent")
+
+    def test_not_a_repo(self, tmp_path: Path) -> None:
+        with pytest.raises(GitError):
+            get_changed_paths(tmp_path, since="main")
+
+
+def _get_blob_id(path: Path) -> str:
+    return subprocess.run(
+        ["git", "hash-object", path],  # noqa: S603, S607
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+class TestGetTrackedPaths:
+    def test_unchanged(self, repo_dir: Path) -> None:
+        pkg_dir = repo_dir / "src" / "pkg"
+        assert get_tracked_paths(pkg_dir) == {
+            pkg_dir / name: _get_blob_id(pkg_dir / name)
+            for name in ("deleted.py", "modified.py", "old_name.py", "unchanged.py")
+        }
+
+    def test_changes(self, repo_dir: Path) -> None:
+        pkg_dir = repo_dir / "src" / "pkg"
+        (pkg_dir / "modified.py").write_text("def hello():\n    pass\n")
+        (pkg_dir / "deleted.py").unlink()
+        (pkg_dir / "untracked.py").write_text("")
+        (pkg_dir / "staged.py").write_text("x = 1\n")
+        _git("add", "src/pkg/staged.py", cwd=repo_dir)
+
+        assert get_tracked_paths(pkg_dir) == {
+            pkg_dir / "modified.py": None,
+            pkg_dir / "old_name.py": _get_blob_id(pkg_dir / "old_name.py"),
+            pkg_dir / "staged.py": _get_blob_id(pkg_dir / "staged.py"),
+            pkg_dir / "unchanged.py": _get_blob_id(pkg_dir / "unchanged.py"),
+            pkg_dir / "untracked.py": None,
+        }
+
+    def test_ignored(self, repo_dir: Path) -> None:
+        pkg_dir = repo_dir / "src" / "pkg"
+        (pkg_dir / "ignored.py").write_text("")
+        (repo_dir / ".gitignore").write_text("ignored.py\n")
+        assert pkg_dir / "ignored.py" not in get_tracked_paths(pkg_dir)
+
+    def test_not_a_repo(self, tmp_path: Path) -> None:
+        with pytest.raises(GitError):
+            get_tracked_paths(tmp_path)
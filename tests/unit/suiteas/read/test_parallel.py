@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from suiteas.core.profile import Profiler
+from suiteas.core.schedule import ScheduledExecutor
+from suiteas.read.cache import FactCache
+from suiteas.read.file import AnalyzedFileSyntaxError, get_file_facts
+from suiteas.read.parallel import get_files_facts
+
+_VALID_FILE_NAMES = [
+    "branch_logic_func.py",
+    "empty.py",
+    "lambda_func.py",
+    "multi.py",
+    "nested_func.py",
+    "one_class.py",
+    "one_func.py",
+    "test_one_class_one_func.py",
+    "test_two_classes.py",
+    "unicode_backquotes.py",
+]
+
+
+class TestGetFilesFacts:
+    def test_serial(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        assert get_files_facts(paths) == [get_file_facts(path) for path in paths]
+
+    def test_threads(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            facts_list = get_files_facts(paths, executor=executor)
+        assert facts_list == get_files_facts(paths)
+
+    def test_processes(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            facts_list = get_files_facts(paths, executor=executor)
+        assert facts_list == get_files_facts(paths)
+
+    def test_spawned_processes(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            facts_list = get_files_facts(paths, executor=executor)
+        assert facts_list == get_files_facts(paths)
+
+    def test_scheduled(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        msgs: list[str] = []
+        with ScheduledExecutor(max_workers=2, log=msgs.append) as executor:
+            facts_list = get_files_facts(paths, executor=executor)
+        assert facts_list == get_files_facts(paths)
+        # So few files are quicker to read than to start workers for.
+        assert " serially, " in msgs[0]
+
+    def test_processes_largest_first(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        profiler = Profiler()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            get_files_facts(paths, executor=executor, profiler=profiler)
+        n_bytes_list = [span.n_bytes for span in profiler.file_spans]
+        assert n_bytes_list == sorted(n_bytes_list, reverse=True)
+
+    def test_processes_with_cache(self, files_parent_dir: Path, tmp_path: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        with (
+            FactCache(tmp_path / "cache") as cache,
+            ProcessPoolExecutor(max_workers=2) as executor,
+        ):
+            facts_list = get_files_facts(paths, cache=cache, executor=executor)
+            assert facts_list == get_files_facts(paths)
+            assert get_files_facts(paths, cache=cache, executor=executor) == facts_list
+
+    def test_profiler(self, files_parent_dir: Path, tmp_path: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        profiler = Profiler()
+        with FactCache(tmp_path / "cache") as cache:
+            facts_list = get_files_facts(paths, cache=cache, profiler=profiler)
+            get_files_facts(paths[:3], cache=cache, profiler=profiler)
+        assert facts_list == get_files_facts(paths)
+        assert [span.path for span in profiler.file_spans] == paths
+        assert profiler.n_cached_files == len(paths[:3])
+
+    def test_profiler_syscalls(
+        self,
+        files_parent_dir: Path,
+        os_calls: Counter[str],
+    ) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        profiler = Profiler()
+        get_files_facts(paths, profiler=profiler)
+
+        # The sizes of the files come from reading them, rather than stat'ing them.
+        n_files = len(paths)
+        assert os_calls == {"open": n_files, "fstat": n_files, "read": n_files}
+        assert [span.n_bytes for span in profiler.file_spans] == [
+            path.stat().st_size for path in paths
+        ]
+
+    def test_processes_profiler(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / name for name in _VALID_FILE_NAMES]
+        profiler = Profiler()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            facts_list = get_files_facts(paths, executor=executor, profiler=profiler)
+        assert facts_list == get_files_facts(paths)
+        assert sorted(span.path for span in profiler.file_spans) == paths
+        assert all(
+            span.n_bytes == span.path.stat().st_size for span in profiler.file_spans
+        )
+
+    def test_syscalls(
+        self,
+        files_parent_dir: Path,
+        tmp_path: Path,
+        os_calls: Counter[str],
+    ) -> None:
+        paths = [
+            Path(shutil.copy(files_parent_dir / name, tmp_path))
+            for name in _VALID_FILE_NAMES
+        ]
+        with FactCache(None) as cache, ThreadPoolExecutor(max_workers=2) as executor:
+            get_files_facts(paths, cache=cache, executor=executor)
+            for path in paths:
+                os.utime(path, ns=(0, 0))
+            os_calls.clear()
+            get_files_facts(paths, cache=cache, executor=executor)
+
+        # Each changed file is stat'ed once, to check its entry and to size it.
+        n_files = len(paths)
+        assert os_calls == {
+            "stat": n_files,
+            "open": n_files,
+            "fstat": n_files,
+            "read": n_files,
+        }
+
+    def test_invalid_syntax(self, files_parent_dir: Path) -> None:
+        paths = [files_parent_dir / "invalid_syntax.py"]
+        with (
+            ProcessPoolExecutor(max_workers=2) as executor,
+            pytest.raises(AnalyzedFileSyntaxError),
+        ):
+            get_files_facts(paths, executor=executor)
+
+    def test_nonexistent(self, tmp_path: Path) -> None:
+        with (
+            ThreadPoolExecutor(max_workers=2) as executor,
+            pytest.raises(FileNotFoundError),
+        ):
+            get_files_facts([tmp_path / "face.py"], executor=executor)
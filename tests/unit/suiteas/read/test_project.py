@@ -1,17 +1,19 @@
+import shutil
+from collections import Counter
 from pathlib import Path
 
 import pytest
 
+from suiteas.config import ProjConfig
 from suiteas.domain import (
     Codebase,
     File,
     Func,
-    ProjConfig,
     Project,
     PytestFile,
     PytestSuite,
 )
-from suiteas.read.project import get_project
+from suiteas.read.project import get_included_files, get_project
 
 
 class TestGetProject:
@@ -44,7 +46,112 @@ class TestGetProject:
         )
 
         assert type(project) == Project
-        assert project.model_dump() == expected_project.model_dump()
+        assert project == expected_project
+
+    def test_parse_engine(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+
+        project = get_project(proj_dir=proj_dir, parse_engine="scan")
+
+        assert project.config.parse_engine == "scan"
+        assert project.codebase == get_project(proj_dir=proj_dir).codebase
+
+    def test_included_files(
+        self,
+        projs_parent_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+        monkeypatch.chdir(proj_dir / "src")
+
+        project = get_project(
+            proj_dir=proj_dir,
+            included_files=[
+                Path("ow9xem9x/hello.py"),
+                Path("ow9xem9x/missing.py"),
+                Path("../README.md"),
+            ],
+        )
+
+        assert [file.path for file in project.codebase.files] == [
+            proj_dir / "src" / "ow9xem9x" / "hello.py",
+        ]
+        assert [file.path for file in project.pytest_suite.pytest_files] == [
+            proj_dir / "tests" / "unit" / "ow9xem9x" / "test_hello.py",
+        ]
+
+    def test_exclude(
+        self,
+        projs_parent_dir: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        proj_dir = tmp_path / "two_files"
+        shutil.copytree(projs_parent_dir / "two_files", proj_dir)
+        with (proj_dir / "pyproject.toml").open(mode="a") as toml_file:
+            toml_file.write('exclude = ["goodbye.py"]\n')
+        monkeypatch.chdir(proj_dir)
+
+        project = get_project(proj_dir=proj_dir)
+        included_project = get_project(
+            proj_dir=proj_dir,
+            included_files=[Path("src/ow9xem9x/goodbye.py")],
+        )
+
+        assert [file.path.name for file in project.codebase.files] == [
+            "__init__.py",
+            "hello.py",
+        ]
+        assert not included_project.codebase.files
+
+    def test_only_pytest_classes_needed(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+
+        project = get_project(
+            proj_dir=proj_dir,
+            config=ProjConfig(pkg_names=["ow9xem9x"], checks=["SUI002"]),
+        )
+
+        assert project.codebase.files == []
+        assert [file.path.name for file in project.pytest_suite.pytest_files] == [
+            "__init__.py",
+            "test_goodbye.py",
+            "test_hello.py",
+        ]
+
+    def test_only_partner_pytest_files_needed(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+
+        project = get_project(
+            proj_dir=proj_dir,
+            config=ProjConfig(pkg_names=["ow9xem9x"], checks=["SUI001", "SUI003"]),
+        )
+
+        assert [file.path.name for file in project.codebase.files] == [
+            "__init__.py",
+            "goodbye.py",
+            "hello.py",
+        ]
+        assert [file.path.name for file in project.pytest_suite.pytest_files] == [
+            "test_goodbye.py",
+            "test_hello.py",
+        ]
+
+    def test_syscalls(self, projs_parent_dir: Path, os_calls: Counter[str]) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+
+        project = get_project(proj_dir=proj_dir)
+
+        n_files = len(project.codebase.files) + len(project.pytest_suite.pytest_files)
+        assert os_calls == {
+            # Each directory is listed once, and answers all the config's checks.
+            "scandir": 6,
+            # The roots of the source and unit test directories.
+            "stat": 2,
+            "open": n_files,
+            "fstat": n_files,
+            "read": n_files,
+        }
 
     def test_nonexistent(self, tmp_path: Path) -> None:
         with pytest.raises(FileNotFoundError):
@@ -79,7 +186,7 @@ class TestGetProject:
             proj_dir=proj_dir,
         )
         assert type(project) == Project
-        assert project.model_dump() == expected_project.model_dump()
+        assert project == expected_project
 
     def test_one_func_no_test(self, projs_parent_dir: Path) -> None:
         proj_dir = projs_parent_dir / "one_func_no_test"
@@ -117,4 +224,26 @@ class TestGetProject:
         )
 
         assert type(project) == Project
-        assert project.model_dump() == expected_project.model_dump()
+        assert project == expected_project
+
+
+class TestGetIncludedFiles:
+    def test_nothing_included(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+        config = ProjConfig(pkg_names=["ow9xem9x"])
+        assert get_included_files([], proj_dir=proj_dir, config=config) == (None, None)
+
+    def test_counterparts(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+        config = ProjConfig(pkg_names=["ow9xem9x"])
+
+        src_paths, pytest_paths = get_included_files(
+            [proj_dir / "tests" / "unit" / "ow9xem9x" / "test_hello.py"],
+            proj_dir=proj_dir,
+            config=config,
+        )
+
+        assert src_paths == [proj_dir / "src" / "ow9xem9x" / "hello.py"]
+        assert pytest_paths == [
+            proj_dir / "tests" / "unit" / "ow9xem9x" / "test_hello.py",
+        ]
@@ -1,6 +1,33 @@
+from pathlib import Path
+
+from suiteas.config import ProjConfig
 from suiteas.read.pytest_suite import get_pytest_suite
 
 
 class TestGetPytestSuite:
-    def test_nothing(self) -> None:
-        _ = get_pytest_suite
+    def test_needed_pytest_files(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+        unit_dir = proj_dir / "tests" / "unit" / "ow9xem9x"
+
+        pytest_suite = get_pytest_suite(
+            proj_dir=proj_dir,
+            config=ProjConfig(pkg_names=["ow9xem9x"]),
+            included_pytest_files=None,
+            needed_pytest_files={unit_dir / "test_hello.py", unit_dir / "missing.py"},
+        )
+
+        assert [file.path for file in pytest_suite.pytest_files] == [
+            unit_dir / "test_hello.py",
+        ]
+
+    def test_no_needed_pytest_files(self, projs_parent_dir: Path) -> None:
+        proj_dir = projs_parent_dir / "two_files"
+
+        pytest_suite = get_pytest_suite(
+            proj_dir=proj_dir,
+            config=ProjConfig(pkg_names=["ow9xem9x"]),
+            included_pytest_files=None,
+            needed_pytest_files=set(),
+        )
+
+        assert pytest_suite.pytest_files == []
@@ -0,0 +1,159 @@
+import ast
+from pathlib import Path
+
+import pytest
+from pysource_codegen._codegen import generate
+
+from suiteas.read.file import _parse_tree
+from suiteas.read.scan import AmbiguousSourceError, scan_source
+from suiteas_test.config import FAST_TESTS
+
+ASSETS_DIR = Path(__file__).parents[3] / "assets"
+
+# Source code which is easy to scan incorrectly.
+TRICKY_SOURCES = [
+    "async def f():\n    await g()\n",
+    "@decorator\ndef f(x=lambda: 1) -> int:\n    return 1\n",
+    "class A:\n    x: int = 1\n\n    def f(self): ...\n",
+    "class A:\n    if True:\n        def f(self): ...\n",
+    "class A(B, metaclass=M):\n    class C:\n        def f(self): ...\n",
+    "class A: pass\nclass B: x = 1; y = 2\n",
+    "def f(): return 1\nimport os; import sys as system\n",
+    "if x:\n    import a\nelif y:\n    import b\nelse:\n    import c\n",
+    "try:\n    from a import b\nexcept ImportError:\n    from c import b\n",
+    "for x in y: import a\nwhile x: import b; from c import d\nwith x: import e\n",
+    "if lambda: 0: import a\nx = lambda: 0\n",
+    "from . import a\nfrom .b import c as d, e\nfrom ...f import (\n    g,  # h\n)\n",
+    "from a . b import c\nimport d . e, f\nfrom .import g\n",
+    "import \\\n    os\nx = 1 + \\\n    2\ndef f(): pass\n",
+    's = """\ndef not_a_func():\n    pass\n"""\ndef f():\n    """Doc\nstring"""\n',
+    "x = f'{a!r:>{width}}' + f'{{literal}}'\ndef f(): pass\n",
+    "x = {\n    'a': 1,\n}\ndef f(\n    a,\n    b,\n): pass\n",
+    "def f():\n    x = (\n1)\n    def g(): pass\ndef h(): pass\n",
+    "match x:\n    case 1:\n        import a\nmatch = 1\nmatch(x)\n",
+    "def f():\r\n    pass\r\ndef g(): pass\n",
+    "if x:\n\tdef f(): pass\n\tclass A:\n\t\tdef g(self): pass\n",
+    "def \ufb01(): pass\nclass \uff23: pass\n",
+    "x = r'\\'' ; import a\ndef f(): pass\n",
+    "if x: pass\n# comment\n\n    # indented comment\ndef f(): pass",
+    "async def f():\n    async with a:\n        pass\nasync with b:\n    import c\n",
+    "x = [\n    1, [2, [3, [4, [5]]]],\n]\ndef f(): pass\n",
+    "def f():\n    x = [[[[1]]]]\n    return 'a' 'b' \\\n        'c'\ndef g(): pass\n",
+]
+
+
+def _get_ast_facts(source: str) -> object:
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        pytest.skip("Source code is invalid in this version of Python.")
+    return _parse_tree(tree)
+
+
+def _assert_agrees_with_ast(source: str) -> None:
+    try:
+        facts = scan_source(source)
+    except AmbiguousSourceError:
+        return
+    assert facts == _get_ast_facts(source)
+
+
+class TestScanSource:
+    def test_funcs_and_classes(self) -> None:
+        source = (
+            "def hello():\n"
+            "    def inner():\n"
+            "        pass\n"
+            "\n"
+            "class Banana:\n"
+            "    def peel(self):\n"
+            "        pass\n"
+            "\n"
+            "class Empty:\n"
+            "    pass\n"
+        )
+
+        assert scan_source(source) == (
+            [("hello", 1, 0)],
+            [("Banana", 5, 0, True), ("Empty", 9, 0, False)],
+            [],
+        )
+
+    def test_flow_ctrl(self) -> None:
+        source = (
+            "if TYPE_CHECKING:\n"
+            "    from a import b\n"
+            "    def hello():\n"
+            "        pass\n"
+            "else:\n"
+            "    def goodbye():\n"
+            "        pass\n"
+        )
+
+        assert scan_source(source) == ([("hello", 3, 4)], [], ["a.b"])
+
+    def test_imports(self) -> None:
+        source = (
+            "import os.path, sys as system\n"
+            "from . import a\n"
+            "from .b import (\n"
+            "    c as d,  # A comment.\n"
+            "    e,\n"
+            ")\n"
+            "from f import *\n"
+        )
+
+        assert scan_source(source) == (
+            [],
+            [],
+            ["os.path", "sys", "None.a", "b.c", "b.e", "f.*"],
+        )
+
+    def test_strings(self) -> None:
+        source = (
+            'x = """\n'
+            "def not_a_func():\n"
+            '"""\n'
+            "y = 'def also_not_a_func(): pass'\n"
+            "def func():\n"
+            "    pass\n"
+        )
+
+        assert scan_source(source) == ([("func", 5, 0)], [], [])
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            pytest.param("x = 1\n    y = 2\n", id="unexpected_indent"),
+            pytest.param("def f():\npass\n", id="missing_indent"),
+            pytest.param("x = (\n", id="unclosed_bracket"),
+            pytest.param("x = 'unterminated\n", id="unterminated_string"),
+            pytest.param("\ufeffdef f(): pass\n", id="byte_order_mark"),
+            pytest.param("x = f'{y['a']}'\n", id="nested_quotes"),
+        ],
+    )
+    def test_ambiguous(self, source: str) -> None:
+        with pytest.raises(AmbiguousSourceError):
+            scan_source(source)
+
+    @pytest.mark.parametrize("source", TRICKY_SOURCES)
+    def test_tricky_agrees_with_ast(self, source: str) -> None:
+        _assert_agrees_with_ast(source)
+
+    @pytest.mark.parametrize(
+        "path",
+        sorted(ASSETS_DIR.glob("**/*.py")),
+        ids=lambda path: path.relative_to(ASSETS_DIR).as_posix(),
+    )
+    def test_assets_agree_with_ast(self, path: Path) -> None:
+        source = path.read_text(encoding="utf8")
+        try:
+            ast.parse(source)
+        except SyntaxError:
+            return
+        _assert_agrees_with_ast(source)
+
+    @pytest.mark.skipif(FAST_TESTS, reason="Test is slow.")
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_agrees_with_ast(self, seed: int) -> None:
+        _assert_agrees_with_ast(generate(seed=seed))
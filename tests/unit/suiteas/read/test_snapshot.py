@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from suiteas.read.snapshot import FsSnapshot
+
+
+@pytest.fixture()
+def scanned_dir_strs(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """The directories listed by os.scandir while the fixture is in use."""
+    dir_strs: list[str] = []
+    scandir = os.scandir
+
+    def _scandir(path: str) -> "os._ScandirIterator[str]":
+        dir_strs.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", _scandir)
+    return dir_strs
+
+
+class TestFsSnapshot:
+    def test_scandir(self, tmp_path: Path, scanned_dir_strs: list[str]) -> None:
+        (tmp_path / "a.py").touch()
+        (tmp_path / "b").mkdir()
+        snapshot = FsSnapshot()
+
+        entries = snapshot.scandir(tmp_path)
+
+        assert sorted(entry.name for entry in entries) == ["a.py", "b"]
+        assert snapshot.scandir(tmp_path) is entries
+        assert scanned_dir_strs == [os.fspath(tmp_path)]
+
+    def test_scandir_nonexistent(
+        self,
+        tmp_path: Path,
+        scanned_dir_strs: list[str],
+    ) -> None:
+        snapshot = FsSnapshot()
+
+        for _ in range(2):
+            with pytest.raises(FileNotFoundError):
+                snapshot.scandir(tmp_path / "nope")
+        assert len(scanned_dir_strs) == 1
+
+    def test_exists(self, tmp_path: Path, scanned_dir_strs: list[str]) -> None:
+        (tmp_path / "a.py").touch()
+        (tmp_path / "b").mkdir()
+        snapshot = FsSnapshot()
+
+        assert snapshot.exists(tmp_path / "a.py")
+        assert snapshot.exists(tmp_path / "b")
+        assert snapshot.exists(os.fspath(tmp_path / "b") + os.sep)
+        assert not snapshot.exists(tmp_path / "c.py")
+        assert scanned_dir_strs == [os.fspath(tmp_path)]
+
+    def test_exists_missing_parent(self, tmp_path: Path) -> None:
+        snapshot = FsSnapshot()
+
+        assert not snapshot.exists(tmp_path / "nope" / "a.py")
+
+    def test_exists_broken_symlink(self, tmp_path: Path) -> None:
+        link_path = tmp_path / "link.py"
+        try:
+            link_path.symlink_to(tmp_path / "nope.py")
+        except OSError:
+            pytest.skip("Symlinks aren't supported")
+
+        assert FsSnapshot().exists(link_path)
+
+    def test_exists_curdir(self) -> None:
+        snapshot = FsSnapshot()
+
+        assert snapshot.exists(".")
+        assert snapshot.exists(Path())
+
+    def test_stale(self, tmp_path: Path) -> None:
+        snapshot = FsSnapshot()
+        assert not snapshot.exists(tmp_path / "a.py")
+
+        (tmp_path / "a.py").touch()
+
+        assert not snapshot.exists(tmp_path / "a.py")
+        assert FsSnapshot().exists(tmp_path / "a.py")
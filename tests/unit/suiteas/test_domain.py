@@ -1,4 +1,7 @@
-from suiteas.domain import Func
+from array import array
+from pathlib import Path
+
+from suiteas.domain import Class, CompactCodebase, File, Func
 
 
 class TestFunc:
@@ -9,3 +12,49 @@ class TestFunc:
     def test_is_not_underscored(self) -> None:
         func = Func(name="hello", full_name="hello", line_num=1, char_offset=1)
         assert not func.is_underscored
+
+
+class TestCompactCodebase:
+    def test_empty(self) -> None:
+        assert CompactCodebase().files == []
+
+    def test_files(self) -> None:
+        codebase = CompactCodebase(
+            strings=["src/pkg/mod.py", "pkg.mod", "hello", "Banana", "os.path"],
+            file_path_ids=array("I", [0]),
+            file_module_ids=array("I", [1]),
+            func_starts=array("I", [0, 1]),
+            func_name_ids=array("I", [2]),
+            func_line_nums=array("I", [3]),
+            func_char_offsets=array("I", [4]),
+            cls_starts=array("I", [0, 1]),
+            cls_name_ids=array("I", [3]),
+            cls_line_nums=array("I", [7]),
+            cls_char_offsets=array("I", [0]),
+            cls_has_funcs=array("B", [1]),
+            import_starts=array("I", [0, 1]),
+            import_ids=array("I", [4]),
+        )
+        assert codebase.files == [
+            File(
+                path=Path("src/pkg/mod.py"),
+                funcs=[
+                    Func(
+                        name="hello",
+                        full_name="pkg.mod.hello",
+                        line_num=3,
+                        char_offset=4,
+                    ),
+                ],
+                clses=[
+                    Class(
+                        name="Banana",
+                        full_name="pkg.mod.Banana",
+                        line_num=7,
+                        char_offset=0,
+                        has_funcs=True,
+                    ),
+                ],
+                imported_objs=["os.path"],
+            ),
+        ]
@@ -0,0 +1,14 @@
+from suiteas_test.importtime import get_import_times
+
+
+class TestGetImportTimes:
+    def test_total(self) -> None:
+        total, import_time_by_module = get_import_times("suiteas.core.names")
+
+        assert "suiteas.core.names" in import_time_by_module
+        assert total >= import_time_by_module["suiteas"] > 0
+
+    def test_excludes_startup(self) -> None:
+        _, import_time_by_module = get_import_times("suiteas.core.names")
+
+        assert "site" not in import_time_by_module